@@ -3,6 +3,7 @@ from typing import List, Optional, Dict, Any
 import re
 import hashlib
 from openai import AsyncOpenAI
+from app.config import settings
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -11,10 +12,18 @@ logger = get_logger(__name__)
 class EmbeddingService:
     """Production embedding service with OpenAI text-embedding-3-small"""
     
-    def __init__(self):
+    def __init__(self, dimensions: Optional[int] = None):
         self.client = AsyncOpenAI()
         self.model = "text-embedding-3-small"
-        self.dimension = 1536
+        # Размерность должна совпадать с колонками faq_content
+        # (scripts/compact_embeddings.py); 1536 — полная ширина модели
+        self.dimension = dimensions or settings.AI_EMBEDDING_DIMENSIONS
+
+    def _request_options(self) -> Dict[str, Any]:
+        """text-embedding-3 сам укорачивает вектор до dimensions и нормирует его."""
+        if self.dimension == 1536:
+            return {}
+        return {"dimensions": self.dimension}
     
     @staticmethod
     def normalize_text(text: str) -> str:
@@ -46,12 +55,13 @@ class EmbeddingService:
             text: Input text
             
         Returns:
-            List of floats (1536 dimensions)
+            List of floats (self.dimension dimensions)
         """
         try:
             response = await self.client.embeddings.create(
                 model=self.model,
-                input=text
+                input=text,
+                **self._request_options()
             )
             return response.data[0].embedding
         
@@ -72,7 +82,8 @@ class EmbeddingService:
         try:
             response = await self.client.embeddings.create(
                 model=self.model,
-                input=texts
+                input=texts,
+                **self._request_options()
             )
             return [item.embedding for item in response.data]
         
@@ -96,40 +107,43 @@ class EmbeddingService:
                 'hash': str
             }
         """
-        # Enrich with synonyms
-        enriched_text = text
-        if synonyms:
-            enriched_text = f"{text}. {' '.join(synonyms)}"
-        
-        # Create embedding
-        embedding = await self.create_embedding(enriched_text)
-        
-        # Extract metadata
-        normalized = self.normalize_text(text)
-        keywords = self.extract_keywords(text)
-        text_hash = hashlib.md5(normalized.encode()).hexdigest()
-        
-        return {
-            'embedding': embedding,
-            'normalized': normalized,
-            'keywords': keywords,
-            'hash': text_hash
-        }
+        embedding = await self.create_embedding(self._enrich(text, synonyms))
+        return {'embedding': embedding, **self._metadata(text)}
     
     async def batch_create_embeddings_with_enrichment(
         self, 
         texts: List[str],
         synonyms_map: Optional[Dict[str, List[str]]] = None
     ) -> List[Dict[str, Any]]:
-        """Batch create with enrichment metadata"""
-        results = []
+        """Batch create with enrichment metadata (one embeddings API call)"""
+        if not texts:
+            return []
         
-        for i, text in enumerate(texts):
-            syns = synonyms_map.get(str(i), []) if synonyms_map else None
-            result = await self.create_embedding_with_enrichment(text, syns)
-            results.append(result)
+        enriched = [
+            self._enrich(text, synonyms_map.get(str(i)) if synonyms_map else None)
+            for i, text in enumerate(texts)
+        ]
+        embeddings = await self.create_embeddings(enriched)
         
-        return results
+        return [
+            {'embedding': embedding, **self._metadata(text)}
+            for text, embedding in zip(texts, embeddings)
+        ]
+    
+    @staticmethod
+    def _enrich(text: str, synonyms: Optional[List[str]]) -> str:
+        """Append synonyms to the text being embedded"""
+        if synonyms:
+            return f"{text}. {' '.join(synonyms)}"
+        return text
+    
+    def _metadata(self, text: str) -> Dict[str, Any]:
+        normalized = self.normalize_text(text)
+        return {
+            'normalized': normalized,
+            'keywords': self.extract_keywords(text),
+            'hash': hashlib.md5(normalized.encode()).hexdigest()
+        }
 
 
 # Backward compatibility alias
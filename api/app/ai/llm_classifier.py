@@ -9,6 +9,7 @@ from typing import Literal, Optional
 from openai import AsyncOpenAI
 from pydantic import BaseModel, field_validator
 
+from app.ai.language_detector import CONFIDENT, language_detector
 from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -229,30 +230,7 @@ vague = false (конкретный запрос, идём в поиск):
 
 # ─── Deterministic fallback ───────────────────────────────────────────────────
 
-_KK_CHARS = set("әіңғүұқөһӘІҢҒҮҰҚӨҺ")
-_RU_MARKERS = set("ёъ")
-_RU_WORDS = {"как", "что", "это", "для", "или", "где", "когда", "нет", "да", "можно", "хочу"}
-
-# Казахские слова написанные обычной кириллицей
-_KK_CONTEXT_WORDS = {
-    "деген", "туралы", "керек", "болады", "айтшы", "жасау",
-    "алу", "беру", "ашу", "сату", "және", "немесе", "қалай",
-    "калай", "кандай", "кайда", "жок", "бул", "осы", "мына",
-    "аламын", "беремін", "аласын", "бересін",
-}
-
-# Казахские падежные окончания
-_KK_SUFFIXES = (
-    "да", "де", "та", "те",
-    "дан", "ден", "тан", "тен", "нан", "нен",
-    "ға", "ге", "қа", "ке",
-    "ды", "ді", "ты", "ті",
-    "мын", "мін", "пын", "пін",
-    "лар", "лер", "дар", "дер", "тар", "тер",
-    "дың", "нің", "тың",
-)
-
-_INTENT_KEYWORDS: dict[str, list[str]] = {
+INTENT_KEYWORDS: dict[str, list[str]] = {
     "open_account":      ["шот", "счет", "счёт", "ашу", "открыт", "первый", "второй", "бірінші", "екінші"],
     "deposit_withdraw":  ["толтыр", "шығар", "пополн", "вывод", "перевод", "каспи"],
     "dividends":         ["дивиденд", "купон"],
@@ -268,42 +246,17 @@ _KK_STOP = {"қалай", "туралы", "деген", "керек", "және"
 _RU_STOP = {"как", "что", "это", "для", "или", "про", "о", "а", "и", "в", "на"}
 
 
-def _is_kazakh_by_context(text: str) -> bool:
-    """Определяет казахский язык по контексту без спецсимволов."""
-    lower = text.lower()
-    words = lower.split()
-
-    # Казахские контекстные слова
-    if any(w in _KK_CONTEXT_WORDS for w in words):
-        return True
-
-    # Казахские падежные окончания
-    for word in words:
-        for suffix in _KK_SUFFIXES:
-            if word.endswith(suffix) and len(word) > len(suffix) + 2:
-                return True
-
-    return False
-
-
 def _fallback_classify(text: str) -> ClassificationResult:
     """Детерминированный fallback без LLM. confidence=0.0."""
     lower = text.lower()
     words = lower.split()
 
     # Язык
-    if any(c in _KK_CHARS for c in text):
-        lang: Literal["ru", "kk"] = "kk"
-    elif _is_kazakh_by_context(text):
-        lang = "kk"
-    elif any(c in _RU_MARKERS for c in lower) or len(set(words) & _RU_WORDS) >= 2:
-        lang = "ru"
-    else:
-        lang = "kk"  # default
+    lang = language_detector.detect(text)
 
     # Intent
     intent: IntentType = "general"
-    for intent_name, keywords in _INTENT_KEYWORDS.items():
+    for intent_name, keywords in INTENT_KEYWORDS.items():
         if any(kw in lower for kw in keywords):
             intent = intent_name  # type: ignore
             break
@@ -345,6 +298,15 @@ class LLMClassifier:
         try:
             result = await self._call_llm(text)
 
+            # Уверенный локальный детектор важнее ответа LLM по языку
+            guess = language_detector.detect_with_confidence(text)
+            if guess.confidence >= CONFIDENT and guess.language != result.language:
+                logger.info(
+                    f"[Classifier] language {result.language} → {guess.language} "
+                    f"(detector conf={guess.confidence:.2f})"
+                )
+                result = result.model_copy(update={"language": guess.language})
+
             if result.confidence < 0.5:
                 logger.warning(
                     f"[Classifier] low confidence={result.confidence:.2f}, forcing vague=true"
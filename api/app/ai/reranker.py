@@ -0,0 +1,187 @@
+# api/app/ai/reranker.py
+"""
+Локальный реранкер кандидатов hybrid_search — без вызовов LLM.
+
+Для каждого кандидата считается вектор признаков (FEATURES), итоговый
+балл — скалярное произведение с весами. Веса подбираются офлайн по логам
+(scripts/fit_reranker.py) и нормируются так, что вес исходного балла
+равен 1, а поправки выражены в единицах cosine. Поправки сдвигают балл
+относительно порогов /api/ask (0.40 / 0.20) — fit_reranker печатает долю
+прямых ответов до и после, её нужно проверить перед выкладкой весов.
+
+Без подогнанных весов (нет reranker_weights.json) реранкер только
+переупорядочивает кандидатов по DEFAULT_WEIGHTS, а балл каждого
+кандидата остаётся исходным — решения по порогам не меняются.
+
+Признаки:
+- score        — балл hybrid_search (cosine или ts_rank * 0.7);
+- keyword_only — кандидат пришёл только из полнотекстового поиска;
+- overlap      — доля ключевых слов запроса (extract_keywords, по основам)
+                 в вопросе FAQ;
+- intent       — в вопросе FAQ есть слова интента классификатора;
+- category     — категория FAQ совпадает со слотом broker (+1),
+                 относится к другому брокеру (−1);
+- slots        — доля остальных слотов, упомянутых в тексте FAQ;
+- priority     — faq_v2.priority, сжатый в (−1, 1);
+- popularity   — log(1 + просмотры + клики) faq_v2, в [0, 1].
+
+Все кандидаты считаются одной матрицей numpy; ключевые слова вопросов
+FAQ кешируются — на 8–10 кандидатов уходят десятки микросекунд.
+"""
+import json
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.ai.embeddings_enhanced import EmbeddingService
+from app.ai.llm_classifier import INTENT_KEYWORDS
+from app.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+FEATURES: Tuple[str, ...] = (
+    "score", "keyword_only", "overlap", "intent", "category", "slots", "priority", "popularity",
+)
+
+# Веса до первой подгонки — только для порядка кандидатов, балл не меняют
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "score": 1.0,
+    "keyword_only": 0.0,
+    "overlap": 0.10,
+    "intent": 0.05,
+    "category": 0.05,
+    "slots": 0.05,
+    "priority": 0.03,
+    "popularity": 0.02,
+}
+
+DEFAULT_WEIGHTS_PATH = Path(__file__).with_name("reranker_weights.json")
+
+# Значения слотов классификатора → формы в тексте FAQ (kk/ru, по основам)
+_SLOT_TERMS: Dict[str, Tuple[str, ...]] = {
+    "first": ("бірінші", "первый", "первого"),
+    "second": ("екінші", "второй", "второго"),
+    "stock": ("акци",),
+    "bond": ("облигац",),
+    "etf": ("etf", "қор", "фонд"),
+    "buy": ("сатып ал", "купит", "покуп", "алу"),
+    "sell": ("сату", "продат", "продаж"),
+    "deposit": ("толтыр", "пополн"),
+    "withdraw": ("шығар", "вывод", "вывест"),
+}
+
+_STEM = 5
+_POPULARITY_SCALE = 10.0
+_PRIORITY_SCALE = 10.0
+
+
+@lru_cache(maxsize=4096)
+def _stems(text: str) -> FrozenSet[str]:
+    return frozenset(word[:_STEM] for word in EmbeddingService.extract_keywords(text))
+
+
+def _slot_terms(value: str) -> Tuple[str, ...]:
+    value = value.lower()
+    return _SLOT_TERMS.get(value, (value,))
+
+
+class LocalReranker:
+
+    def __init__(self, weights: Optional[Mapping[str, float]] = None):
+        self.weights = np.array(
+            [(weights or DEFAULT_WEIGHTS).get(name, DEFAULT_WEIGHTS[name]) for name in FEATURES],
+            dtype=np.float64,
+        )
+        # Балл заменяется только подогнанными весами (см. docstring модуля)
+        self.fitted = weights is not None
+        self.source = "fitted" if self.fitted else "default"
+
+    @classmethod
+    def from_file(cls, path: Path) -> "LocalReranker":
+        """Веса из JSON fit_reranker.py; нет файла или он битый — веса по умолчанию."""
+        if not path.exists():
+            return cls()
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            reranker = cls(data["weights"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error(f"[Reranker] cannot load weights from {path}: {e}")
+            return cls()
+        reranker.source = f"{path.name} ({data.get('fitted_at', 'unknown')}, n={data.get('samples', '?')})"
+        logger.info(f"[Reranker] weights loaded: {reranker.source}")
+        return reranker
+
+    @staticmethod
+    def features(
+        user_question: str,
+        candidates: Sequence[Tuple[Dict[str, Any], float]],
+        intent: Optional[str] = None,
+        slots: Optional[Mapping[str, Any]] = None,
+    ) -> np.ndarray:
+        """Матрица (кандидаты × FEATURES)."""
+        x = np.zeros((len(candidates), len(FEATURES)), dtype=np.float64)
+        query_stems = _stems(user_question)
+        intent_terms = INTENT_KEYWORDS.get(intent or "", ())
+        slots = {k: str(v) for k, v in (slots or {}).items() if v}
+        broker = slots.pop("broker", "").lower()
+        slot_terms = [_slot_terms(value) for value in slots.values()]
+
+        for i, (faq, score) in enumerate(candidates):
+            question = (faq.get("question") or "").lower()
+            category = (faq.get("category") or "").lower()
+            x[i, 0] = score
+            x[i, 1] = faq.get("source") == "keyword"
+            if query_stems:
+                x[i, 2] = len(query_stems & _stems(question)) / len(query_stems)
+            if intent_terms:
+                x[i, 3] = any(term in question for term in intent_terms)
+            if broker and category and category != "basics":
+                x[i, 4] = 1.0 if broker in category else -1.0
+            if slot_terms:
+                text = f"{question} {(faq.get('answer_text') or '').lower()}"
+                x[i, 5] = sum(any(t in text for t in terms) for terms in slot_terms) / len(slot_terms)
+            x[i, 6] = faq.get("priority") or 0
+            x[i, 7] = (faq.get("view_count") or 0) + (faq.get("click_count") or 0)
+
+        x[:, 6] = np.tanh(x[:, 6] / _PRIORITY_SCALE)
+        x[:, 7] = np.minimum(np.log1p(x[:, 7]) / _POPULARITY_SCALE, 1.0)
+        return x
+
+    def rerank(
+        self,
+        user_question: str,
+        candidates: List[Tuple[Dict[str, Any], float]],
+        top_k: Optional[int] = None,
+        intent: Optional[str] = None,
+        slots: Optional[Mapping[str, Any]] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        if not candidates:
+            return candidates
+        scores = np.clip(self.features(user_question, candidates, intent, slots) @ self.weights, 0.0, 1.0)
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        if not self.fitted:
+            return [candidates[i] for i in order]
+        return [(candidates[i][0], float(scores[i])) for i in order]
+
+
+def save_weights(path: Path, weights: Mapping[str, float], samples: int, metrics: Dict[str, float]) -> None:
+    payload = {
+        "weights": {name: round(float(weights[name]), 6) for name in FEATURES},
+        "samples": samples,
+        "metrics": metrics,
+        "fitted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def weights_path() -> Path:
+    return Path(settings.RERANKER_WEIGHTS_PATH) if settings.RERANKER_WEIGHTS_PATH else DEFAULT_WEIGHTS_PATH
+
+
+local_reranker = LocalReranker.from_file(weights_path())
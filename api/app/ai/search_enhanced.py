@@ -1,13 +1,39 @@
 # api/app/ai/search_enhanced.py
-from typing import List, Dict, Any, Optional, Tuple
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.ai.reranker import local_reranker
+from app.ai.synonyms import synonym_index
+from app.core.database import db_session
 from app.core.logging_config import get_logger
+from app.core.vector import hnsw_search_settings, unit_vector
 from app.config import settings
+from app.services.search_cache import search_cache_maintainer
+from app.repositories.search_repository import (
+    INDEXED_LANGUAGES,
+    ann_candidates,
+    search_repository,
+    vector_search_sql,
+)
 
 logger = get_logger(__name__)
 
 
+@asynccontextmanager
+async def search_session() -> AsyncIterator[Optional[AsyncSession]]:
+    """
+    Сессия для hybrid_search.
+    SEARCH_BACKEND=asyncpg — None: запросы идут через пул asyncpg без сессии;
+    SEARCH_BACKEND=sqlalchemy — короткая db_session().
+    """
+    if settings.SEARCH_BACKEND == "asyncpg":
+        yield None
+        return
+    async with db_session() as session:
+        yield session
+
+
 class EnhancedSearchService:
 
     @staticmethod
@@ -33,6 +59,13 @@ class EnhancedSearchService:
                 logger.debug(f"Dedup: skipping duplicate faq_id={faq_id}")
         return result
 
+    @staticmethod
+    def _ranking_fields(row) -> Dict[str, int]:
+        """faq_v2.priority / click_count / view_count — признаки реранкера."""
+        if len(row) < 12:
+            return {}
+        return {"priority": row[9] or 0, "click_count": row[10] or 0, "view_count": row[11] or 0}
+
     @staticmethod
     def _rows_to_candidates(rows: list, score_col: int = 8) -> List[Tuple[Dict[str, Any], float]]:
         """Конвертирует строки БД в список (faq_dict, score)."""
@@ -51,44 +84,36 @@ class EnhancedSearchService:
                 "language": row[5],
                 "created_at": row[6],
                 "description_footer": row[7] if len(row) > 7 else None,
+                **EnhancedSearchService._ranking_fields(row),
             }
             candidates.append((faq, float(row[score_col])))
         return candidates
 
     @staticmethod
     async def find_similar_faqs(
-        session: AsyncSession,
+        session: Optional[AsyncSession],
         query_embedding: List[float],
         language: str,
         limit: int = 10,
     ) -> list:
-        embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
+        if session is None:
+            rows = await search_repository.vector_search(query_embedding, language, limit * 3)
+            deduped = EnhancedSearchService._deduplicate_by_faq_id(rows)
+            logger.info(f"Vector search (lang={language}, asyncpg): {len(rows)} rows → {len(deduped)} after dedup")
+            return deduped[:limit]
+
         fetch_limit = limit * 3
 
-        sql = text("""
-            SELECT
-                faq_v2.id,
-                faq_content.question,
-                faq_content.answer_text,
-                faq_content.video          AS video_file_id,
-                faq_v2.category,
-                faq_content.language,
-                faq_v2.created_at,
-                faq_content.description_footer,
-                1 - (faq_content.question_embedding <=> CAST(:embedding AS vector)) AS similarity
-            FROM faq_content
-            INNER JOIN faq_v2 ON faq_content.faq_id = faq_v2.id
-            WHERE faq_content.language = :language
-              AND faq_v2.is_active = TRUE
-              AND faq_content.question_embedding IS NOT NULL
-            ORDER BY faq_content.question_embedding <=> CAST(:embedding AS vector)
-            LIMIT :limit
-        """)
+        # Сессия уже в транзакции — SET LOCAL действует до её конца
+        for statement in hnsw_search_settings(ann_candidates(fetch_limit)):
+            await session.execute(text(statement))
 
-        result = await session.execute(
-            sql,
-            {"embedding": embedding_str, "language": language, "limit": fetch_limit},
-        )
+        sql = text(vector_search_sql(language, "CAST(:embedding AS vector)", ":limit", ":language"))
+        params = {"embedding": unit_vector(query_embedding), "limit": fetch_limit}
+        if language not in INDEXED_LANGUAGES:
+            params["language"] = language
+
+        result = await session.execute(sql, params)
         rows = result.fetchall()
         deduped = EnhancedSearchService._deduplicate_by_faq_id(rows)
         logger.info(f"Vector search (lang={language}): {len(rows)} rows → {len(deduped)} after dedup")
@@ -96,11 +121,17 @@ class EnhancedSearchService:
 
     @staticmethod
     async def keyword_search(
-        session: AsyncSession,
+        session: Optional[AsyncSession],
         query_text: str,
         language: str,
         limit: int = 10,
     ) -> list:
+        if session is None:
+            rows = await search_repository.keyword_search(query_text, language, limit * 3)
+            deduped = EnhancedSearchService._deduplicate_by_faq_id(rows)
+            logger.info(f"Keyword search (lang={language}, asyncpg): {len(rows)} rows → {len(deduped)} after dedup")
+            return deduped[:limit]
+
         fetch_limit = limit * 3
 
         sql = text("""
@@ -116,7 +147,10 @@ class EnhancedSearchService:
                 ts_rank(
                     to_tsvector('simple', faq_content.question || ' ' || faq_content.answer_text),
                     plainto_tsquery('simple', :query)
-                ) AS relevance
+                ) AS relevance,
+                faq_v2.priority,
+                faq_v2.click_count,
+                faq_v2.view_count
             FROM faq_content
             INNER JOIN faq_v2 ON faq_content.faq_id = faq_v2.id
             WHERE faq_content.language = :language
@@ -140,31 +174,24 @@ class EnhancedSearchService:
 
     @staticmethod
     async def get_synonyms(session: AsyncSession, language: str, query: str) -> List[str]:
-        try:
-            sql = text("""
-                SELECT DISTINCT UNNEST(synonyms) AS synonym
-                FROM synonyms
-                WHERE language = :language
-                  AND (term ILIKE :query OR :query ILIKE '%' || term || '%')
-            """)
-            result = await session.execute(sql, {"language": language, "query": f"%{query}%"})
-            return [row[0] for row in result.fetchall()]
-        except Exception as e:
-            logger.warning(f"Synonyms lookup failed: {e}")
-            return []
+        """Синонимы терминов, найденных в запросе (автомат в памяти, без БД)."""
+        return synonym_index.lookup(language, query)
 
     @staticmethod
     async def check_cache(session: AsyncSession, query_hash: str) -> Optional[List[Dict]]:
+        """Только чтение; hit_count/last_used_at обновляются пакетно (search_cache_maintainer)."""
         try:
             sql = text("""
-                UPDATE search_cache
-                SET hit_count = hit_count + 1, last_used_at = NOW()
+                SELECT faq_results
+                FROM search_cache
                 WHERE query_hash = :hash
-                RETURNING faq_results
             """)
             result = await session.execute(sql, {"hash": query_hash})
             row = result.fetchone()
-            return row[0] if row else None
+            if row is None:
+                return None
+            search_cache_maintainer.record_hit(query_hash)
+            return row[0]
         except Exception as e:
             logger.warning(f"Cache check failed: {e}")
             return None
@@ -181,9 +208,9 @@ class EnhancedSearchService:
             import json as _json
             sql = text("""
                 INSERT INTO search_cache (query_hash, query_normalized, language, faq_results)
-                VALUES (:hash, :normalized, :language, :results::jsonb)
+                VALUES (:hash, :normalized, :language, CAST(:results AS jsonb))
                 ON CONFLICT (query_hash)
-                DO UPDATE SET hit_count = search_cache.hit_count + 1, last_used_at = NOW()
+                DO UPDATE SET faq_results = EXCLUDED.faq_results, last_used_at = NOW()
             """)
             await session.execute(
                 sql,
@@ -199,7 +226,7 @@ class EnhancedSearchService:
 
     @staticmethod
     async def hybrid_search(
-        session: AsyncSession,
+        session: Optional[AsyncSession],
         query_embedding: List[float],
         query_text: str,
         language: str,
@@ -211,6 +238,8 @@ class EnhancedSearchService:
         Language fallback: если kk даёт 0 результатов — пробуем ru.
         Это решает проблему когда контент залит только на ru но с language='ru',
         а пользователь пишет на казахском.
+
+        session=None — запросы через asyncpg (см. search_session()).
         """
         # ── Vector search ────────────────────────────────────────────────────
         rows = await EnhancedSearchService.find_similar_faqs(
@@ -243,6 +272,8 @@ class EnhancedSearchService:
                 "language": row[5],
                 "created_at": row[6],
                 "description_footer": row[7] if len(row) > 7 else None,
+                "source": "vector",
+                **EnhancedSearchService._ranking_fields(row),
             }
             candidates.append((faq, float(row[8])))
             seen_ids.add(faq_id)
@@ -273,6 +304,8 @@ class EnhancedSearchService:
                 "language": row[5],
                 "created_at": row[6],
                 "description_footer": row[7] if len(row) > 7 else None,
+                "source": "keyword",
+                **EnhancedSearchService._ranking_fields(row),
             }
             candidates.append((faq, float(row[8]) * 0.7))
             seen_ids.add(faq_id)
@@ -281,9 +314,14 @@ class EnhancedSearchService:
         return candidates[:limit]
 
     @staticmethod
-    async def rerank_with_gpt(
+    def rerank(
         user_question: str,
         candidates: List[Tuple[Dict, float]],
-        top_k: int = 3,
+        top_k: Optional[int] = None,
+        intent: Optional[str] = None,
+        slots: Optional[Dict] = None,
     ) -> List[Tuple[Dict, float]]:
-        return candidates[:top_k]
\ No newline at end of file
+        """Локальный реранкер (app/ai/reranker.py); SEARCH_RERANK=false — порядок как есть."""
+        if not settings.SEARCH_RERANK:
+            return candidates[:top_k]
+        return local_reranker.rerank(user_question, candidates, top_k, intent, slots)
@@ -0,0 +1,144 @@
+# api/app/ai/synonyms.py
+"""
+Расширение запроса синонимами без обращения к БД.
+
+Таблица synonyms загружается в память и компилируется в автомат
+Ахо–Корасик на каждый язык. Поиск всех терминов в запросе — один
+линейный проход по символам, независимо от числа терминов.
+Автомат пересобирается при смене версии контента (content_version),
+куда входит и таблица synonyms.
+
+Термин засчитывается, если он начинается с границы слова: «шот»
+найдётся в «шотты ашу» (казахские/русские окончания), но не внутри
+«ақшотан».
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import text
+
+from app.core.database import get_session_maker
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_LOAD_SQL = text("""
+    SELECT language, term, synonyms
+    FROM synonyms
+    ORDER BY id
+""")
+
+
+class SynonymAutomaton:
+    """Автомат Ахо–Корасик над терминами одного языка (регистр не важен)."""
+
+    def __init__(self, entries: Iterable[Tuple[str, Sequence[str]]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # индексы терминов, заканчивающихся в узле (с учётом fail-ссылок)
+        self._out: List[List[int]] = [[]]
+        self._terms: List[str] = []
+        self._synonyms: List[Tuple[str, ...]] = []
+
+        for term, synonyms in entries:
+            key = term.strip().casefold()
+            if not key:
+                continue
+            self._add(key, len(self._terms))
+            self._terms.append(key)
+            self._synonyms.append(tuple(s for s in synonyms if s))
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _add(self, key: str, term_id: int) -> None:
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(term_id)
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, query: str) -> List[int]:
+        """Индексы терминов, встретившихся в query, в порядке появления."""
+        text_ = query.casefold()
+        found: List[int] = []
+        seen = set()
+        node = 0
+        for pos, ch in enumerate(text_):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for term_id in self._out[node]:
+                start = pos - len(self._terms[term_id]) + 1
+                if term_id in seen or (start > 0 and text_[start - 1].isalnum()):
+                    continue
+                seen.add(term_id)
+                found.append(term_id)
+        return found
+
+    def expand(self, query: str) -> List[str]:
+        """Синонимы всех найденных терминов без повторов."""
+        result: List[str] = []
+        seen = set()
+        for term_id in self.find(query):
+            for synonym in self._synonyms[term_id]:
+                if synonym not in seen:
+                    seen.add(synonym)
+                    result.append(synonym)
+        return result
+
+
+class SynonymIndex:
+    """Автоматы по языкам; reload() — полная пересборка из таблицы synonyms."""
+
+    def __init__(self):
+        self._automata: Dict[str, SynonymAutomaton] = {}
+
+    async def reload(self) -> None:
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            rows = (await session.execute(_LOAD_SQL)).fetchall()
+
+        grouped: Dict[str, List[Tuple[str, Sequence[str]]]] = {}
+        for language, term, synonyms in rows:
+            grouped.setdefault(language, []).append((term, synonyms or []))
+
+        # подмена целиком — читатели всегда видят согласованный набор
+        self._automata = {lang: SynonymAutomaton(entries) for lang, entries in grouped.items()}
+        sizes = ", ".join(f"{lang}={len(a)}" for lang, a in self._automata.items())
+        logger.info(f"[Synonyms] automata rebuilt: {sizes or 'empty'}")
+
+    async def on_content_changed(self, version: str) -> None:
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.error(f"[Synonyms] reload failed, keeping previous automata: {e}")
+
+    def lookup(self, language: str, query: str) -> List[str]:
+        automaton = self._automata.get(language)
+        if automaton is None:
+            return []
+        return automaton.expand(query)
+
+
+synonym_index = SynonymIndex()
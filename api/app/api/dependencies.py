@@ -0,0 +1,49 @@
+# api/app/api/dependencies.py
+from fastapi import Request, Response
+
+from app.config import settings
+from app.core import content_version
+
+
+class CacheValidator:
+    """
+    Условный GET для read-эндпоинтов FAQ.
+
+    Использование в роуте:
+        validator = await CacheValidator.from_request(request)
+        if validator.not_modified:
+            return validator.not_modified_response()
+        validator.apply(response)
+    """
+
+    def __init__(self, request: Request, etag: str):
+        self.etag = etag
+        self.not_modified = self._matches(request.headers.get("if-none-match"), etag)
+
+    @classmethod
+    async def from_request(cls, request: Request) -> "CacheValidator":
+        version = await content_version.current()
+        resource = request.url.path
+        if request.url.query:
+            resource += f"?{request.url.query}"
+        return cls(request, content_version.etag(version, resource))
+
+    @staticmethod
+    def _matches(header: str | None, etag: str) -> bool:
+        if not header:
+            return False
+        if header.strip() == "*":
+            return True
+        return etag in (tag.strip() for tag in header.split(","))
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={settings.CONTENT_CACHE_MAX_AGE}, must-revalidate",
+        }
+
+    def apply(self, response: Response) -> None:
+        response.headers.update(self.headers())
+
+    def not_modified_response(self) -> Response:
+        return Response(status_code=304, headers=self.headers())
@@ -1,21 +1,28 @@
 # api/app/api/routes/ask.py
 import asyncio
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter
 
-from app.core.database import get_session
+from app.config import settings
+from app.core import metrics
+from app.core.exceptions import RateLimitException
 from app.schemas.ask import AskRequest, AskResponse
 from app.core.logging_config import get_logger
 from app.ai.gpt_service import GPTService
 from app.ai.embeddings_enhanced import EmbeddingService
-from app.ai.search_enhanced import EnhancedSearchService
-from app.ai.llm_classifier import LLMClassifier
+from app.ai.search_enhanced import EnhancedSearchService, search_session
+from app.ai.language_detector import language_detector
+from app.ai.llm_classifier import ClassificationResult, LLMClassifier
+from app.services.rate_limiter import create_limiter
+from app.services.semantic_cache import same_answer, semantic_cache
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 _classifier = LLMClassifier(model="gpt-4o-mini")
 _embedding_service = EmbeddingService()
+_rate_limiter = create_limiter()
+# Ссылки на фоновые проверки кеша, чтобы задачи не собрал GC
+_background_tasks: set[asyncio.Task] = set()
 
 # Язык поиска в БД — всегда казахский (контент только на kk)
 DB_LANGUAGE = "kk"
@@ -47,26 +54,116 @@ def _pick_clarify_options(faqs_with_scores: list, max_count: int = 4) -> tuple[l
     return titles, ids
 
 
+async def _enforce_rate_limit(user_id: str) -> None:
+    try:
+        decision = await _rate_limiter.hit(user_id)
+    except Exception as e:
+        # Недоступный Redis не должен ронять /ask
+        logger.error(f"[ASK] rate limiter error: {e}")
+        return
+    if not decision.allowed:
+        metrics.inc("rate_limited")
+        logger.info(f"[ASK] rate limited user={user_id} retry_after={decision.retry_after:.1f}s")
+        raise RateLimitException(retry_after=decision.retry_after)
+
+
 @router.post("/ask", response_model=AskResponse)
 async def ask_question(
     request: AskRequest,
-    session: AsyncSession = Depends(get_session),
 ):
-    gpt = GPTService()
-    search = EnhancedSearchService()
+    if settings.RATE_LIMIT_ENABLED:
+        await _enforce_rate_limit(request.user_id)
 
     # ui_language — язык общения с пользователем (выбранный в боте)
-    # Если передан ru/kk явно — используем его для UI
+    # Если передан ru/kk явно — используем его для UI,
+    # иначе (auto) — локальный детектор, без LLM
     # search всегда идёт по kk (контент только там)
-    ui_language: str = "kk"
+    ui_language: str = language_detector.detect(request.question)
     if request.language in ("ru", "kk"):
         ui_language = request.language
 
-    # Классификация + embedding параллельно
-    clf, query_embedding = await asyncio.gather(
-        _classifier.classify(request.question),
-        _embedding_service.create_embedding(request.question),
-    )
+    # Классификация + embedding параллельно; классификация не нужна,
+    # если ответ найдётся в семантическом кеше
+    classify_task = asyncio.create_task(_classifier.classify(request.question))
+    try:
+        query_embedding = await _embedding_service.create_embedding(request.question)
+    except BaseException:
+        classify_task.cancel()
+        raise
+
+    generation = semantic_cache.generation
+    if settings.SEMANTIC_CACHE_ENABLED:
+        cached = semantic_cache.lookup(query_embedding, ui_language)
+        if cached is not None:
+            response, similarity, cached_question = cached
+            classify_task.cancel()
+            metrics.inc("semantic_cache_hit")
+            logger.info(
+                f"[ASK] semantic cache hit sim={similarity:.3f} | "
+                f"'{request.question[:60]}' ~ '{cached_question[:60]}'"
+            )
+            if semantic_cache.should_verify():
+                _spawn(_verify_cached_answer(request, ui_language, query_embedding, response))
+            return response.model_copy(update={"question": request.question})
+        metrics.inc("semantic_cache_miss")
+
+    clf = await classify_task
+    response = await _answer(request, ui_language, clf, query_embedding)
+    if settings.SEMANTIC_CACHE_ENABLED and _cacheable(clf, response):
+        semantic_cache.store(query_embedding, ui_language, request.question, response, generation)
+    return response
+
+
+def _cacheable(clf: ClassificationResult, response: AskResponse) -> bool:
+    """
+    Не кешируем деградировавшие ответы — иначе их получат все перефразировки
+    на SEMANTIC_CACHE_TTL:
+    - confidence=0.0 — детерминированный fallback классификатора (сбой OpenAI);
+    - no_match кроме off_topic — пустой поиск (переиндексация, сбой БД);
+      шаблонный ответ и так дешёвый.
+    """
+    if clf.confidence == 0.0:
+        return False
+    return response.action != "no_match" or clf.intent == "off_topic"
+
+
+def _spawn(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _verify_cached_answer(
+    request: AskRequest,
+    ui_language: str,
+    query_embedding: list,
+    cached: AskResponse,
+) -> None:
+    """Выборочная проверка попадания: полный пересчёт и сравнение с кешем."""
+    try:
+        clf = await _classifier.classify(request.question)
+        fresh = await _answer(request, ui_language, clf, query_embedding)
+    except Exception as e:
+        logger.warning(f"[ASK] semantic cache verification failed: {e}")
+        return
+    matched = same_answer(cached, fresh)
+    semantic_cache.record_verification(matched)
+    if not matched:
+        logger.warning(
+            f"[ASK] semantic cache false hit: '{request.question[:60]}' "
+            f"cached={cached.action}/{cached.faq_id} fresh={fresh.action}/{fresh.faq_id}"
+        )
+
+
+async def _answer(
+    request: AskRequest,
+    ui_language: str,
+    clf: ClassificationResult,
+    query_embedding: list,
+) -> AskResponse:
+    """Полный пайплайн: поиск, выбор действия и генерация текста."""
+    gpt = GPTService()
+    search = EnhancedSearchService()
 
     logger.info(
         f"[ASK] '{request.question[:60]}' | "
@@ -104,12 +201,18 @@ async def ask_question(
         )
 
     # ─── Поиск всегда по kk (контент в БД только на казахском) ──────────────
-    faqs_with_scores = await search.hybrid_search(
-        session=session,
-        query_embedding=query_embedding,
-        query_text=request.question,
-        language=DB_LANGUAGE,  # всегда kk
-        limit=8,
+    # Соединение берётся только на время поиска — GPT-вызовы ниже
+    # не держат соединение из пула
+    async with search_session() as session:
+        faqs_with_scores = await search.hybrid_search(
+            session=session,
+            query_embedding=query_embedding,
+            query_text=request.question,
+            language=DB_LANGUAGE,  # всегда kk
+            limit=8,
+        )
+    faqs_with_scores = search.rerank(
+        request.question, faqs_with_scores, intent=clf.intent, slots=clf.slots
     )
 
     if not faqs_with_scores:
@@ -1,7 +1,9 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.dependencies import CacheValidator
+from app.core import content_version
 from app.core.database import get_session
 from app.repositories.faq_repository import FAQRepository
 from app.schemas.faq import FAQResponse, FAQCreate, FAQUpdate, CategoriesResponse
@@ -16,12 +18,19 @@ router = APIRouter()
 
 @router.get("/categories", response_model=CategoriesResponse)
 async def get_categories(
+    request: Request,
+    response: Response,
     language: str = Query(default="kk", min_length=2, max_length=10),
     session: AsyncSession = Depends(get_session)
 ):
     """
     Получить список всех категорий FAQ
     """
+    validator = await CacheValidator.from_request(request)
+    if validator.not_modified:
+        return validator.not_modified_response()
+    validator.apply(response)
+    
     repo = FAQRepository(session)
     categories = await repo.get_all_categories(language=language)
     
@@ -32,6 +41,8 @@ async def get_categories(
 @router.get("/category/{category}", response_model=List[FAQResponse])
 async def get_faq_by_category(
     category: str,
+    request: Request,
+    response: Response,
     language: str = Query(default="kk", min_length=2, max_length=10),
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=100),
@@ -40,6 +51,11 @@ async def get_faq_by_category(
     """
     Получить все FAQ по категории
     """
+    validator = await CacheValidator.from_request(request)
+    if validator.not_modified:
+        return validator.not_modified_response()
+    validator.apply(response)
+    
     repo = FAQRepository(session)
     faqs = await repo.get_by_category(
         category=category,
@@ -61,11 +77,18 @@ async def get_faq_by_category(
 @router.get("/{faq_id}", response_model=FAQResponse)
 async def get_faq_by_id(
     faq_id: int,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session)
 ):
     """
     Получить FAQ по ID
     """
+    validator = await CacheValidator.from_request(request)
+    if validator.not_modified:
+        return validator.not_modified_response()
+    validator.apply(response)
+    
     repo = FAQRepository(session)
     faq = await repo.get_by_id(faq_id)
     
@@ -89,6 +112,7 @@ async def create_faq(
     """
     repo = FAQRepository(session)
     faq = await repo.create(faq_data.model_dump())
+    await content_version.bump()
     
     logger.info(f"Created new FAQ with id={faq.id}")
     return faq
@@ -112,6 +136,7 @@ async def update_faq(
         )
     
     faq = await repo.update(faq_id, faq_data.model_dump(exclude_unset=True))
+    await content_version.bump()
     
     logger.info(f"Updated FAQ with id={faq_id}")
     return faq
@@ -134,6 +159,7 @@ async def delete_faq(
         )
     
     await repo.delete(faq_id)
+    await content_version.bump()
     logger.info(f"Deleted FAQ with id={faq_id}")
 
 
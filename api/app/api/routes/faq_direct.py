@@ -4,14 +4,17 @@
 Используется ботом когда пользователь выбрал вариант из clarify-меню.
 Не делает никакого поиска — просто достаёт FAQ из БД и возвращает.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.dependencies import CacheValidator
+from app.config import settings
 from app.core.database import get_session
 from app.ai.search_enhanced import EnhancedSearchService
 from app.schemas.ask import AskResponse
 from app.core.logging_config import get_logger
+from app.repositories.search_repository import search_repository
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -20,31 +23,41 @@ router = APIRouter()
 @router.get("/faq-direct/{faq_id}", response_model=AskResponse)
 async def get_faq_direct(
     faq_id: int,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
 ):
     """
     Вернуть прямой ответ по faq_id — без поиска, без классификации.
     Используется после того как пользователь выбрал вариант в clarify.
+    Поддерживает If-None-Match: 304 без запроса к БД.
     """
-    sql = text("""
-        SELECT
-            faq_v2.id,
-            faq_content.question,
-            faq_content.answer_text,
-            faq_content.video          AS video_file_id,
-            faq_v2.category,
-            faq_content.language,
-            faq_v2.created_at,
-            faq_content.description_footer
-        FROM faq_content
-        INNER JOIN faq_v2 ON faq_content.faq_id = faq_v2.id
-        WHERE faq_v2.id = :faq_id
-          AND faq_v2.is_active = TRUE
-        LIMIT 1
-    """)
+    validator = await CacheValidator.from_request(request)
+    if validator.not_modified:
+        return validator.not_modified_response()
+    validator.apply(response)
 
-    result = await session.execute(sql, {"faq_id": faq_id})
-    row = result.fetchone()
+    if settings.SEARCH_BACKEND == "asyncpg":
+        row = await search_repository.faq_direct(faq_id)
+    else:
+        sql = text("""
+            SELECT
+                faq_v2.id,
+                faq_content.question,
+                faq_content.answer_text,
+                faq_content.video          AS video_file_id,
+                faq_v2.category,
+                faq_content.language,
+                faq_v2.created_at,
+                faq_content.description_footer
+            FROM faq_content
+            INNER JOIN faq_v2 ON faq_content.faq_id = faq_v2.id
+            WHERE faq_v2.id = :faq_id
+              AND faq_v2.is_active = TRUE
+            LIMIT 1
+        """)
+        result = await session.execute(sql, {"faq_id": faq_id})
+        row = result.fetchone()
 
     if not row:
         raise HTTPException(status_code=404, detail=f"FAQ {faq_id} not found")
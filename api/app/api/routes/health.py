@@ -6,6 +6,7 @@ from sqlalchemy import text
 from app.core.database import get_session
 from app.schemas.responses import HealthCheckResponse
 from app.config import settings
+from app.core import metrics
 from app.core.logging_config import get_logger
 
 router = APIRouter()
@@ -33,4 +34,12 @@ async def health_check(session: AsyncSession = Depends(get_session)):
         database=db_status,
         version="1.0.0",
         environment=settings.ENVIRONMENT
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/metrics")
+async def metrics_snapshot() -> dict:
+    """
+    Счётчики и gauges процесса API
+    """
+    return metrics.snapshot()
@@ -1,11 +1,8 @@
 import os
 from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 from pydantic import BaseModel
-from app.core.database import get_session
-from app.ai.embeddings_enhanced import EmbeddingService
 from app.core.logging_config import get_logger
+from app.services.reindex_queue import reindex_queue
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -14,34 +11,19 @@ INTERNAL_SECRET = os.environ['INTERNAL_WEBHOOK_SECRET']
 
 class RebuildRequest(BaseModel):
     faq_content_id: int
+    # Ручной rebuild — пересчитать, даже если content_hash совпал
+    force: bool = True
 
 def verify_secret(x_internal_secret: str = Header(...)):
     if x_internal_secret != INTERNAL_SECRET:
         raise HTTPException(status_code=403, detail='Forbidden')
 
-@router.post('/internal/embeddings/rebuild')
+@router.post('/internal/embeddings/rebuild', status_code=202)
 async def rebuild_embedding(
     body: RebuildRequest,
-    session: AsyncSession = Depends(get_session),
     _: None = Depends(verify_secret)
 ):
-    row = await session.execute(
-        text('SELECT question, answer_text FROM faq_content WHERE id = :id'),
-        {'id': body.faq_content_id}
-    )
-    record = row.fetchone()
-    if not record:
-        raise HTTPException(status_code=404, detail='faq_content not found')
-
-    emb_service = EmbeddingService()
-    combined = f"{record[0]} {record[1]}"
-    embedding = await emb_service.create_embedding(combined)
-    emb_str = '[' + ','.join(map(str, embedding)) + ']'
-
-    await session.execute(
-        text('UPDATE faq_content SET question_embedding = CAST(:emb AS vector) WHERE id = :id'),
-        {'emb': emb_str, 'id': body.faq_content_id}
-    )
-    await session.commit()
-    logger.info(f'Rebuilt embedding for faq_content_id={body.faq_content_id}')
-    return {'status': 'ok', 'faq_content_id': body.faq_content_id}
+    # Эмбеддинг считает фоновый воркер: правки debounce-ятся и уходят батчем
+    depth = reindex_queue.enqueue(body.faq_content_id, force=body.force)
+    logger.info(f'Queued faq_content_id={body.faq_content_id} for re-embedding (depth={depth})')
+    return {'status': 'queued', 'faq_content_id': body.faq_content_id, 'queue_depth': depth}
@@ -1,7 +1,7 @@
 # api/app/config.py
 from functools import lru_cache
 from typing import Literal
-from pydantic import PostgresDsn, field_validator
+from pydantic import Field, PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,7 +14,37 @@ class Settings(BaseSettings):
     )
     
     DATABASE_URL: PostgresDsn
+    REDIS_URL: str = "redis://redis:6379/0"
     
+    # Горячие запросы поиска: asyncpg (prepared statements) или sqlalchemy (fallback)
+    SEARCH_BACKEND: Literal["asyncpg", "sqlalchemy"] = "asyncpg"
+    PG_POOL_MIN_SIZE: int = 2
+    PG_POOL_MAX_SIZE: int = 10
+    PG_STATEMENT_CACHE_SIZE: int = 100
+
+    # HNSW: ширина поиска на запрос и итеративный скан (pgvector >= 0.8)
+    HNSW_EF_SEARCH: int = 40
+    HNSW_ITERATIVE_SCAN: Literal["off", "strict_order", "relaxed_order"] = "strict_order"
+
+    # Хранение эмбеддингов faq_content — должно совпадать со схемой
+    # (app/scripts/compact_embeddings.py меняет схему и печатает эти значения)
+    EMBEDDING_STORAGE: Literal["vector", "halfvec"] = "vector"
+    # Грубый отбор по binary_quantize (hamming), затем пересчёт по полным векторам
+    SEARCH_BINARY_PREFILTER: bool = False
+    SEARCH_BINARY_CANDIDATES_FACTOR: int = 10
+    # Поиск сразу по question_embedding и answer_embedding (weighted max).
+    # Включать после backfill: индексатор пишет вопрос без ответа в question_embedding.
+    # Binary-префильтр в этом режиме не используется.
+    SEARCH_MULTI_VECTOR: bool = False
+    SEARCH_QUESTION_WEIGHT: float = 1.0
+    SEARCH_ANSWER_WEIGHT: float = 0.9
+
+    # Локальный реранкер кандидатов (app/ai/reranker.py); веса — вывод
+    # scripts/fit_reranker.py, пусто — app/ai/reranker_weights.json.
+    # Включать после подгонки весов и проверки доли прямых ответов
+    SEARCH_RERANK: bool = False
+    RERANKER_WEIGHTS_PATH: str = ""
+
     # Directus configuration (FIXED for Docker network)
     DIRECTUS_URL: str = "http://directus:8055"  # Internal Docker network
     DIRECTUS_PUBLIC_URL: str = "http://localhost:8054"  # External access (for docs)
@@ -27,9 +57,38 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     AI_MODEL: str = "gpt-4o-mini"
     AI_EMBEDDING_MODEL: str = "text-embedding-3-small"
+    AI_EMBEDDING_DIMENSIONS: int = 1536
     AI_SIMILARITY_THRESHOLD_HIGH: float = 0.7
     AI_SIMILARITY_THRESHOLD_LOW: float = 0.3
     
+    # Очередь переиндексации за webhook-ом Directus (секунды)
+    REINDEX_DEBOUNCE_SECONDS: float = 3.0
+    REINDEX_MAX_DELAY_SECONDS: float = 30.0
+    
+    # search_cache: пакетная запись попаданий и вытеснение
+    SEARCH_CACHE_FLUSH_INTERVAL: int = 30
+    SEARCH_CACHE_EVICT_INTERVAL: int = 600
+    SEARCH_CACHE_MAX_ROWS: int = 10000
+    SEARCH_CACHE_MAX_AGE_DAYS: int = 7
+    
+    # Семантический кеш ответов /api/ask (cosine по эмбеддингу вопроса)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 2000
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_TTL: int = 3600
+    # доля попаданий, для которых ответ пересчитывается в фоне (оценка ложных попаданий)
+    SEMANTIC_CACHE_SAMPLE_RATE: float = 0.02
+    
+    # Версия контента для ETag: пересчёт в фоне (секунды) и max-age ответов
+    CONTENT_VERSION_REFRESH: int = 30
+    CONTENT_CACHE_MAX_AGE: int = 60
+    
+    # Token bucket на user_id для /api/ask (чуть мягче, чем в боте)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE: Literal["memory", "redis"] = "memory"
+    RATE_LIMIT_RATE: float = Field(0.25, gt=0)
+    RATE_LIMIT_BURST: int = 8
+    
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
     def validate_database_url(cls, v: str) -> str:
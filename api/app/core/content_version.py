@@ -0,0 +1,121 @@
+# api/app/core/content_version.py
+"""
+Версия контента FAQ для ETag и инвалидации кешей.
+
+Версия — md5 по всем строкам faq (legacy), faq_v2 и faq_content,
+которые отдают read-эндпоинты, и по таблице synonyms. Считается одним
+запросом в фоне раз в CONTENT_VERSION_REFRESH секунд и при bump() после
+записи, поэтому проверка If-None-Match не обращается к БД.
+
+Производные структуры в памяти (синонимы, кеши) подписываются через
+subscribe() и пересобираются при смене версии.
+"""
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import text
+
+from app.core.database import get_session_maker
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_SIGNATURE_SQL = text("""
+    SELECT md5(
+        coalesce((
+            SELECT string_agg(
+                md5(concat_ws('|', faq.id, faq.question, faq.answer_text,
+                              faq.video_url, faq.category, faq.language)),
+                ',' ORDER BY faq.id)
+            FROM faq
+        ), '')
+        || '#' ||
+        coalesce((
+            SELECT string_agg(
+                md5(concat_ws('|', faq_v2.id, faq_v2.category, faq_v2.is_active,
+                              faq_v2.updated_at, faq_content.id, faq_content.language,
+                              faq_content.question, faq_content.answer_text,
+                              faq_content.video, faq_content.description_footer)),
+                ',' ORDER BY faq_content.id)
+            FROM faq_content
+            INNER JOIN faq_v2 ON faq_v2.id = faq_content.faq_id
+        ), '')
+        || '#' ||
+        coalesce((
+            SELECT string_agg(
+                md5(concat_ws('|', synonyms.id, synonyms.language,
+                              synonyms.term, synonyms.synonyms::text)),
+                ',' ORDER BY synonyms.id)
+            FROM synonyms
+        ), '')
+    )
+""")
+
+_version: str | None = None
+_lock = asyncio.Lock()
+_subscribers: List[Callable[[str], Awaitable[None]]] = []
+
+
+def subscribe(callback: Callable[[str], Awaitable[None]]) -> None:
+    """callback(version) вызывается после каждой смены версии."""
+    _subscribers.append(callback)
+
+
+async def _notify(version: str) -> None:
+    for callback in _subscribers:
+        try:
+            await callback(version)
+        except Exception as e:
+            logger.error(f"[ContentVersion] subscriber {callback!r} failed: {e}")
+
+
+async def refresh() -> str:
+    """Пересчитать версию из БД."""
+    global _version
+
+    async with _lock:
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            result = await session.execute(_SIGNATURE_SQL)
+            version = result.scalar_one()
+
+        changed = version != _version
+        if changed:
+            logger.info(f"[ContentVersion] {_version} → {version}")
+            _version = version
+
+    if changed:
+        await _notify(version)
+    return version
+
+
+async def current() -> str:
+    """Текущая версия (из памяти; из БД только при первом вызове)."""
+    if _version is None:
+        return await refresh()
+    return _version
+
+
+async def bump() -> None:
+    """Контент изменён этим процессом — пересчитать версию сразу."""
+    try:
+        await refresh()
+    except Exception as e:
+        logger.error(f"[ContentVersion] bump failed: {e}")
+
+
+def etag(version: str, resource: str) -> str:
+    """Strong ETag ресурса при данной версии контента."""
+    digest = hashlib.sha1(f"{version}|{resource}".encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+async def run_refresh_loop(interval: int) -> None:
+    """Подхватывает изменения, сделанные в обход API (Directus, другие экземпляры)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh()
+        except Exception as e:
+            logger.error(f"[ContentVersion] refresh failed: {e}")
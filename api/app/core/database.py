@@ -1,4 +1,5 @@
 import asyncio
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from sqlalchemy import text
@@ -14,7 +15,9 @@ from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
 
 from app.config import settings
+from app.core import metrics
 from app.core.logging_config import get_logger
+from app.core.vector import register_vector_codec
 
 logger = get_logger(__name__)
 
@@ -37,6 +40,7 @@ def get_engine() -> AsyncEngine:
             pool_recycle=3600,
             poolclass=NullPool if settings.ENVIRONMENT == "testing" else None,
         )
+        register_vector_codec(_engine)
         logger.info("Database engine created")
     
     return _engine
@@ -71,6 +75,55 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+class _CheckoutStats:
+    """Время ожидания соединения из пула (db_session)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> dict:
+        data = {
+            "checkouts": self.count,
+            "wait_avg_ms": round(1000 * self.total / self.count, 2) if self.count else 0.0,
+            "wait_max_ms": round(1000 * self.max, 2),
+        }
+        if _engine is not None:
+            pool = _engine.pool
+            data["pool_size"] = pool.size() if hasattr(pool, "size") else None
+            data["checked_out"] = pool.checkedout() if hasattr(pool, "checkedout") else None
+        return data
+
+
+_checkout_stats = _CheckoutStats()
+metrics.register_gauge("db_pool", _checkout_stats.snapshot)
+
+
+def record_checkout_wait(seconds: float) -> None:
+    _checkout_stats.observe(seconds)
+
+
+@asynccontextmanager
+async def db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Короткая сессия: соединение берётся из пула сразу и возвращается
+    при выходе из блока. Для кода, который между запросами к БД
+    ждёт внешние сервисы (OpenAI) — соединение не держится всё это время.
+    """
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        started = time.perf_counter()
+        await session.connection()
+        record_checkout_wait(time.perf_counter() - started)
+        yield session
+
+
 async def check_db_connection(max_retries: int = 5, retry_delay: int = 2) -> bool:
     engine = get_engine()
     
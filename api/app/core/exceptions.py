@@ -26,4 +26,9 @@ class DatabaseException(AppException):
 
 class ValidationException(AppException):
     def __init__(self, message: str = "Ошибка валидации данных", details: dict[str, Any] | None = None):
-        super().__init__(message, status_code=422, details=details)
\ No newline at end of file
+        super().__init__(message, status_code=422, details=details)
+
+
+class RateLimitException(AppException):
+    def __init__(self, message: str = "Слишком много запросов", retry_after: float = 0.0):
+        super().__init__(message, status_code=429, details={"retry_after": round(retry_after, 1)})
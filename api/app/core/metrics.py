@@ -0,0 +1,30 @@
+# api/app/core/metrics.py
+"""
+Минимальный реестр метрик процесса API.
+
+Счётчики — inc("name"), gauges — функции, которые вызываются при snapshot().
+Снимок отдаётся на GET /metrics.
+"""
+from collections import defaultdict
+from typing import Any, Callable
+
+_counters: dict[str, int] = defaultdict(int)
+_gauges: dict[str, Callable[[], Any]] = {}
+
+
+def inc(name: str, value: int = 1) -> None:
+    _counters[name] += value
+
+
+def register_gauge(name: str, fn: Callable[[], Any]) -> None:
+    _gauges[name] = fn
+
+
+def snapshot() -> dict[str, Any]:
+    data: dict[str, Any] = {"counters": dict(_counters)}
+    for name, fn in _gauges.items():
+        try:
+            data[name] = fn()
+        except Exception as e:
+            data[name] = {"error": str(e)}
+    return data
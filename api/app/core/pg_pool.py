@@ -0,0 +1,76 @@
+# api/app/core/pg_pool.py
+"""
+Пул сырых asyncpg-соединений для горячих read-only запросов.
+
+В отличие от сессии SQLAlchemy здесь нет компиляции SQL, неявных
+BEGIN/ROLLBACK (соединение вне транзакции — autocommit) и обёрток
+над строками. Запросы подготавливаются один раз на соединение —
+asyncpg хранит именованные prepared statements в кеше соединения
+(PG_STATEMENT_CACHE_SIZE) и дальше шлёт только Bind/Execute.
+"""
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+
+import asyncpg
+
+from app.config import settings
+from app.core.database import record_checkout_wait
+from app.core.logging_config import get_logger
+from app.core.vector import init_vector_connection
+
+logger = get_logger(__name__)
+
+_pool: asyncpg.Pool | None = None
+
+
+class Row(asyncpg.Record):
+    """Запись asyncpg с доступом к колонкам как к атрибутам (row.question)."""
+
+    def __getattr__(self, name: str):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def _asyncpg_dsn() -> str:
+    # postgresql+asyncpg://... → postgresql://...
+    return str(settings.DATABASE_URL).replace("+asyncpg", "", 1)
+
+
+async def get_pg_pool() -> asyncpg.Pool:
+    global _pool
+
+    if _pool is None:
+        _pool = await asyncpg.create_pool(
+            _asyncpg_dsn(),
+            min_size=settings.PG_POOL_MIN_SIZE,
+            max_size=settings.PG_POOL_MAX_SIZE,
+            statement_cache_size=settings.PG_STATEMENT_CACHE_SIZE,
+            max_inactive_connection_lifetime=3600,
+            record_class=Row,
+            init=init_vector_connection,  # бинарный кодек vector на каждом соединении
+        )
+        logger.info("asyncpg pool created")
+
+    return _pool
+
+
+@asynccontextmanager
+async def pg_connection() -> AsyncGenerator[asyncpg.Connection, None]:
+    """Соединение из пула на время блока; ожидание попадает в метрику db_pool."""
+    pool = await get_pg_pool()
+    started = time.perf_counter()
+    async with pool.acquire() as conn:
+        record_checkout_wait(time.perf_counter() - started)
+        yield conn
+
+
+async def close_pg_pool() -> None:
+    global _pool
+
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+        logger.info("asyncpg pool closed")
@@ -0,0 +1,89 @@
+# api/app/core/vector.py
+"""
+Бинарный кодек pgvector.
+
+Эмбеддинги передаются в Postgres как float32-буфер (4 байта на
+компоненту), а не как текст "[0.0123,...]" на ~30 КБ — без
+форматирования на клиенте и парсинга на сервере. Кодек регистрируется
+на каждом соединении asyncpg: и в пуле SQLAlchemy, и в сыром пуле.
+
+Эмбеддинги в faq_content хранятся нормализованными (migrations_v2/003):
+для единичных векторов -(a <#> b) совпадает с косинусом, поэтому поиск
+идёт по частичным HNSW-индексам vector_ip_ops.
+"""
+from typing import List, Sequence
+
+import numpy as np
+from pgvector.asyncpg import register_vector
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+# Версия расширения vector — определяется на первом соединении процесса
+_pgvector_version: tuple[int, ...] | None = None
+
+
+def to_vector(values: Sequence[float] | np.ndarray) -> np.ndarray:
+    """Эмбеддинг → float32-массив для параметра типа vector."""
+    return np.asarray(values, dtype=np.float32)
+
+
+def unit_vector(values: Sequence[float] | np.ndarray) -> np.ndarray:
+    """Эмбеддинг → нормализованный float32-массив (L2-норма = 1)."""
+    vec = to_vector(values)
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm > 0 else vec
+
+
+async def init_vector_connection(conn) -> None:
+    """Новое asyncpg-соединение: бинарный кодек + версия pgvector."""
+    global _pgvector_version
+
+    await register_vector(conn)
+    if _pgvector_version is None:
+        raw = await conn.fetchval("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        _pgvector_version = tuple(int(part) for part in raw.split(".")) if raw else (0,)
+
+
+def hnsw_search_settings(limit: int) -> List[str]:
+    """
+    SET LOCAL для одного ANN-запроса (выполнять в его транзакции).
+
+    ef_search не меньше LIMIT — иначе HNSW вернёт меньше строк, чем просили.
+    Итеративный скан (pgvector >= 0.8) добирает кандидатов, если часть
+    отсеяна фильтрами вне предиката индекса.
+    """
+    statements = [f"SET LOCAL hnsw.ef_search = {max(settings.HNSW_EF_SEARCH, limit)}"]
+    if settings.HNSW_ITERATIVE_SCAN != "off" and (_pgvector_version or (0,)) >= (0, 8):
+        statements.append(f"SET LOCAL hnsw.iterative_scan = {settings.HNSW_ITERATIVE_SCAN}")
+    return statements
+
+
+def register_vector_codec(engine: AsyncEngine) -> None:
+    """Регистрировать бинарный кодек на каждом новом соединении SQLAlchemy."""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.run_async(init_vector_connection)
+
+
+class BinaryVector(Vector):
+    """
+    Колонка vector для ORM при зарегистрированном бинарном кодеке:
+    параметр уходит массивом (кодек сам сериализует), результат
+    приходит готовым numpy-массивом.
+    """
+
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        def process(value):
+            if value is None:
+                return None
+            return to_vector(value)
+        return process
+
+    def result_processor(self, dialect, coltype):
+        return None
@@ -1,6 +1,7 @@
 """
 FastAPI точка входа с lifespan управлением и централизованной обработкой ошибок
 """
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -11,11 +12,18 @@ from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api.routes import faq, health, ask, faq_direct 
+from app.ai.synonyms import synonym_index
 from app.config import settings
+from app.core import content_version
 from app.core.database import check_db_connection, close_db_connection
+from app.core.pg_pool import close_pg_pool
 from app.core.exceptions import AppException
+from app.core.redis import close_redis
 from app.core.logging_config import get_logger, setup_logging
 from app.api.routes import internal
+from app.services.reindex_queue import reindex_queue
+from app.services.search_cache import search_cache_maintainer
+from app.services.semantic_cache import semantic_cache
 
 
 setup_logging()
@@ -37,12 +45,34 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.error(f"❌ Failed to connect to database: {e}")
         raise
     
+    # первый bump тоже уведомляет: контент мог смениться, пока API не работал
+    content_version.subscribe(synonym_index.on_content_changed)
+    content_version.subscribe(search_cache_maintainer.invalidate)
+    content_version.subscribe(semantic_cache.on_content_changed)
+    await content_version.bump()
+    refresh_task = asyncio.create_task(
+        content_version.run_refresh_loop(settings.CONTENT_VERSION_REFRESH)
+    )
+    reindex_task = asyncio.create_task(reindex_queue.run())
+    search_cache_task = asyncio.create_task(search_cache_maintainer.run())
+    
     logger.info("✅ API started successfully")
     
     yield
     
     logger.info("🛑 Shutting down FAQ Bot API...")
+    refresh_task.cancel()
+    # воркеры дорабатывают очередь и сбрасывают попадания до закрытия пулов
+    reindex_task.cancel()
+    search_cache_task.cancel()
+    for task in (reindex_task, search_cache_task):
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await close_pg_pool()
     await close_db_connection()
+    await close_redis()
     logger.info("✅ API shutdown complete")
 
 
@@ -73,6 +103,10 @@ async def app_exception_handler(request: Request, exc: AppException) -> JSONResp
         f"Path: {request.url.path} | Details: {exc.details}"
     )
     
+    headers = None
+    if "retry_after" in exc.details:
+        headers = {"Retry-After": str(max(1, round(exc.details["retry_after"])))}
+    
     return JSONResponse(
         status_code=exc.status_code,
         content={
@@ -81,6 +115,7 @@ async def app_exception_handler(request: Request, exc: AppException) -> JSONResp
             "error_code": exc.__class__.__name__,
             "details": exc.details,
         },
+        headers=headers,
     )
 
 
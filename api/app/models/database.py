@@ -2,7 +2,7 @@ from datetime import datetime
 from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
 from sqlalchemy.sql import func
 from app.core.database import Base
-from pgvector.sqlalchemy import Vector
+from app.core.vector import BinaryVector
 
 
 
@@ -17,7 +17,7 @@ class FAQ(Base):
     language = Column(String(10), default="kk", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    embedding = Column(Vector(1536), nullable=True)
+    embedding = Column(BinaryVector(1536), nullable=True)
     
     def __repr__(self) -> str:
         return f"<FAQ(id={self.id}, category={self.category})>"
@@ -0,0 +1,263 @@
+"""
+Репозиторий горячих read-only запросов поиска на сыром asyncpg
+"""
+from typing import List, Optional
+
+from app.config import settings
+from app.core.pg_pool import Row, pg_connection
+from app.core.vector import hnsw_search_settings, unit_vector
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Языки с частичным HNSW-индексом (init_db/migrations_v2/003)
+INDEXED_LANGUAGES = ("kk", "ru")
+
+# Порядок колонок совпадает с SQLAlchemy-версией в search_enhanced.py:
+# id, question, answer_text, video_file_id, category, language,
+# created_at, description_footer, score, priority, click_count, view_count
+_VECTOR_SEARCH_TEMPLATE = """
+    SELECT
+        faq_v2.id,
+        faq_content.question,
+        faq_content.answer_text,
+        faq_content.video          AS video_file_id,
+        faq_v2.category,
+        faq_content.language,
+        faq_v2.created_at,
+        faq_content.description_footer,
+        -(faq_content.question_embedding <#> {embedding}) AS similarity,
+        faq_v2.priority,
+        faq_v2.click_count,
+        faq_v2.view_count
+    FROM faq_content
+    INNER JOIN faq_v2 ON faq_content.faq_id = faq_v2.id
+    WHERE {language_filter}
+      AND faq_content.is_active
+      AND faq_content.question_embedding IS NOT NULL
+    ORDER BY faq_content.question_embedding <#> {embedding}
+    LIMIT {limit}
+"""
+
+# Двухэтапный поиск: hamming по binary_quantize (частичный индекс
+# bit_hamming_ops), затем точный inner product только по кандидатам
+_BINARY_PREFILTER_TEMPLATE = """
+    WITH coarse AS (
+        SELECT faq_content.id
+        FROM faq_content
+        WHERE {language_filter}
+          AND faq_content.is_active
+          AND faq_content.question_embedding IS NOT NULL
+        ORDER BY binary_quantize(faq_content.question_embedding)::bit({dimensions})
+                 <~> binary_quantize({query})
+        LIMIT {limit} * {factor}
+    )
+    SELECT
+        faq_v2.id,
+        faq_content.question,
+        faq_content.answer_text,
+        faq_content.video          AS video_file_id,
+        faq_v2.category,
+        faq_content.language,
+        faq_v2.created_at,
+        faq_content.description_footer,
+        -(faq_content.question_embedding <#> {embedding}) AS similarity,
+        faq_v2.priority,
+        faq_v2.click_count,
+        faq_v2.view_count
+    FROM coarse
+    INNER JOIN faq_content ON faq_content.id = coarse.id
+    INNER JOIN faq_v2 ON faq_content.faq_id = faq_v2.id
+    ORDER BY faq_content.question_embedding <#> {embedding}
+    LIMIT {limit}
+"""
+
+# Multi-vector: два ANN-скана (вопрос и ответ, оба по частичным индексам)
+# в одном запросе; итоговый балл строки — max(w_q * sim_q, w_a * sim_a)
+_MULTI_VECTOR_TEMPLATE = """
+    WITH by_question AS (
+        SELECT faq_content.id,
+               -(faq_content.question_embedding <#> {embedding}) * {question_weight} AS score
+        FROM faq_content
+        WHERE {language_filter}
+          AND faq_content.is_active
+          AND faq_content.question_embedding IS NOT NULL
+        ORDER BY faq_content.question_embedding <#> {embedding}
+        LIMIT {limit}
+    ),
+    by_answer AS (
+        SELECT faq_content.id,
+               -(faq_content.answer_embedding <#> {embedding}) * {answer_weight} AS score
+        FROM faq_content
+        WHERE {language_filter}
+          AND faq_content.is_active
+          AND faq_content.answer_embedding IS NOT NULL
+        ORDER BY faq_content.answer_embedding <#> {embedding}
+        LIMIT {limit}
+    ),
+    fused AS (
+        SELECT id, max(score) AS score
+        FROM (
+            SELECT id, score FROM by_question
+            UNION ALL
+            SELECT id, score FROM by_answer
+        ) AS scored
+        GROUP BY id
+    )
+    SELECT
+        faq_v2.id,
+        faq_content.question,
+        faq_content.answer_text,
+        faq_content.video          AS video_file_id,
+        faq_v2.category,
+        faq_content.language,
+        faq_v2.created_at,
+        faq_content.description_footer,
+        fused.score AS similarity,
+        faq_v2.priority,
+        faq_v2.click_count,
+        faq_v2.view_count
+    FROM fused
+    INNER JOIN faq_content ON faq_content.id = fused.id
+    INNER JOIN faq_v2 ON faq_content.faq_id = faq_v2.id
+    ORDER BY fused.score DESC
+    LIMIT {limit}
+"""
+
+
+def vector_search_sql(language: str, embedding: str, limit: str, language_param: str) -> str:
+    """
+    SQL векторного поиска под язык запроса, EMBEDDING_STORAGE и режим
+    (multi-vector, binary-префильтр или один HNSW-скан).
+
+    embedding — выражение типа vector (параметр запроса); для halfvec-колонок
+    приводится к halfvec на сервере, клиентский кодек остаётся float32.
+    Язык из INDEXED_LANGUAGES подставляется литералом: предикат частичного
+    индекса должен следовать из WHERE при планировании, а для параметра
+    (generic plan prepared statement) планировщик индекс не выберет.
+    Остальные языки — через параметр language_param, без индекса.
+    """
+    if language in INDEXED_LANGUAGES:
+        language_filter = f"faq_content.language = '{language}'"
+    else:
+        language_filter = f"faq_content.language = {language_param}"
+
+    column_embedding = embedding
+    if settings.EMBEDDING_STORAGE == "halfvec":
+        column_embedding = f"CAST({embedding} AS halfvec)"
+
+    if settings.SEARCH_MULTI_VECTOR:
+        return _MULTI_VECTOR_TEMPLATE.format(
+            embedding=column_embedding,
+            limit=limit,
+            language_filter=language_filter,
+            question_weight=float(settings.SEARCH_QUESTION_WEIGHT),
+            answer_weight=float(settings.SEARCH_ANSWER_WEIGHT),
+        )
+    if settings.SEARCH_BINARY_PREFILTER:
+        return _BINARY_PREFILTER_TEMPLATE.format(
+            embedding=column_embedding,
+            query=embedding,
+            limit=limit,
+            language_filter=language_filter,
+            dimensions=settings.AI_EMBEDDING_DIMENSIONS,
+            factor=settings.SEARCH_BINARY_CANDIDATES_FACTOR,
+        )
+    return _VECTOR_SEARCH_TEMPLATE.format(
+        embedding=column_embedding, limit=limit, language_filter=language_filter
+    )
+
+
+def ann_candidates(limit: int) -> int:
+    """Сколько строк HNSW-скан должен вернуть для LIMIT limit (для ef_search)."""
+    if settings.SEARCH_BINARY_PREFILTER and not settings.SEARCH_MULTI_VECTOR:
+        return limit * settings.SEARCH_BINARY_CANDIDATES_FACTOR
+    return limit
+
+
+# asyncpg: $1 — эмбеддинг, $2 — limit, $3 — язык (только для неиндексированных)
+_VECTOR_SEARCH_SQL = {
+    language: vector_search_sql(language, "$1::vector", "$2", "$3")
+    for language in INDEXED_LANGUAGES
+}
+_VECTOR_SEARCH_SQL_ANY = vector_search_sql("", "$1::vector", "$2", "$3")
+
+KEYWORD_SEARCH_SQL = """
+    SELECT
+        faq_v2.id,
+        faq_content.question,
+        faq_content.answer_text,
+        faq_content.video          AS video_file_id,
+        faq_v2.category,
+        faq_content.language,
+        faq_v2.created_at,
+        faq_content.description_footer,
+        ts_rank(
+            to_tsvector('simple', faq_content.question || ' ' || faq_content.answer_text),
+            plainto_tsquery('simple', $1)
+        ) AS relevance,
+        faq_v2.priority,
+        faq_v2.click_count,
+        faq_v2.view_count
+    FROM faq_content
+    INNER JOIN faq_v2 ON faq_content.faq_id = faq_v2.id
+    WHERE faq_content.language = $3
+      AND faq_v2.is_active = TRUE
+      AND (
+          faq_content.question   ILIKE $2
+          OR faq_content.answer_text ILIKE $2
+      )
+    ORDER BY relevance DESC
+    LIMIT $4
+"""
+
+FAQ_DIRECT_SQL = """
+    SELECT
+        faq_v2.id,
+        faq_content.question,
+        faq_content.answer_text,
+        faq_content.video          AS video_file_id,
+        faq_v2.category,
+        faq_content.language,
+        faq_v2.created_at,
+        faq_content.description_footer
+    FROM faq_content
+    INNER JOIN faq_v2 ON faq_content.faq_id = faq_v2.id
+    WHERE faq_v2.id = $1
+      AND faq_v2.is_active = TRUE
+    LIMIT 1
+"""
+
+
+class SearchRepository:
+    """
+    Запросы без сессии: соединение из asyncpg-пула, prepared statement
+    из кеша соединения, строки — asyncpg Record.
+    """
+
+    async def vector_search(self, embedding: List[float], language: str, limit: int) -> List[Row]:
+        args = [unit_vector(embedding), limit]
+        sql = _VECTOR_SEARCH_SQL.get(language)
+        if sql is None:
+            sql = _VECTOR_SEARCH_SQL_ANY
+            args.append(language)
+
+        # SET LOCAL живёт до конца транзакции — соединение в пул
+        # возвращается с настройками по умолчанию
+        async with pg_connection() as conn:
+            async with conn.transaction():
+                await conn.execute("; ".join(hnsw_search_settings(ann_candidates(limit))))
+                return await conn.fetch(sql, *args)
+
+    async def keyword_search(self, query_text: str, language: str, limit: int) -> List[Row]:
+        async with pg_connection() as conn:
+            return await conn.fetch(
+                KEYWORD_SEARCH_SQL, query_text, f"%{query_text}%", language, limit
+            )
+
+    async def faq_direct(self, faq_id: int) -> Optional[Row]:
+        async with pg_connection() as conn:
+            return await conn.fetchrow(FAQ_DIRECT_SQL, faq_id)
+
+
+search_repository = SearchRepository()
@@ -0,0 +1,116 @@
+# api/app/scripts/backfill_embeddings.py
+"""
+Массовая переиндексация faq_content.
+
+    python -m app.scripts.backfill_embeddings --concurrency 4
+    python -m app.scripts.backfill_embeddings --force --language kk
+
+Идёт по id страницами (BATCH x concurrency строк), для каждой страницы
+параллельно считает эмбеддинги батчами и пишет их пакетно (FaqIndexer).
+Строки с тем же content_hash пропускаются — повторный запуск почти бесплатен.
+После каждой страницы в checkpoint-файл пишется последний id (вместе с
+--language и --force): упавший запуск продолжается с него, но только с
+теми же параметрами. Файл удаляется после полного прохода.
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.core.logging_config import get_logger, setup_logging
+from app.core.pg_pool import close_pg_pool
+from app.services.faq_indexer import EMBED_BATCH_SIZE, faq_indexer
+
+setup_logging()
+logger = get_logger(__name__)
+
+DEFAULT_CHECKPOINT = Path(".backfill_embeddings.json")
+
+
+def _load_checkpoint(path: Path, language: Optional[str], force: bool) -> int:
+    if not path.exists():
+        return 0
+    data = json.loads(path.read_text())
+    saved = (data.get("language"), bool(data.get("force")))
+    if saved != (language, force):
+        # иначе строки до last_id остались бы не пройдены с новыми параметрами
+        logger.error(
+            f"[Backfill] checkpoint {path} is for language={saved[0]} force={saved[1]}, "
+            f"not language={language} force={force}; rerun with those or delete the file"
+        )
+        raise SystemExit(1)
+    last_id = int(data["last_id"])
+    logger.info(f"[Backfill] resuming after id={last_id}")
+    return last_id
+
+
+def _save_checkpoint(path: Path, last_id: int, language: Optional[str], force: bool) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"last_id": last_id, "language": language, "force": force}))
+    tmp.replace(path)
+
+
+async def backfill(
+    concurrency: int,
+    batch_size: int,
+    language: Optional[str],
+    force: bool,
+    checkpoint: Path,
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    last_id = _load_checkpoint(checkpoint, language, force)
+    scanned = indexed = 0
+    started = time.perf_counter()
+
+    async def run_batch(rows) -> int:
+        async with semaphore:
+            return await faq_indexer.index_batch(rows)
+
+    while True:
+        page = await faq_indexer.fetch_page(last_id, batch_size * concurrency, language)
+        if not page:
+            break
+
+        pending = faq_indexer.pending(page, force)
+        results = await asyncio.gather(*(
+            run_batch(pending[start:start + batch_size])
+            for start in range(0, len(pending), batch_size)
+        ))
+
+        scanned += len(page)
+        indexed += sum(results)
+        last_id = page[-1]["id"]
+        _save_checkpoint(checkpoint, last_id, language, force)
+        logger.info(f"[Backfill] id<={last_id}: scanned={scanned} indexed={indexed}")
+
+    checkpoint.unlink(missing_ok=True)
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"[Backfill] done: scanned={scanned} indexed={indexed} "
+        f"skipped={scanned - indexed} in {elapsed:.1f}s"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        await backfill(
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            language=args.language,
+            force=args.force,
+            checkpoint=args.checkpoint,
+        )
+    finally:
+        await close_pg_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-embed faq_content in bulk")
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel embeddings API calls")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE, help="rows per API call (2 inputs each, <= 1024)")
+    parser.add_argument("--language", default=None, help="kk | ru (default: all)")
+    parser.add_argument("--force", action="store_true", help="ignore content_hash and re-embed every row")
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT)
+    asyncio.run(main(parser.parse_args()))
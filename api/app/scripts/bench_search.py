@@ -0,0 +1,99 @@
+# api/app/scripts/bench_search.py
+"""
+Микробенчмарк горячих запросов поиска: SQLAlchemy text() vs asyncpg.
+
+    python -m app.scripts.bench_search --iterations 500 --language kk
+
+Эмбеддинг запроса — случайный единичный вектор (OpenAI не вызывается).
+Оба пути идут через EnhancedSearchService (одинаковая дедупликация).
+Для каждого запроса печатает mean / p50 / p95 / p99 в миллисекундах.
+Запускать с ENVIRONMENT=production — иначе echo SQLAlchemy искажает замеры.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from app.ai.search_enhanced import EnhancedSearchService
+from app.core.database import close_db_connection, db_session
+from app.core.logging_config import get_logger, setup_logging
+from app.core.pg_pool import close_pg_pool, get_pg_pool
+from app.repositories.search_repository import search_repository
+
+setup_logging()
+logger = get_logger(__name__)
+logging.getLogger("app.ai.search_enhanced").setLevel(logging.WARNING)
+
+
+def _random_embedding(dim: int = 1536) -> list[float]:
+    vec = [random.gauss(0.0, 1.0) for _ in range(dim)]
+    norm = sum(x * x for x in vec) ** 0.5
+    return [x / norm for x in vec]
+
+
+async def _measure(fn: Callable[[], Awaitable], iterations: int, warmup: int = 20) -> list[float]:
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _report(name: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    print(
+        f"{name:<28} mean={statistics.mean(samples):7.3f}ms "
+        f"p50={pct(0.50):7.3f}ms p95={pct(0.95):7.3f}ms p99={pct(0.99):7.3f}ms"
+    )
+
+
+async def main(iterations: int, language: str, query: str, faq_id: int) -> None:
+    embedding = _random_embedding()
+    await get_pg_pool()
+
+    async def sa_vector():
+        async with db_session() as session:
+            await EnhancedSearchService.find_similar_faqs(session, embedding, language, 8)
+
+    async def pg_vector():
+        await EnhancedSearchService.find_similar_faqs(None, embedding, language, 8)
+
+    async def sa_keyword():
+        async with db_session() as session:
+            await EnhancedSearchService.keyword_search(session, query, language, 8)
+
+    async def pg_keyword():
+        await EnhancedSearchService.keyword_search(None, query, language, 8)
+
+    async def pg_direct():
+        await search_repository.faq_direct(faq_id)
+
+    try:
+        _report("vector / sqlalchemy", await _measure(sa_vector, iterations))
+        _report("vector / asyncpg", await _measure(pg_vector, iterations))
+        _report("keyword / sqlalchemy", await _measure(sa_keyword, iterations))
+        _report("keyword / asyncpg", await _measure(pg_keyword, iterations))
+        _report("faq_direct / asyncpg", await _measure(pg_direct, iterations))
+    finally:
+        await close_pg_pool()
+        await close_db_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare SQLAlchemy and asyncpg search latency")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--language", default="kk")
+    parser.add_argument("--query", default="шот ашу")
+    parser.add_argument("--faq-id", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.language, args.query, args.faq_id))
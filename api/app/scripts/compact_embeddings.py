@@ -0,0 +1,139 @@
+# api/app/scripts/compact_embeddings.py
+"""
+Компактное хранение эмбеддингов faq_content (pgvector >= 0.7).
+
+    python -m app.scripts.compact_embeddings --dimensions 512 --storage halfvec --binary-index
+
+text-embedding-3 обучена так, что первые N компонент, перенормированные,
+совпадают с ответом API при dimensions=N — поэтому колонки укорачиваются
+на месте (subvector + l2_normalize), без повторных вызовов OpenAI.
+Увеличить размерность так нельзя — только полный backfill.
+
+Скрипт пересоздаёт частичные HNSW-индексы по языкам под новый тип,
+при --binary-index добавляет грубые индексы по binary_quantize (bit_hamming_ops)
+и печатает настройки, которые нужно выставить API. Перед запуском
+оцените потерю качества: python -m app.scripts.eval_embeddings.
+"""
+import argparse
+import asyncio
+import re
+
+from app.config import settings
+from app.core.logging_config import get_logger, setup_logging
+from app.core.pg_pool import close_pg_pool, pg_connection
+from app.repositories.search_repository import INDEXED_LANGUAGES
+
+setup_logging()
+logger = get_logger(__name__)
+
+HNSW_WITH = "WITH (m = 16, ef_construction = 64)"
+
+
+def _compaction_sql(dimensions: int, storage: str, binary_index: bool) -> list[str]:
+    column_type = f"{storage}({dimensions})"
+    statements = [
+        "DROP INDEX IF EXISTS idx_faq_answer_embedding",
+        *(f"DROP INDEX IF EXISTS idx_faq_question_embedding_{lang}" for lang in INDEXED_LANGUAGES),
+        *(f"DROP INDEX IF EXISTS idx_faq_answer_embedding_{lang}" for lang in INDEXED_LANGUAGES),
+        *(f"DROP INDEX IF EXISTS idx_faq_question_binary_{lang}" for lang in INDEXED_LANGUAGES),
+        f"""
+        ALTER TABLE faq_content
+            ALTER COLUMN question_embedding TYPE {column_type}
+                USING l2_normalize(subvector(question_embedding::vector, 1, {dimensions}))::{column_type},
+            ALTER COLUMN answer_embedding TYPE {column_type}
+                USING l2_normalize(subvector(answer_embedding::vector, 1, {dimensions}))::{column_type}
+        """,
+    ]
+    for lang in INDEXED_LANGUAGES:
+        predicate = f"WHERE language = '{lang}' AND is_active"
+        statements.append(
+            f"CREATE INDEX idx_faq_question_embedding_{lang} ON faq_content "
+            f"USING hnsw (question_embedding {storage}_ip_ops) {HNSW_WITH} {predicate}"
+        )
+        statements.append(
+            f"CREATE INDEX idx_faq_answer_embedding_{lang} ON faq_content "
+            f"USING hnsw (answer_embedding {storage}_ip_ops) {HNSW_WITH} {predicate}"
+        )
+        if binary_index:
+            statements.append(
+                f"CREATE INDEX idx_faq_question_binary_{lang} ON faq_content "
+                f"USING hnsw ((binary_quantize(question_embedding)::bit({dimensions})) bit_hamming_ops) "
+                f"{HNSW_WITH} {predicate}"
+            )
+    statements.append("ANALYZE faq_content")
+    return statements
+
+
+async def _current_column(conn) -> tuple[str, int]:
+    column = await conn.fetchval("""
+        SELECT format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = 'faq_content'::regclass AND attname = 'question_embedding'
+    """)
+    match = re.fullmatch(r"(\w+)\((\d+)\)", column or "")
+    if not match:
+        raise RuntimeError(f"Unexpected question_embedding type: {column}")
+    return match.group(1), int(match.group(2))
+
+
+async def _report_sizes(conn) -> None:
+    rows = await conn.fetch("""
+        SELECT indexrelname AS name, pg_relation_size(indexrelid) AS bytes
+        FROM pg_stat_user_indexes
+        WHERE relname = 'faq_content'
+          AND (indexrelname LIKE 'idx_faq_%embedding%' OR indexrelname LIKE 'idx_faq_question_binary_%')
+        ORDER BY indexrelname
+    """)
+    for row in rows:
+        logger.info(f"[Compact] {row['name']}: {row['bytes'] / 1024:.0f} KB")
+    per_row = await conn.fetchval("""
+        SELECT avg(pg_column_size(question_embedding) + pg_column_size(answer_embedding))
+        FROM faq_content
+    """)
+    logger.info(f"[Compact] embeddings per row: {float(per_row or 0):.0f} bytes")
+
+
+async def main(dimensions: int, storage: str, binary_index: bool, dry_run: bool) -> None:
+    statements = _compaction_sql(dimensions, storage, binary_index)
+    if dry_run:
+        print(";\n".join(s.strip() for s in statements) + ";")
+        return
+
+    try:
+        async with pg_connection() as conn:
+            version = await conn.fetchval("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            if tuple(int(p) for p in version.split(".")) < (0, 7):
+                raise RuntimeError(f"pgvector {version}: halfvec/subvector/binary_quantize need >= 0.7")
+
+            current_type, current_dims = await _current_column(conn)
+            if dimensions > current_dims:
+                raise RuntimeError(
+                    f"question_embedding is {current_type}({current_dims}); "
+                    f"cannot grow to {dimensions} without a full re-embedding"
+                )
+            logger.info(f"[Compact] {current_type}({current_dims}) → {storage}({dimensions})")
+
+            await _report_sizes(conn)
+            async with conn.transaction():
+                for statement in statements:
+                    await conn.execute(statement)
+            await _report_sizes(conn)
+    finally:
+        await close_pg_pool()
+
+    print(
+        "Set for the API:\n"
+        f"  AI_EMBEDDING_DIMENSIONS={dimensions}\n"
+        f"  EMBEDDING_STORAGE={storage}\n"
+        f"  SEARCH_BINARY_PREFILTER={'true' if binary_index else 'false'}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shrink faq_content embeddings and rebuild HNSW indexes")
+    parser.add_argument("--dimensions", type=int, default=settings.AI_EMBEDDING_DIMENSIONS)
+    parser.add_argument("--storage", choices=["vector", "halfvec"], default=settings.EMBEDDING_STORAGE)
+    parser.add_argument("--binary-index", action="store_true", help="build binary_quantize prefilter indexes")
+    parser.add_argument("--dry-run", action="store_true", help="print SQL and exit")
+    args = parser.parse_args()
+    asyncio.run(main(args.dimensions, args.storage, args.binary_index, args.dry_run))
@@ -0,0 +1,163 @@
+# api/app/scripts/eval_embeddings.py
+"""
+Recall@k компактных вариантов хранения эмбеддингов — до запуска compact_embeddings.
+
+    python -m app.scripts.eval_embeddings --k 5 --queries 300
+
+Эталон — точный top-k по полным 1536-мерным векторам faq_content.
+Запросы — реальные вопросы из query_analytics (если их мало — вопросы FAQ),
+эмбеддинги запросов берутся у OpenAI один раз в полной ширине, укороченные
+варианты считаются локально (первые N компонент + нормировка — то же,
+что вернёт API с dimensions=N).
+
+Для каждой комбинации размерности / halfvec / binary-префильтра печатает:
+recall@k к эталону, долю совпавших top-1 (top-1 определяет прямой ответ
+в /api/ask) и байты на строку для двух колонок. HNSW здесь не моделируется —
+это потеря от квантования, а не от приближённого поиска.
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from app.ai.embeddings_enhanced import EmbeddingService
+from app.core.logging_config import get_logger, setup_logging
+from app.core.pg_pool import close_pg_pool, pg_connection
+
+setup_logging()
+logger = get_logger(__name__)
+
+FULL_DIMENSIONS = 1536
+EMBED_BATCH = 512
+
+
+@dataclass(frozen=True)
+class Variant:
+    dimensions: int
+    storage: str                    # vector | halfvec
+    binary_factor: Optional[int]    # None — без binary-префильтра
+
+    @property
+    def name(self) -> str:
+        name = f"{self.storage}({self.dimensions})"
+        if self.binary_factor:
+            name += f" + binary x{self.binary_factor}"
+        return name
+
+    @property
+    def bytes_per_row(self) -> int:
+        width = 4 if self.storage == "vector" else 2
+        return 2 * (self.dimensions * width + 8)
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _project(matrix: np.ndarray, variant: Variant) -> np.ndarray:
+    projected = _normalize(matrix[:, :variant.dimensions])
+    if variant.storage == "halfvec":
+        projected = projected.astype(np.float16).astype(np.float32)
+    return projected
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, scores.shape[1])
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(scores, part, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(part, order, axis=1)
+
+
+def _search(queries: np.ndarray, corpus: np.ndarray, variant: Variant, k: int) -> np.ndarray:
+    q = _project(queries, variant)
+    c = _project(corpus, variant)
+    if not variant.binary_factor:
+        return _top_k(q @ c.T, k)
+
+    # binary_quantize: бит = компонента > 0; hamming через число совпавших бит
+    q_bits = q > 0
+    c_bits = c > 0
+    agree = q_bits.astype(np.int32) @ c_bits.T.astype(np.int32)
+    agree += (~q_bits).astype(np.int32) @ (~c_bits).T.astype(np.int32)
+    candidates = _top_k(agree.astype(np.float32), k * variant.binary_factor)
+
+    exact = np.einsum("qd,qcd->qc", q, c[candidates])
+    order = _top_k(exact, k)
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+async def _load(language: Optional[str], limit: int) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    async with pg_connection() as conn:
+        corpus_rows = await conn.fetch("""
+            SELECT question_embedding::vector AS embedding
+            FROM faq_content
+            WHERE is_active
+              AND question_embedding IS NOT NULL
+              AND ($1::text IS NULL OR language = $1)
+        """, language)
+        query_rows = await conn.fetch("""
+            SELECT DISTINCT query_original
+            FROM query_analytics
+            WHERE $1::text IS NULL OR language = $1
+            LIMIT $2
+        """, language, limit)
+        queries = [row["query_original"] for row in query_rows]
+        if len(queries) < limit // 2:
+            extra = await conn.fetch("""
+                SELECT question FROM faq_content
+                WHERE is_active AND ($1::text IS NULL OR language = $1)
+                LIMIT $2
+            """, language, limit - len(queries))
+            queries += [row["question"] for row in extra]
+
+    corpus = np.stack([np.asarray(row["embedding"], dtype=np.float32) for row in corpus_rows])
+    if corpus.shape[1] != FULL_DIMENSIONS:
+        raise RuntimeError(
+            f"faq_content stores {corpus.shape[1]}-d vectors; run the evaluation before compacting"
+        )
+
+    service = EmbeddingService(dimensions=FULL_DIMENSIONS)
+    embedded: list[list[float]] = []
+    for start in range(0, len(queries), EMBED_BATCH):
+        embedded += await service.create_embeddings(queries[start:start + EMBED_BATCH])
+    return _normalize(corpus), np.asarray(embedded, dtype=np.float32), queries
+
+
+async def main(k: int, query_limit: int, language: Optional[str], factors: list[int], dims: list[int]) -> None:
+    try:
+        corpus, queries, texts = await _load(language, query_limit)
+    finally:
+        await close_pg_pool()
+    logger.info(f"[Eval] corpus={len(corpus)} queries={len(texts)} k={k}")
+
+    truth = _top_k(queries @ corpus.T, k)
+    variants = [
+        Variant(d, storage, factor)
+        for d in dims
+        for storage in ("vector", "halfvec")
+        for factor in [None, *factors]
+    ]
+
+    print(f"{'variant':<32} {'recall@' + str(k):>9} {'top1':>7} {'bytes/row':>10}")
+    for variant in variants:
+        found = _search(queries, corpus, variant, k)
+        recall = np.mean([
+            len(set(found[i]) & set(truth[i])) / truth.shape[1] for i in range(len(truth))
+        ])
+        top1 = float(np.mean(found[:, 0] == truth[:, 0]))
+        print(f"{variant.name:<32} {recall:9.3f} {top1:7.3f} {variant.bytes_per_row:10d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recall@k of reduced/halfvec/binary embedding storage")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--language", default=None, help="kk | ru (default: all)")
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[1536, 1024, 768, 512, 256])
+    parser.add_argument("--binary-factors", type=int, nargs="*", default=[10])
+    args = parser.parse_args()
+    asyncio.run(main(args.k, args.queries, args.language, args.binary_factors, args.dimensions))
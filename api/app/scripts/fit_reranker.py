@@ -0,0 +1,217 @@
+# api/app/scripts/fit_reranker.py
+"""
+Подбор весов локального реранкера (app/ai/reranker.py) по логам.
+
+    python -m app.scripts.fit_reranker --limit 5000
+    python -m app.scripts.fit_reranker --pairs labeled.jsonl --dry-run
+
+Обучающие пары (вопрос → правильный faq_v2.id):
+- query_analytics: user_clicked_faq_id, либо top_faq_id при user_satisfied;
+- --pairs: JSONL {"question": ..., "faq_id": ...} (ручная разметка).
+Для каждого вопроса повторяется путь /api/ask: эмбеддинг, классификатор,
+hybrid_search по kk. Вопросы, где правильного FAQ нет среди кандидатов,
+пропускаются — реранкер его всё равно не поднимет.
+
+Модель — softmax по кандидатам одного запроса (вероятность, что выбран
+именно этот FAQ), градиентный спуск на numpy. Веса делятся на вес
+признака score, чтобы итоговый балл остался в шкале cosine.
+Печатает top-1 / MRR / долю прямых ответов (score >= 0.40) на отложенной
+части до и после и время rerank() на запрос; пишет JSON для реранкера.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.ai.embeddings_enhanced import EmbeddingService
+from app.ai.llm_classifier import LLMClassifier, _fallback_classify
+from app.ai.reranker import DEFAULT_WEIGHTS, FEATURES, LocalReranker, save_weights, weights_path
+from app.ai.search_enhanced import EnhancedSearchService
+from app.core.logging_config import get_logger, setup_logging
+from app.core.pg_pool import close_pg_pool, pg_connection
+
+setup_logging()
+logger = get_logger(__name__)
+
+EMBED_BATCH = 512
+CONCURRENCY = 8
+DIRECT_ANSWER_SCORE = 0.40  # порог прямого ответа в /api/ask
+
+_LOGGED_PAIRS_SQL = """
+    SELECT query_original, COALESCE(user_clicked_faq_id, top_faq_id) AS faq_id
+    FROM query_analytics
+    WHERE user_clicked_faq_id IS NOT NULL
+       OR (user_satisfied AND top_faq_id IS NOT NULL)
+    ORDER BY created_at DESC
+    LIMIT $1
+"""
+
+# (вопрос, кандидаты, индекс правильного, intent, slots)
+Sample = Tuple[str, List[Tuple[dict, float]], int, Optional[str], dict]
+
+
+async def _load_pairs(limit: int, pairs_file: Optional[Path]) -> List[Tuple[str, int]]:
+    async with pg_connection() as conn:
+        rows = await conn.fetch(_LOGGED_PAIRS_SQL, limit)
+    pairs = [(row["query_original"], row["faq_id"]) for row in rows]
+    if pairs_file:
+        with pairs_file.open(encoding="utf-8") as f:
+            pairs += [(item["question"], int(item["faq_id"])) for item in map(json.loads, f) if item]
+    return pairs
+
+
+async def _collect(pairs: List[Tuple[str, int]], language: str, use_llm: bool) -> List[Sample]:
+    service = EmbeddingService()
+    questions = [question for question, _ in pairs]
+    embeddings: List[List[float]] = []
+    for start in range(0, len(questions), EMBED_BATCH):
+        embeddings += await service.create_embeddings(questions[start:start + EMBED_BATCH])
+
+    classifier = LLMClassifier() if use_llm else None
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(question: str, faq_id: int, embedding: List[float]) -> Optional[Sample]:
+        async with semaphore:
+            clf = await classifier.classify(question) if classifier else _fallback_classify(question)
+            candidates = await EnhancedSearchService.hybrid_search(
+                None, embedding, question, language, limit=10
+            )
+        ids = [faq["id"] for faq, _ in candidates]
+        if faq_id not in ids:
+            return None
+        return question, candidates, ids.index(faq_id), clf.intent, clf.slots
+
+    results = await asyncio.gather(*(
+        one(question, faq_id, embedding) for (question, faq_id), embedding in zip(pairs, embeddings)
+    ))
+    return [sample for sample in results if sample is not None]
+
+
+def _tensor(samples: List[Sample]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(запросы × кандидаты × признаки), маска реальных кандидатов, индексы правильных."""
+    width = max(len(candidates) for _, candidates, _, _, _ in samples)
+    x = np.zeros((len(samples), width, len(FEATURES)))
+    mask = np.zeros((len(samples), width), dtype=bool)
+    for i, (question, candidates, _, intent, slots) in enumerate(samples):
+        x[i, :len(candidates)] = LocalReranker.features(question, candidates, intent, slots)
+        mask[i, :len(candidates)] = True
+    positive = np.array([target for _, _, target, _, _ in samples])
+    return x, mask, positive
+
+
+def _softmax(logits: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    logits = np.where(mask, logits, -np.inf)
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _fit(x: np.ndarray, mask: np.ndarray, positive: np.ndarray, epochs: int, lr: float, l2: float) -> np.ndarray:
+    rows = np.arange(len(positive))
+    # старт — веса по умолчанию; масштаб задаёт «температуру» softmax
+    w = 10.0 * np.array([DEFAULT_WEIGHTS[name] for name in FEATURES])
+    for _ in range(epochs):
+        p = _softmax(x @ w, mask)
+        expected = np.einsum("qc,qcf->qf", p, x)
+        grad = (expected - x[rows, positive]).mean(axis=0) + l2 * w
+        w -= lr * grad
+    return w
+
+
+def _evaluate(
+    x: np.ndarray,
+    mask: np.ndarray,
+    positive: np.ndarray,
+    w: np.ndarray,
+    keep_scores: bool = False,
+) -> Dict[str, float]:
+    """keep_scores — как реранкер без подогнанных весов: порядок по w, порог по исходному баллу."""
+    scores = np.where(mask, np.clip(x @ w, 0.0, 1.0), -np.inf)
+    target = scores[np.arange(len(positive)), positive]
+    rank = 1 + (scores > target[:, None]).sum(axis=1)
+    top = scores.argmax(axis=1)
+    top_score = x[np.arange(len(top)), top, 0] if keep_scores else scores.max(axis=1)
+    return {
+        "top1": round(float(np.mean(rank == 1)), 4),
+        "mrr": round(float(np.mean(1.0 / rank)), 4),
+        "direct_answers": round(float(np.mean(top_score >= DIRECT_ANSWER_SCORE)), 4),
+    }
+
+
+def _latency_us(reranker: LocalReranker, samples: List[Sample]) -> float:
+    started = time.perf_counter()
+    for question, candidates, _, intent, slots in samples:
+        reranker.rerank(question, candidates, intent=intent, slots=slots)
+    return (time.perf_counter() - started) / len(samples) * 1e6
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        pairs = await _load_pairs(args.limit, args.pairs)
+        logger.info(f"[FitReranker] {len(pairs)} labelled queries")
+        if not pairs:
+            return
+        samples = await _collect(pairs, args.language, not args.no_llm)
+    finally:
+        await close_pg_pool()
+
+    logger.info(f"[FitReranker] {len(samples)}/{len(pairs)} queries have the answer among candidates")
+    if len(samples) < args.min_samples:
+        logger.error(f"[FitReranker] need at least {args.min_samples} usable queries, aborting")
+        return
+
+    random.Random(args.seed).shuffle(samples)
+    split = max(1, int(len(samples) * args.holdout))
+    test, train = samples[:split], samples[split:]
+
+    x, mask, positive = _tensor(train)
+    raw = _fit(x, mask, positive, args.epochs, args.lr, args.l2)
+    if raw[0] <= 0:
+        logger.error(f"[FitReranker] non-positive weight for score ({raw[0]:.4f}), keeping current weights")
+        return
+    weights = dict(zip(FEATURES, raw / raw[0]))
+
+    x_test, mask_test, positive_test = _tensor(test)
+    baseline = np.zeros(len(FEATURES))
+    baseline[0] = 1.0
+    fitted = np.array([weights[name] for name in FEATURES])
+    metrics = _evaluate(x_test, mask_test, positive_test, fitted)
+
+    print(f"{'weights':<10} {'top1':>7} {'mrr':>7} {'direct':>7}   (holdout n={len(test)})")
+    for name, w, keep in (
+        ("no rerank", baseline, False),
+        ("default", LocalReranker().weights, True),
+        ("fitted", fitted, False),
+    ):
+        m = _evaluate(x_test, mask_test, positive_test, w, keep_scores=keep)
+        print(f"{name:<10} {m['top1']:7.3f} {m['mrr']:7.3f} {m['direct_answers']:7.3f}")
+    print("weights: " + ", ".join(f"{name}={value:+.3f}" for name, value in weights.items()))
+    print(f"rerank(): {_latency_us(LocalReranker(weights), test):.1f} µs/query")
+
+    if args.dry_run:
+        return
+    path = args.output or weights_path()
+    save_weights(path, weights, len(train), metrics)
+    logger.info(f"[FitReranker] weights written to {path}; restart the API to apply")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit local reranker weights from query logs")
+    parser.add_argument("--limit", type=int, default=5000, help="max logged queries")
+    parser.add_argument("--pairs", type=Path, default=None, help="extra JSONL {question, faq_id}")
+    parser.add_argument("--language", default="kk", help="search language (as in /api/ask)")
+    parser.add_argument("--no-llm", action="store_true", help="deterministic classifier instead of LLM")
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--min-samples", type=int, default=50)
+    parser.add_argument("--epochs", type=int, default=2000)
+    parser.add_argument("--lr", type=float, default=0.5)
+    parser.add_argument("--l2", type=float, default=1e-3)
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--dry-run", action="store_true", help="print metrics, do not write weights")
+    asyncio.run(main(parser.parse_args()))
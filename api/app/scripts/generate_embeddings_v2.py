@@ -13,7 +13,7 @@ logger = get_logger(__name__)
 async def generate_embeddings_v2():
     """Generate enriched embeddings for all FAQ"""
     
-    embedding_service = EnhancedEmbeddingService()
+    embedding_service = EnhancedEmbeddingService(dimensions=1536)  # legacy faq.embedding — vector(1536)
     session_maker = get_session_maker()
     
     async with session_maker() as session:
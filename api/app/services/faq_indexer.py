@@ -0,0 +1,136 @@
+# api/app/services/faq_indexer.py
+"""
+Индексация faq_content: question_embedding, answer_embedding,
+question_normalized, question_keywords и content_hash за один проход.
+
+question_embedding — вопрос (SEARCH_MULTI_VECTOR) или вопрос + ответ
+(прежний режим), answer_embedding — текст ответа; оба в одном вызове API.
+
+Общая для backfill-скрипта и webhook-а Directus. Эмбеддинги запрашиваются
+батчами (один вызов OpenAI на EMBED_BATCH_SIZE строк), запись — одним
+executemany на батч (asyncpg шлёт его конвейером, без round trip на строку).
+Строки с неизменившимся content_hash пропускаются.
+"""
+import hashlib
+from typing import Iterable, List, Optional, Sequence
+
+from app.ai.embeddings_enhanced import EmbeddingService
+from app.config import settings
+from app.core.logging_config import get_logger
+from app.core.pg_pool import Row, pg_connection
+from app.core.vector import unit_vector
+
+logger = get_logger(__name__)
+
+# Строк на вызов API (по два входа на строку; лимит OpenAI — 2048 входов)
+EMBED_BATCH_SIZE = 256
+
+SELECT_BY_IDS_SQL = """
+    SELECT id, question, answer_text, content_hash
+    FROM faq_content
+    WHERE id = ANY($1::int[])
+    ORDER BY id
+"""
+
+SELECT_PAGE_SQL = """
+    SELECT id, question, answer_text, content_hash
+    FROM faq_content
+    WHERE id > $1
+      AND ($2::text IS NULL OR language = $2)
+    ORDER BY id
+    LIMIT $3
+"""
+
+UPDATE_SQL = """
+    UPDATE faq_content
+    SET question_embedding  = $2::vector,
+        answer_embedding    = $3::vector,
+        question_normalized = $4,
+        question_keywords   = $5::text[],
+        content_hash        = $6,
+        embedded_at         = NOW()
+    WHERE id = $1
+"""
+
+
+class FaqIndexer:
+
+    def __init__(self, embedding_service: Optional[EmbeddingService] = None):
+        self.embeddings = embedding_service or EmbeddingService()
+
+    @staticmethod
+    def embedding_text(question: str, answer_text: str) -> str:
+        """Текст для question_embedding."""
+        if settings.SEARCH_MULTI_VECTOR:
+            return question
+        return f"{question} {answer_text or ''}".strip()
+
+    def content_hash(self, question: str, answer_text: str) -> str:
+        """Хеш текста и параметров модели — смена размерности или режима тоже переиндексирует."""
+        mode = "multi" if settings.SEARCH_MULTI_VECTOR else "blend"
+        source = f"{self.embeddings.model}:{self.embeddings.dimension}:{mode}\n{question}\n{answer_text}"
+        return hashlib.md5(source.encode()).hexdigest()
+
+    def pending(self, rows: Iterable[Row], force: bool = False) -> List[Row]:
+        """Строки, которым нужен новый эмбеддинг."""
+        return [
+            row for row in rows
+            if force or row["content_hash"] != self.content_hash(row["question"], row["answer_text"])
+        ]
+
+    async def fetch_rows(self, ids: Sequence[int]) -> List[Row]:
+        async with pg_connection() as conn:
+            return await conn.fetch(SELECT_BY_IDS_SQL, list(ids))
+
+    async def fetch_page(self, after_id: int, limit: int, language: Optional[str] = None) -> List[Row]:
+        async with pg_connection() as conn:
+            return await conn.fetch(SELECT_PAGE_SQL, after_id, language, limit)
+
+    async def index_batch(self, rows: Sequence[Row]) -> int:
+        """Один вызов embeddings API + одна пакетная запись. rows — не больше EMBED_BATCH_SIZE."""
+        if not rows:
+            return 0
+
+        # [вопросы..., непустые ответы...] — один вызов API на оба столбца.
+        # answer_text в Directus бывает '' — OpenAI отклоняет пустой вход
+        # целиком на батч, такие строки получают answer_embedding = NULL
+        answered = [i for i, row in enumerate(rows) if (row["answer_text"] or "").strip()]
+        vectors = await self.embeddings.create_embeddings(
+            [self.embedding_text(row["question"], row["answer_text"]) for row in rows]
+            + [rows[i]["answer_text"] for i in answered]
+        )
+        answer_vectors: List[Optional[List[float]]] = [None] * len(rows)
+        for i, vector in zip(answered, vectors[len(rows):]):
+            answer_vectors[i] = unit_vector(vector)
+
+        records = [
+            (
+                row["id"],
+                unit_vector(question_vector),
+                answer_vector,
+                EmbeddingService.normalize_text(row["question"]),
+                EmbeddingService.extract_keywords(row["question"]),
+                self.content_hash(row["question"], row["answer_text"]),
+            )
+            for row, question_vector, answer_vector in zip(rows, vectors[:len(rows)], answer_vectors)
+        ]
+
+        async with pg_connection() as conn:
+            await conn.executemany(UPDATE_SQL, records)
+        return len(records)
+
+    async def index(self, rows: Sequence[Row], force: bool = False) -> int:
+        """Переиндексировать изменившиеся строки; возвращает число обновлённых."""
+        pending = self.pending(rows, force)
+        indexed = 0
+        for start in range(0, len(pending), EMBED_BATCH_SIZE):
+            indexed += await self.index_batch(pending[start:start + EMBED_BATCH_SIZE])
+        if len(rows) > indexed:
+            logger.debug(f"[Indexer] {len(rows) - indexed} rows unchanged, skipped")
+        return indexed
+
+    async def index_ids(self, ids: Sequence[int], force: bool = False) -> int:
+        return await self.index(await self.fetch_rows(ids), force)
+
+
+faq_indexer = FaqIndexer()
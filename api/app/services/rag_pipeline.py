@@ -85,10 +85,10 @@ class RAGPipeline:
                 'language': language
             }
         
-        # Шаг 6: GPT Reranking
+        # Шаг 6: Локальный reranking
         if use_rerank and len(candidates) > 3:
-            logger.info("Applying GPT reranking")
-            candidates = await self.search_service.rerank_with_gpt(
+            logger.info("Applying local reranking")
+            candidates = self.search_service.rerank(
                 user_question=user_question,
                 candidates=candidates,
                 top_k=5
@@ -0,0 +1,123 @@
+# api/app/services/rate_limiter.py
+"""
+Token bucket на пользователя.
+
+Каждый пользователь получает `burst` токенов, которые восполняются
+со скоростью `rate` токенов в секунду. Запрос /api/ask стоит один токен;
+пустое ведро — 429 до классификатора, embedding и GPT.
+
+Backend выбирается RATE_LIMIT_STORAGE:
+    memory — dict в процессе;
+    redis  — hash на пользователя, атомарное обновление Lua-скриптом,
+             общий для всех экземпляров API.
+"""
+from __future__ import annotations
+
+import heapq
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from app.config import settings
+from app.core.redis import get_redis
+
+_MEMORY_MAX_BUCKETS = 100_000
+_PRUNE_TO = 0.9  # доля max_buckets после вытеснения свежих вёдер
+_REDIS_PREFIX = "faqapi:ratelimit:"
+
+# KEYS[1] — ключ ведра; ARGV: rate, burst, now, cost
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local data = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(data[1]) or burst
+local ts = tonumber(data[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class RateDecision:
+    allowed: bool
+    retry_after: float  # секунды до следующего токена (0 если allowed)
+
+
+class TokenBucketLimiter(ABC):
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+
+    @abstractmethod
+    async def hit(self, key: str, cost: float = 1.0) -> RateDecision: ...
+
+    def _decision(self, allowed: bool, tokens: float, cost: float) -> RateDecision:
+        retry_after = 0.0 if allowed else max(0.0, (cost - tokens) / self.rate)
+        return RateDecision(allowed=allowed, retry_after=retry_after)
+
+
+class MemoryTokenBucket(TokenBucketLimiter):
+    def __init__(self, rate: float, burst: int, max_buckets: int = _MEMORY_MAX_BUCKETS):
+        super().__init__(rate, burst)
+        self.max_buckets = max_buckets
+        self._buckets: dict[str, tuple[float, float]] = {}  # key → (tokens, ts)
+
+    async def hit(self, key: str, cost: float = 1.0) -> RateDecision:
+        now = time.monotonic()
+        tokens, ts = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - ts) * self.rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        if key not in self._buckets and len(self._buckets) >= self.max_buckets:
+            self._prune(now)
+        self._buckets[key] = (tokens, now)
+        return self._decision(allowed, tokens, cost)
+
+    def _prune(self, now: float) -> None:
+        """
+        Удалить вёдра, которые уже восполнились — они эквивалентны отсутствующим.
+        Если все вёдра свежие, вытесняются самые старые по ts до _PRUNE_TO
+        от max_buckets (запас, чтобы не сортировать на каждом новом ключе).
+        """
+        full_after = self.burst / self.rate
+        self._buckets = {
+            key: (tokens, ts)
+            for key, (tokens, ts) in self._buckets.items()
+            if now - ts < full_after
+        }
+        if len(self._buckets) >= self.max_buckets:
+            keep = int(self.max_buckets * _PRUNE_TO)
+            newest = heapq.nlargest(keep, self._buckets.items(), key=lambda item: item[1][1])
+            self._buckets = dict(newest)
+
+
+class RedisTokenBucket(TokenBucketLimiter):
+    def __init__(self, rate: float, burst: int, prefix: str = _REDIS_PREFIX):
+        super().__init__(rate, burst)
+        self.prefix = prefix
+        self._script = None
+
+    async def hit(self, key: str, cost: float = 1.0) -> RateDecision:
+        if self._script is None:
+            self._script = get_redis().register_script(_TOKEN_BUCKET_LUA)
+        allowed, tokens = await self._script(
+            keys=[f"{self.prefix}{key}"],
+            args=[self.rate, self.burst, time.time(), cost],
+        )
+        return self._decision(bool(allowed), float(tokens), cost)
+
+
+def create_limiter() -> TokenBucketLimiter:
+    if settings.RATE_LIMIT_STORAGE == "redis":
+        return RedisTokenBucket(settings.RATE_LIMIT_RATE, settings.RATE_LIMIT_BURST)
+    return MemoryTokenBucket(settings.RATE_LIMIT_RATE, settings.RATE_LIMIT_BURST)
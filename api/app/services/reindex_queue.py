@@ -0,0 +1,161 @@
+# api/app/services/reindex_queue.py
+"""
+Очередь переиндексации faq_content за webhook-ом Directus.
+
+Webhook только кладёт id и сразу отвечает 202. Фоновый воркер:
+- дедуплицирует: повторные правки одной строки — одна запись;
+- debounce: строка уходит в работу, когда её не трогали
+  REINDEX_DEBOUNCE_SECONDS, но не позже REINDEX_MAX_DELAY_SECONDS
+  от первой правки (непрерывное редактирование не откладывает навсегда);
+- забирает все готовые id батчем — один вызов embeddings API и одна
+  пакетная запись через FaqIndexer (неизменившийся текст пропускается,
+  кроме id, поставленных с force).
+
+Очередь в памяти процесса (API работает одним процессом uvicorn).
+При остановке оставшиеся id дорабатываются сразу; если процесс упал —
+расхождения находит backfill по content_hash.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.core import content_version
+from app.core.logging_config import get_logger
+from app.core.metrics import inc, register_gauge
+from app.services.faq_indexer import EMBED_BATCH_SIZE, faq_indexer
+
+logger = get_logger(__name__)
+
+# Пауза перед повтором после ошибки OpenAI/БД
+_RETRY_DELAY = 10.0
+
+
+class ReindexQueue:
+
+    def __init__(self, debounce: float, max_delay: float):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        # id → (первая правка, последняя правка), monotonic
+        self._pending: Dict[int, Tuple[float, float]] = {}
+        # id, которые пересчитать даже при совпавшем content_hash
+        self._forced: Set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._processed = 0
+        self._last_batch = 0
+        self._last_lag = 0.0
+
+    def enqueue(self, faq_content_id: int, force: bool = False) -> int:
+        """Поставить id в очередь; возвращает глубину очереди."""
+        if force:
+            self._forced.add(faq_content_id)
+        now = time.monotonic()
+        first, _ = self._pending.get(faq_content_id, (now, now))
+        self._pending[faq_content_id] = (first, now)
+        self._wakeup.set()
+        inc("reindex_enqueued")
+        return len(self._pending)
+
+    def _due_at(self, first: float, last: float) -> float:
+        return min(last + self.debounce, first + self.max_delay)
+
+    def _take_ready(self, now: float) -> Tuple[List[int], Optional[float]]:
+        """Готовые id (не больше батча) и время, когда созреет следующий."""
+        ready: List[int] = []
+        next_due: Optional[float] = None
+        for faq_content_id, (first, last) in self._pending.items():
+            due = self._due_at(first, last)
+            if due <= now and len(ready) < EMBED_BATCH_SIZE:
+                ready.append(faq_content_id)
+            elif next_due is None or due < next_due:
+                next_due = due
+
+        if ready:
+            self._last_lag = now - min(self._pending[i][0] for i in ready)
+            for faq_content_id in ready:
+                del self._pending[faq_content_id]
+        return ready, next_due
+
+    async def _index(self, ids: List[int]) -> int:
+        forced = [i for i in ids if i in self._forced]
+        regular = [i for i in ids if i not in self._forced]
+        indexed = 0
+        if forced:
+            indexed += await faq_indexer.index_ids(forced, force=True)
+            self._forced.difference_update(forced)
+        if regular:
+            indexed += await faq_indexer.index_ids(regular)
+        return indexed
+
+    async def _process(self, ids: List[int]) -> None:
+        try:
+            indexed = await self._index(ids)
+        except asyncio.CancelledError:
+            # Остановка посреди батча — вернуть id, их доработает drain()
+            now = time.monotonic()
+            for faq_content_id in ids:
+                self._pending.setdefault(faq_content_id, (now, now))
+            raise
+        except Exception as e:
+            logger.error(f"[Reindex] batch of {len(ids)} failed: {e}")
+            inc("reindex_failed", len(ids))
+            now = time.monotonic()
+            for faq_content_id in ids:
+                # повтор через _RETRY_DELAY; более свежую правку, пришедшую
+                # во время батча, не затирать
+                self._pending.setdefault(faq_content_id, (now, now + _RETRY_DELAY - self.debounce))
+            return
+
+        self._processed += len(ids)
+        self._last_batch = len(ids)
+        inc("reindex_embedded", indexed)
+        logger.info(f"[Reindex] {indexed}/{len(ids)} rows re-embedded, lag={self._last_lag:.1f}s")
+        if indexed:
+            await content_version.bump()
+
+    async def run(self) -> None:
+        logger.info(f"[Reindex] worker started (debounce={self.debounce}s, max_delay={self.max_delay}s)")
+        try:
+            while True:
+                ready, next_due = self._take_ready(time.monotonic())
+                if ready:
+                    await self._process(ready)
+                    continue
+
+                self._wakeup.clear()
+                timeout = None if next_due is None else max(0.0, next_due - time.monotonic())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            await self.drain()
+            raise
+
+    async def drain(self) -> None:
+        """Обработать всё, что осталось, без debounce (остановка процесса)."""
+        while self._pending:
+            ids = list(self._pending)[:EMBED_BATCH_SIZE]
+            for faq_content_id in ids:
+                del self._pending[faq_content_id]
+            await self._process(ids)
+            if any(i in self._pending for i in ids):
+                break  # ошибка — не крутиться на остановке
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        oldest = min((first for first, _ in self._pending.values()), default=None)
+        return {
+            "depth": len(self._pending),
+            "oldest_age_seconds": round(now - oldest, 1) if oldest is not None else 0.0,
+            "last_batch_size": self._last_batch,
+            "last_lag_seconds": round(self._last_lag, 1),
+            "processed": self._processed,
+        }
+
+
+reindex_queue = ReindexQueue(
+    debounce=settings.REINDEX_DEBOUNCE_SECONDS,
+    max_delay=settings.REINDEX_MAX_DELAY_SECONDS,
+)
+register_gauge("reindex_queue", reindex_queue.stats)
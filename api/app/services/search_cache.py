@@ -0,0 +1,147 @@
+# api/app/services/search_cache.py
+"""
+Обслуживание таблицы search_cache.
+
+Чтение кеша — обычный SELECT: попадания копятся в памяти (счётчик и
+время последнего использования на query_hash) и раз в
+SEARCH_CACHE_FLUSH_INTERVAL секунд пишутся одним UPDATE ... FROM unnest.
+Горячий ключ больше не даёт запись в WAL и блокировку строки на каждый запрос.
+
+Фоновое вытеснение: строки, не использованные SEARCH_CACHE_MAX_AGE_DAYS,
+удаляются, остальное урезается до SEARCH_CACHE_MAX_ROWS по hit_count,
+затем по last_used_at. При смене версии контента таблица очищается.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.core.database import db_session
+from app.core.logging_config import get_logger
+from app.core.metrics import inc, register_gauge
+
+logger = get_logger(__name__)
+
+_FLUSH_SQL = text("""
+    UPDATE search_cache AS c
+    SET hit_count    = c.hit_count + u.hits,
+        last_used_at = GREATEST(c.last_used_at, u.last_used)
+    FROM unnest(
+        CAST(:hashes AS text[]),
+        CAST(:hits AS int[]),
+        CAST(:last_used AS timestamptz[])
+    ) AS u(query_hash, hits, last_used)
+    WHERE c.query_hash = u.query_hash
+""")
+
+_EXPIRE_SQL = text("""
+    DELETE FROM search_cache
+    WHERE last_used_at < NOW() - make_interval(days => :days)
+""")
+
+_TRIM_SQL = text("""
+    DELETE FROM search_cache
+    WHERE id IN (
+        SELECT id FROM search_cache
+        ORDER BY hit_count DESC, last_used_at DESC
+        OFFSET :keep
+    )
+""")
+
+_INVALIDATE_SQL = text("DELETE FROM search_cache")
+
+
+class SearchCacheMaintainer:
+
+    def __init__(self):
+        # query_hash → (попаданий с прошлого flush, последнее попадание)
+        self._hits: Dict[str, Tuple[int, datetime]] = {}
+        self._flushed = 0
+        self._evicted = 0
+        self._last_flush = 0.0
+
+    def record_hit(self, query_hash: str) -> None:
+        count, _ = self._hits.get(query_hash, (0, None))
+        self._hits[query_hash] = (count + 1, datetime.now(timezone.utc))
+
+    async def flush(self) -> int:
+        """Записать накопленные попадания одним UPDATE; возвращает число ключей."""
+        if not self._hits:
+            return 0
+        batch, self._hits = self._hits, {}
+
+        try:
+            async with db_session() as session:
+                await session.execute(_FLUSH_SQL, {
+                    "hashes": list(batch),
+                    "hits": [count for count, _ in batch.values()],
+                    "last_used": [last_used for _, last_used in batch.values()],
+                })
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"[SearchCache] hit flush failed, retrying later: {e}")
+            for query_hash, (count, last_used) in batch.items():
+                pending, newer = self._hits.get(query_hash, (0, last_used))
+                self._hits[query_hash] = (pending + count, max(newer, last_used))
+            return 0
+
+        self._flushed += len(batch)
+        self._last_flush = time.monotonic()
+        return len(batch)
+
+    async def evict(self) -> int:
+        async with db_session() as session:
+            expired = await session.execute(_EXPIRE_SQL, {"days": settings.SEARCH_CACHE_MAX_AGE_DAYS})
+            trimmed = await session.execute(_TRIM_SQL, {"keep": settings.SEARCH_CACHE_MAX_ROWS})
+            await session.commit()
+
+        removed = (expired.rowcount or 0) + (trimmed.rowcount or 0)
+        if removed:
+            self._evicted += removed
+            inc("search_cache_evicted", removed)
+            logger.info(f"[SearchCache] evicted {removed} rows")
+        return removed
+
+    async def invalidate(self, version: str = "") -> None:
+        """Контент FAQ изменился — сохранённые результаты устарели."""
+        self._hits.clear()
+        try:
+            async with db_session() as session:
+                result = await session.execute(_INVALIDATE_SQL)
+                await session.commit()
+            logger.info(f"[SearchCache] invalidated {result.rowcount or 0} rows")
+        except Exception as e:
+            logger.error(f"[SearchCache] invalidation failed: {e}")
+
+    async def run(self) -> None:
+        flush_interval = settings.SEARCH_CACHE_FLUSH_INTERVAL
+        evict_every = max(1, settings.SEARCH_CACHE_EVICT_INTERVAL // flush_interval)
+        ticks = 0
+        try:
+            while True:
+                await asyncio.sleep(flush_interval)
+                await self.flush()
+                ticks += 1
+                if ticks % evict_every == 0:
+                    try:
+                        await self.evict()
+                    except Exception as e:
+                        logger.error(f"[SearchCache] eviction failed: {e}")
+        except asyncio.CancelledError:
+            await self.flush()
+            raise
+
+    def stats(self) -> dict:
+        return {
+            "pending_keys": len(self._hits),
+            "flushed_keys": self._flushed,
+            "evicted_rows": self._evicted,
+            "seconds_since_flush": round(time.monotonic() - self._last_flush, 1) if self._last_flush else None,
+        }
+
+
+search_cache_maintainer = SearchCacheMaintainer()
+register_gauge("search_cache", search_cache_maintainer.stats)
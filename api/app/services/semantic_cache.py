@@ -0,0 +1,175 @@
+# api/app/services/semantic_cache.py
+"""
+Семантический кеш ответов /api/ask.
+
+Хранит эмбеддинги недавних вопросов (матрица numpy, строка на запись)
+и итоговый AskResponse. Новый вопрос, чей эмбеддинг ближе порога
+SEMANTIC_CACHE_THRESHOLD (cosine) к сохранённому на том же языке UI,
+получает готовый ответ — без поиска и вызовов LLM. Поиск соседа —
+одно умножение матрицы на вектор.
+
+Размер ограничен (LRU), записи живут SEMANTIC_CACHE_TTL секунд,
+при смене версии контента кеш очищается. Доля ложных попаданий
+оценивается выборочно: ask.py для части попаданий пересчитывает ответ
+в фоне и сообщает через record_verification().
+"""
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.core.logging_config import get_logger
+from app.core.metrics import register_gauge
+from app.schemas.ask import AskResponse
+
+logger = get_logger(__name__)
+
+_LANGUAGE_CODES = {"kk": 0, "ru": 1}
+_EMPTY = -1
+
+
+@dataclass
+class _Entry:
+    question: str
+    response: AskResponse
+    stored_at: float
+
+
+class SemanticCache:
+
+    def __init__(self, max_entries: int, threshold: float, ttl: float):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self._matrix: Optional[np.ndarray] = None      # (max_entries, dim), строки нормированы
+        self._languages = np.full(max_entries, _EMPTY, dtype=np.int8)
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()  # слот → запись, LRU-порядок
+        self._free = list(range(max_entries - 1, -1, -1))
+        # растёт при очистке — ответ, посчитанный до неё, не сохраняется
+        self.generation = 0
+
+        self._lookups = 0
+        self._hits = 0
+        self._sampled = 0
+        self._false_hits = 0
+
+    def _vector(self, embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        if norm == 0:
+            return None
+        vec = vec / norm
+        if self._matrix is None:
+            self._matrix = np.zeros((self.max_entries, vec.shape[0]), dtype=np.float32)
+        elif self._matrix.shape[1] != vec.shape[0]:
+            # сменилась размерность эмбеддингов — старые записи несравнимы
+            self.clear()
+            self._matrix = np.zeros((self.max_entries, vec.shape[0]), dtype=np.float32)
+        return vec
+
+    def _release(self, slot: int) -> None:
+        self._entries.pop(slot, None)
+        self._languages[slot] = _EMPTY
+        self._matrix[slot] = 0.0
+        self._free.append(slot)
+
+    def lookup(self, embedding: Sequence[float], language: str) -> Optional[Tuple[AskResponse, float, str]]:
+        """(ответ, similarity, исходный вопрос) ближайшей записи или None."""
+        code = _LANGUAGE_CODES.get(language)
+        if code is None:
+            return None
+        self._lookups += 1
+        if not self._entries:
+            return None
+        vec = self._vector(embedding)
+        if vec is None:
+            return None
+
+        sims = self._matrix @ vec
+        sims[self._languages != code] = -1.0
+        slot = int(np.argmax(sims))
+        similarity = float(sims[slot])
+        if similarity < self.threshold:
+            return None
+
+        entry = self._entries[slot]
+        if time.monotonic() - entry.stored_at > self.ttl:
+            self._release(slot)
+            return None
+
+        self._entries.move_to_end(slot)
+        self._hits += 1
+        return entry.response, similarity, entry.question
+
+    def store(
+        self,
+        embedding: Sequence[float],
+        language: str,
+        question: str,
+        response: AskResponse,
+        generation: int,
+    ) -> None:
+        code = _LANGUAGE_CODES.get(language)
+        if code is None or generation != self.generation:
+            return
+        vec = self._vector(embedding)
+        if vec is None:
+            return
+
+        if not self._free:
+            oldest, _ = next(iter(self._entries.items()))
+            self._release(oldest)
+        slot = self._free.pop()
+        self._matrix[slot] = vec
+        self._languages[slot] = code
+        self._entries[slot] = _Entry(question, response, time.monotonic())
+
+    def clear(self) -> None:
+        for slot in list(self._entries):
+            self._release(slot)
+        self.generation += 1
+
+    async def on_content_changed(self, version: str) -> None:
+        dropped = len(self._entries)
+        self.clear()
+        if dropped:
+            logger.info(f"[SemanticCache] content changed, dropped {dropped} entries")
+
+    def should_verify(self) -> bool:
+        return random.random() < settings.SEMANTIC_CACHE_SAMPLE_RATE
+
+    def record_verification(self, matched: bool) -> None:
+        self._sampled += 1
+        if not matched:
+            self._false_hits += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "threshold": self.threshold,
+            "lookups": self._lookups,
+            "hits": self._hits,
+            "hit_rate": round(self._hits / self._lookups, 4) if self._lookups else 0.0,
+            "sampled": self._sampled,
+            "false_hits": self._false_hits,
+            "false_hit_rate": round(self._false_hits / self._sampled, 4) if self._sampled else None,
+        }
+
+
+def same_answer(cached: AskResponse, fresh: AskResponse) -> bool:
+    """Тот же ли по сути ответ: действие, FAQ и набор вариантов уточнения."""
+    if cached.action != fresh.action or cached.faq_id != fresh.faq_id:
+        return False
+    return set(cached.suggestion_ids or []) == set(fresh.suggestion_ids or [])
+
+
+semantic_cache = SemanticCache(
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    ttl=settings.SEMANTIC_CACHE_TTL,
+)
+register_gauge("semantic_cache", semantic_cache.stats)
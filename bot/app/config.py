@@ -1,7 +1,7 @@
 # bot/app/config.py
 from functools import lru_cache
 from typing import Literal
-from pydantic import field_validator
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,6 +16,51 @@ class Settings(BaseSettings):
     BOT_TOKEN: str
     API_BASE_URL: str = "http://api:8000"
     DATABASE_URL: str = ""
+    REDIS_URL: str = "redis://redis:6379/0"
+    
+    # FSM storage: memory — для разработки, redis — общий для всех воркеров и переживает рестарт
+    FSM_STORAGE: Literal["memory", "redis"] = "memory"
+    FSM_KEY_PREFIX: str = "faqbot:fsm"
+    FSM_STATE_TTL: int = 60 * 60 * 24  # незавершённый выбор языка
+    FSM_DATA_TTL: int = 60 * 60 * 24 * 365  # выбранный язык
+    
+    # Pending clarify-меню: memory (один процесс) или redis (общий для воркеров)
+    CLARIFY_STORAGE: Literal["memory", "redis"] = "memory"
+    
+    # Очередь апдейтов и параллелизм запросов к API (на процесс)
+    DISPATCH_MAX_PENDING: int = 200
+    DISPATCH_MAX_PER_USER: int = 3
+    API_MAX_CONCURRENCY: int = 16
+    API_QUEUE_TIMEOUT: float = 20.0  # секунды ожидания свободного слота
+    
+    # Token bucket на пользователя: RATE_LIMIT_BURST сообщений подряд,
+    # затем RATE_LIMIT_RATE сообщений в секунду
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE: Literal["memory", "redis"] = "memory"
+    RATE_LIMIT_RATE: float = Field(0.2, gt=0)
+    RATE_LIMIT_BURST: int = 5
+    
+    # Кеш каталога FAQ (категории, списки, ответы по faq_id)
+    CATALOG_CACHE_MAX_ENTRIES: int = 2000
+    CATALOG_CACHE_TTL: int = 60  # секунды до перепроверки If-None-Match
+    
+    # Дайджест неотвеченных вопросов куратору
+    CURATOR_TELEGRAM_ID: str = ""
+    CURATOR_QUEUE_STORAGE: Literal["memory", "redis"] = "memory"
+    CURATOR_DIGEST_INTERVAL: int = 1800  # секунды
+    CURATOR_WORK_START: int = 10  # час начала рабочего дня
+    CURATOR_WORK_END: int = 20
+    
+    # Исходящие запросы к Bot API (лимиты Telegram)
+    OUTBOUND_GLOBAL_RATE: float = 30.0  # сообщений в секунду на бота
+    OUTBOUND_CHAT_RATE: float = 1.0  # в секунду на личный чат
+    OUTBOUND_GROUP_RATE: float = 20 / 60  # в секунду на группу
+    OUTBOUND_CHAT_BURST: int = 3
+    OUTBOUND_MAX_RETRIES: int = 2
+    # Плейсхолдер «Ищу ответ...» — только если API отвечает дольше (секунды)
+    PLACEHOLDER_DELAY: float = 1.0
+    
+    METRICS_LOG_INTERVAL: int = 300  # секунды, 0 = не писать снимок метрик в лог
     
     # Directus configuration (FIXED for Docker network)
     DIRECTUS_URL: str = "http://directus:8055"  # Internal Docker network
@@ -25,9 +70,19 @@ class Settings(BaseSettings):
     MAX_VIDEO_SIZE_MB: int = 50
     VIDEO_DOWNLOAD_TIMEOUT: int = 120
     
+    # Прогрев file_id: загрузка видео в приватный служебный чат
+    VIDEO_STORAGE_CHAT_ID: str = ""
+    VIDEO_WARMUP_CONCURRENCY: int = 4
+    VIDEO_WARMUP_INTERVAL: int = 0  # секунды, 0 = не запускать по расписанию внутри бота
+    
     WEBHOOK_ENABLED: bool = False
-    WEBHOOK_URL: str = ""
+    WEBHOOK_URL: str = ""  # публичный base URL, например https://bot.brokerbot.kz
     WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_SECRET: str = ""  # X-Telegram-Bot-Api-Secret-Token
+    WEBHOOK_HOST: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_MAX_CONNECTIONS: int = 40
+    BOT_WORKERS: int = 1  # >1 только в webhook-режиме с FSM_STORAGE=redis
     
     ENVIRONMENT: Literal["development", "production", "testing"] = "development"
     LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
@@ -39,6 +94,10 @@ class Settings(BaseSettings):
     @property
     def is_development(self) -> bool:
         return self.ENVIRONMENT == "development"
+    
+    @property
+    def webhook_full_url(self) -> str:
+        return f"{self.WEBHOOK_URL.rstrip('/')}{self.WEBHOOK_PATH}"
 
 
 @lru_cache
@@ -0,0 +1,40 @@
+# bot/app/core/metrics.py
+"""
+Минимальный реестр метрик процесса бота.
+
+Счётчики — inc("name"), gauges — функции, которые вызываются при snapshot().
+Снимок отдаётся на GET /metrics в webhook-режиме и периодически пишется в лог.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_counters: dict[str, int] = defaultdict(int)
+_gauges: dict[str, Callable[[], Any]] = {}
+
+
+def inc(name: str, value: int = 1) -> None:
+    _counters[name] += value
+
+
+def register_gauge(name: str, fn: Callable[[], Any]) -> None:
+    _gauges[name] = fn
+
+
+def snapshot() -> dict[str, Any]:
+    data: dict[str, Any] = {"counters": dict(_counters)}
+    for name, fn in _gauges.items():
+        try:
+            data[name] = fn()
+        except Exception as e:
+            data[name] = {"error": str(e)}
+    return data
+
+
+async def run_metrics_logger(interval: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        logger.info(f"[Metrics] {snapshot()}")
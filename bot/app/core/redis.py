@@ -0,0 +1,23 @@
+# bot/app/core/redis.py
+from redis.asyncio import Redis
+
+from app.config import settings
+
+_redis: Redis | None = None
+
+
+def get_redis() -> Redis:
+    global _redis
+    
+    if _redis is None:
+        _redis = Redis.from_url(settings.REDIS_URL)
+    
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+    
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -0,0 +1,88 @@
+# bot/app/core/webhook.py
+"""
+Webhook-режим бота.
+
+aiohttp-сервер принимает update от Telegram, проверяет
+X-Telegram-Bot-Api-Secret-Token и сразу отвечает 200 —
+обработка идёт фоновой задачей (handle_in_background), поэтому
+апдейты обрабатываются параллельно, а Telegram не ждёт handler.
+
+Процесс не хранит состояния соединения с Telegram, поэтому
+несколько экземпляров можно поставить за балансировщик.
+"""
+import asyncio
+import logging
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from app.config import settings
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+async def _healthz(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok"})
+
+
+async def _metrics(request: web.Request) -> web.Response:
+    return web.json_response(metrics.snapshot())
+
+
+def build_webhook_app(dp: Dispatcher, bot: Bot) -> web.Application:
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        handle_in_background=True,
+        secret_token=settings.WEBHOOK_SECRET or None,
+    ).register(app, path=settings.WEBHOOK_PATH)
+    app.router.add_get("/healthz", _healthz)
+    app.router.add_get("/metrics", _metrics)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def set_webhook(dp: Dispatcher, bot: Bot) -> None:
+    """Регистрация webhook в Telegram (идемпотентно — можно из каждого экземпляра)."""
+    await bot.set_webhook(
+        url=settings.webhook_full_url,
+        secret_token=settings.WEBHOOK_SECRET or None,
+        allowed_updates=dp.resolve_used_update_types(),
+        max_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+    )
+    logger.info(f"Webhook set: {settings.webhook_full_url}")
+
+
+async def run_webhook(
+    dp: Dispatcher,
+    bot: Bot,
+    register: bool = True,
+    reuse_port: bool = False,
+) -> None:
+    if not settings.WEBHOOK_URL:
+        raise RuntimeError("WEBHOOK_ENABLED=true requires WEBHOOK_URL")
+    if not settings.WEBHOOK_SECRET:
+        logger.warning("⚠️ WEBHOOK_SECRET is empty — incoming updates are not verified")
+
+    if register:
+        await set_webhook(dp, bot)
+
+    runner = web.AppRunner(build_webhook_app(dp, bot))
+    await runner.setup()
+    site = web.TCPSite(
+        runner,
+        host=settings.WEBHOOK_HOST,
+        port=settings.WEBHOOK_PORT,
+        reuse_port=reuse_port or None,
+    )
+    await site.start()
+    logger.info(f"🌐 Webhook server listening on {settings.WEBHOOK_HOST}:{settings.WEBHOOK_PORT}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        # webhook не удаляем: соседние экземпляры за балансировщиком продолжают работу
+        await runner.cleanup()
@@ -4,7 +4,7 @@ import logging
 from aiogram import Router, F
 from aiogram.types import CallbackQuery, Message
 
-from app.services.clarify_state import get_pending, clear, resolve_choice
+from app.services.clarify_state import ClarifyOption, get_pending, clear, match_choice
 from app.services.ai_client import AIClient
 from app.handlers.message import send_faq_answer, log_user_action
 
@@ -14,7 +14,7 @@ logger = logging.getLogger(__name__)
 
 async def _deliver_option(
     message_or_callback,
-    option: dict,
+    option: ClarifyOption,
     language: str,
     user_id: str,
 ) -> None:
@@ -23,8 +23,8 @@ async def _deliver_option(
     else:
         send_target = message_or_callback
 
-    faq_id = option.get("faq_id")
-    title = option.get("title", "")
+    faq_id = option.faq_id
+    title = option.title
 
     logger.info(f"[Clarify._deliver_option] faq_id={faq_id} title='{title[:50]}' lang={language}")
 
@@ -67,7 +67,7 @@ async def handle_clarify_callback(callback: CallbackQuery):
     user_id = str(callback.from_user.id)
     data = callback.data
 
-    state = get_pending(user_id)
+    state = await get_pending(user_id)
     if state is None:
         await callback.answer("⏱ Сессия истекла. Задайте вопрос заново.", show_alert=True)
         try:
@@ -76,11 +76,11 @@ async def handle_clarify_callback(callback: CallbackQuery):
             pass
         return
 
-    language = state["language"]
-    options = state["options"]
+    language = state.language
+    options = state.options
 
     if data == "clarify:other":
-        clear(user_id)
+        await clear(user_id)
         await callback.message.edit_reply_markup(reply_markup=None)
         if language == "kk":
             prompt = "💬 Нақты қандай сұрақ? Қайта жазыңыз:"
@@ -104,10 +104,10 @@ async def handle_clarify_callback(callback: CallbackQuery):
         chosen = options[idx]
         logger.info(
             f"[Clarify] user={user_id} chose idx={idx} "
-            f"faq_id={chosen.get('faq_id')} title='{chosen['title'][:40]}'"
+            f"faq_id={chosen.faq_id} title='{chosen.title[:40]}'"
         )
 
-        clear(user_id)
+        await clear(user_id)
 
         try:
             await callback.message.edit_reply_markup(reply_markup=None)
@@ -121,15 +121,15 @@ async def handle_clarify_callback(callback: CallbackQuery):
 @router.message(F.text.regexp(r'^[1-4]$|^[1️⃣2️⃣3️⃣4️⃣]$'))
 async def handle_digit_choice(message: Message):
     user_id = str(message.from_user.id)
-    state = get_pending(user_id)
+    state = await get_pending(user_id)
 
     if state is None:
         return
 
-    option = resolve_choice(user_id, message.text)
+    option = match_choice(state, message.text)
     if option is None:
         return
 
-    language = state["language"]
-    clear(user_id)
+    language = state.language
+    await clear(user_id)
     await _deliver_option(message, option, language, user_id)
\ No newline at end of file
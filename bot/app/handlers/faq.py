@@ -1,13 +1,14 @@
 # bot/app/handlers/faq.py
 from aiogram import Router, F
-from aiogram.types import CallbackQuery, BufferedInputFile
-import aiohttp
+from aiogram.types import CallbackQuery
 import logging
 
-from app.config import settings
 from app.keyboards.inline import get_questions_keyboard, get_back_keyboard
 from app.core.database import get_session_maker
 from app.models.database import Log
+from app.services.api_client import APIClient
+from app.services.catalog_cache import CatalogUnavailable
+from app.services.video_service import send_video
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -21,24 +22,21 @@ async def show_category_questions(callback: CallbackQuery):
     category = callback.data.split(":", 1)[1]
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{settings.API_BASE_URL}/faq/category/{category}"
-            ) as resp:
-                if resp.status == 200:
-                    faqs = await resp.json()
-                    
-                    keyboard = get_questions_keyboard(faqs)
-                    
-                    await callback.message.edit_text(
-                        f"Санаттағы сұрақтар:\n\nСұрақты таңда:",
-                        reply_markup=keyboard
-                    )
-                    await callback.answer()
-                elif resp.status == 404:
-                    await callback.answer("Санат табылмады", show_alert=True)
-                else:
-                    await callback.answer("Сұрақтарды жүктеу қатесі", show_alert=True)
+        faqs = await APIClient().get_faqs_by_category(category)
+        if not faqs:
+            await callback.answer("Санат табылмады", show_alert=True)
+            return
+        
+        keyboard = get_questions_keyboard(faqs)
+        
+        await callback.message.edit_text(
+            f"Санаттағы сұрақтар:\n\nСұрақты таңда:",
+            reply_markup=keyboard
+        )
+        await callback.answer()
+    except CatalogUnavailable as e:
+        logger.error(f"Category questions unavailable: {e}")
+        await callback.answer("Сұрақтарды жүктеу қатесі", show_alert=True)
     except Exception as e:
         logger.error(f"Error fetching category questions: {e}")
         await callback.answer("Қате орын алды", show_alert=True)
@@ -53,15 +51,10 @@ async def show_faq_answer(callback: CallbackQuery):
     telegram_id = str(callback.from_user.id)
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{settings.API_BASE_URL}/faq/{faq_id}"
-            ) as resp:
-                if resp.status != 200:
-                    await callback.answer("Жауап табылмады", show_alert=True)
-                    return
-                
-                faq = await resp.json()
+        faq = await APIClient().get_faq_by_id(int(faq_id))
+        if faq is None:
+            await callback.answer("Жауап табылмады", show_alert=True)
+            return
         
         await log_user_action(
             telegram_id=telegram_id,
@@ -79,41 +72,19 @@ async def show_faq_answer(callback: CallbackQuery):
         video_url = faq.get("video_url")  # Полный URL из API
         
         if video_url:
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(video_url) as video_resp:
-                        if video_resp.status == 200:
-                            video_data = await video_resp.read()
-                            
-                            filename = video_url.split('/')[-1]
-                            
-                            video_file = BufferedInputFile(
-                                video_data, 
-                                filename=filename
-                            )
-                            
-                            await callback.message.answer_video(
-                                video=video_file,
-                                caption=caption_text,
-                                reply_markup=keyboard
-                            )
-                        else:
-                            logger.error(f"Failed to download video: {video_resp.status}")
-                            await callback.message.answer(
-                                caption_text,
-                                reply_markup=keyboard
-                            )
-                            await callback.message.answer(
-                                f"⚠️ Видео уақытша қолжетімсіз"
-                            )
-            except Exception as e:
-                logger.error(f"Error sending video: {e}")
+            video_sent = await send_video(
+                callback.message,
+                video_url,
+                caption=caption_text,
+                reply_markup=keyboard,
+            )
+            if not video_sent:
                 await callback.message.answer(
                     caption_text,
                     reply_markup=keyboard
                 )
                 await callback.message.answer(
-                    f"⚠️ Видео жіберу кезінде қате орын алды"
+                    f"⚠️ Видео уақытша қолжетімсіз"
                 )
         else:
             await callback.message.answer(
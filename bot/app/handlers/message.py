@@ -1,15 +1,19 @@
 # bot/app/handlers/message.py
 from aiogram import Router, F
-from aiogram.types import Message, BufferedInputFile
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InlineKeyboardMarkup, Message
 from aiogram.fsm.context import FSMContext
-import aiohttp
+import asyncio
 import logging
-import os
-from datetime import datetime
+from typing import Optional
 
 from app.config import settings
+from app.services import curator_digest
 from app.services.ai_client import AIClient
-from app.services.clarify_state import set_pending, get_pending, clear, resolve_choice
+from app.services.language_detector import language_detector
+from app.services.clarify_state import ClarifyOption, set_pending, get_pending, clear, match_choice
+from app.services.video_service import send_video
+from app.middlewares.rate_limit import slow_down_text
 from app.keyboards.clarify import build_clarify_keyboard, build_clarify_message
 from app.core.database import get_session_maker
 from app.models.database import Log
@@ -17,30 +21,10 @@ from app.models.database import Log
 router = Router()
 logger = logging.getLogger(__name__)
 
-CURATOR_CHAT_ID = os.getenv("CURATOR_TELEGRAM_ID", "YOUR_CURATOR_ID")
-
 
 def _ui_language(text: str) -> str:
     """Fallback определение языка — используется только если FSM state не задан."""
-    kk_chars = set("әіңғүұқөһӘІҢҒҮҰҚӨҺ")
-    if any(c in kk_chars for c in text):
-        return "kk"
-    kk_words = {"деген", "туралы", "керек", "болады", "айтшы",
-                 "алу", "беру", "ашу", "сату", "және", "немесе"}
-    if set(text.lower().split()) & kk_words:
-        return "kk"
-    kk_suffixes = ("да", "де", "та", "те", "дан", "ден", "тан", "тен",
-                   "нан", "нен", "ға", "ге", "қа", "ке",
-                   "лар", "лер", "дар", "дер", "тар", "тер")
-    for word in text.lower().split():
-        for s in kk_suffixes:
-            if word.endswith(s) and len(word) > len(s) + 2:
-                return "kk"
-    ru_words = {"как", "что", "это", "для", "или", "где", "нет", "да", "можно", "хочу",
-                "привет", "здравствуй", "добрый", "спасибо"}
-    if len(set(text.lower().split()) & ru_words) >= 1:
-        return "ru"
-    return "kk"
+    return language_detector.detect(text)
 
 
 async def _get_user_language(state: FSMContext, fallback_text: str = "") -> str:
@@ -71,45 +55,55 @@ async def handle_text_message(message: Message, state: FSMContext):
     user_language = await _get_user_language(state, fallback_text=question)
 
     # ─── Проверка pending clarify state ──────────────────────────────────────
-    pending = get_pending(user_id)
+    pending = await get_pending(user_id)
     if pending is not None:
-        option = resolve_choice(user_id, question)
+        option = match_choice(pending, question)
         if option is not None:
-            language = pending["language"]
-            logger.info(f"[MSG] Resolved as clarify choice: '{option['title'][:40]}'")
-            clear(user_id)
+            language = pending.language
+            logger.info(f"[MSG] Resolved as clarify choice: '{option.title[:40]}'")
+            await clear(user_id)
             from app.handlers.clarify import _deliver_option
             await _deliver_option(message, option, language, user_id)
             return
         else:
             logger.info(f"[MSG] Pending clarify cancelled — new question received")
-            clear(user_id)
-
-    # ─── Индикатор поиска ────────────────────────────────────────────────────
-    if user_language == "kk":
-        searching_msg = await message.answer("🔍 Іздеп жатырмын...")
-    else:
-        searching_msg = await message.answer("🔍 Ищу ответ...")
+            await clear(user_id)
 
     # ─── Запрос к API с языком из FSM ────────────────────────────────────────
+    # Плейсхолдер — только если API не ответил за PLACEHOLDER_DELAY;
+    # потом он редактируется в ответ, а не удаляется
     ai_client = AIClient()
-    response = await ai_client.ask_question(
+    ask_task = asyncio.create_task(ai_client.ask_question(
         question=question,
         user_id=user_id,
         language=user_language,  # передаём выбранный язык пользователем
-    )
-
-    try:
-        await searching_msg.delete()
-    except Exception:
-        pass
+    ))
+    placeholder = None
+    done, _ = await asyncio.wait({ask_task}, timeout=settings.PLACEHOLDER_DELAY)
+    if not done:
+        searching = "🔍 Іздеп жатырмын..." if user_language == "kk" else "🔍 Ищу ответ..."
+        # Плейсхолдер необязателен: не отправился — ответ уйдёт новым сообщением,
+        # а запрос к API всё равно дожидаемся
+        try:
+            placeholder = await message.answer(searching)
+        except Exception as e:
+            logger.warning(f"[MSG] Placeholder not sent: {e}")
+    response = await ask_task
 
     if not response:
         err = "Кешіріңіз, қате орын алды 🔄" if user_language == "kk" else "Извините, ошибка 🔄"
-        await message.answer(err)
+        await reply(message, err, placeholder=placeholder)
         return
 
     action = response.get("action")
+    if action == "rate_limited":
+        await reply(
+            message,
+            slow_down_text(user_language, response.get("retry_after", 0)),
+            placeholder=placeholder,
+        )
+        return
+
     confidence = response.get("confidence", 0.0)
     # Используем язык из FSM — игнорируем detected_language от API
     language = user_language
@@ -117,7 +111,7 @@ async def handle_text_message(message: Message, state: FSMContext):
     logger.info(f"[MSG] action={action} conf={confidence:.3f} lang={language} user={user_id}")
 
     if action == "direct_answer":
-        await send_faq_answer(message, response, language)
+        await send_faq_answer(message, response, language, placeholder=placeholder)
         await log_user_action(
             telegram_id=user_id,
             question=question,
@@ -129,20 +123,21 @@ async def handle_text_message(message: Message, state: FSMContext):
         suggestions = response.get("suggestions", [])
         faq_ids = response.get("suggestion_ids", [])
 
-        options = []
-        for i, title in enumerate(suggestions[:4]):
-            options.append({
-                "index": i,
-                "title": title,
-                "faq_id": faq_ids[i] if i < len(faq_ids) else None,
-            })
+        options = [
+            ClarifyOption(
+                index=i,
+                title=title,
+                faq_id=faq_ids[i] if i < len(faq_ids) else None,
+            )
+            for i, title in enumerate(suggestions[:4])
+        ]
 
         if not options:
             fallback = "Сұрақты нақтылаңыз" if language == "kk" else "Уточните вопрос"
-            await message.answer(response.get("message", fallback))
+            await reply(message, response.get("message", fallback), placeholder=placeholder)
             return
 
-        set_pending(
+        await set_pending(
             user_id=user_id,
             options=options,
             language=language,
@@ -152,7 +147,7 @@ async def handle_text_message(message: Message, state: FSMContext):
         # Варианты — в тексте, кнопки — только цифры
         msg_text = build_clarify_message(language, question, options)
         keyboard = build_clarify_keyboard(options, language)
-        await message.answer(msg_text, reply_markup=keyboard)
+        await reply(message, msg_text, placeholder=placeholder, reply_markup=keyboard)
 
         await log_user_action(
             telegram_id=user_id,
@@ -167,8 +162,8 @@ async def handle_text_message(message: Message, state: FSMContext):
             else "Извините, не нашёл ответа"
         )
         no_ans_text += _get_language_reminder(language)
-        await message.answer(no_ans_text)
-        await send_to_curator(bot=message.bot, user=message.from_user, question=question)
+        await reply(message, no_ans_text, placeholder=placeholder)
+        await curator_digest.enqueue(message.from_user, question, language)
         await log_user_action(
             telegram_id=user_id,
             question=question,
@@ -177,34 +172,44 @@ async def handle_text_message(message: Message, state: FSMContext):
         )
 
 
-async def send_faq_answer(message: Message, response: dict, language: str = "kk"):
+async def reply(
+    message: Message,
+    text: str,
+    placeholder: Optional[Message] = None,
+    reply_markup: Optional[InlineKeyboardMarkup] = None,
+) -> None:
+    """Ответ текстом: редактируем плейсхолдер если он есть, иначе новое сообщение."""
+    if placeholder is not None:
+        try:
+            await placeholder.edit_text(text, reply_markup=reply_markup)
+            return
+        except TelegramBadRequest as e:
+            logger.warning(f"[MSG] placeholder edit failed: {e}")
+    await message.answer(text, reply_markup=reply_markup)
+
+
+async def _drop_placeholder(placeholder: Optional[Message]) -> None:
+    if placeholder is None:
+        return
+    try:
+        await placeholder.delete()
+    except Exception:
+        pass
+
+
+async def send_faq_answer(
+    message: Message,
+    response: dict,
+    language: str = "kk",
+    placeholder: Optional[Message] = None,
+):
     answer_text = response.get("answer_text", "")
     video_url = response.get("video_url")
 
     if video_url:
-        video_sent = False
-        try:
-            timeout = aiohttp.ClientTimeout(total=settings.VIDEO_DOWNLOAD_TIMEOUT, connect=30)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(video_url) as resp:
-                    if resp.status == 200:
-                        data = await resp.read()
-                        size_mb = len(data) / (1024 * 1024)
-                        if size_mb > settings.MAX_VIDEO_SIZE_MB:
-                            raise ValueError(f"Video {size_mb:.1f}MB > limit")
-                        filename = video_url.split("/")[-1].split("?")[0]
-                        if not filename.endswith((".mp4", ".mov", ".avi", ".webm")):
-                            filename += ".mp4"
-                        await message.answer_video(
-                            video=BufferedInputFile(data, filename=filename),
-                            caption=f"💡 {answer_text}"[:1024],
-                            supports_streaming=True,
-                        )
-                        video_sent = True
-                    else:
-                        logger.error(f"[VIDEO] status={resp.status}")
-        except Exception as e:
-            logger.error(f"[VIDEO] error: {e}", exc_info=True)
+        # Текст нельзя отредактировать в видео — плейсхолдер удаляем
+        await _drop_placeholder(placeholder)
+        video_sent = await send_video(message, video_url, caption=f"💡 {answer_text}"[:1024])
 
         if not video_sent:
             suffix = (
@@ -213,24 +218,7 @@ async def send_faq_answer(message: Message, response: dict, language: str = "kk"
             )
             await message.answer(f"💡 {answer_text}{suffix}")
     else:
-        await message.answer(f"💡 {answer_text}")
-
-
-async def send_to_curator(bot, user, question: str):
-    try:
-        if 10 <= datetime.now().hour < 20:
-            await bot.send_message(
-                chat_id=CURATOR_CHAT_ID,
-                text=(
-                    f"🆘 НОВЫЙ ВОПРОС\n\n"
-                    f"👤 {user.full_name} (@{user.username or '-'})\n"
-                    f"🆔 {user.id}\n"
-                    f"📝 {question}\n"
-                    f"⏰ {datetime.now().strftime('%H:%M')}"
-                ),
-            )
-    except Exception as e:
-        logger.error(f"[CURATOR] {e}")
+        await reply(message, f"💡 {answer_text}", placeholder=placeholder)
 
 
 async def log_user_action(telegram_id, question, matched_faq_id, confidence):
@@ -11,13 +11,15 @@
 """
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from app.services.clarify_state import ClarifyOption
+
 
 _DIGIT_EMOJI = ["1️⃣", "2️⃣", "3️⃣", "4️⃣"]
 _DIGIT_LABEL = ["1", "2", "3", "4"]
 
 
 def build_clarify_keyboard(
-    options: list[dict],
+    options: list[ClarifyOption],
     language: str = "kk",
 ) -> InlineKeyboardMarkup:
     """
@@ -53,7 +55,7 @@ def build_clarify_keyboard(
 def build_clarify_message(
     language: str,
     original_query: str,
-    options: list[dict],
+    options: list[ClarifyOption],
 ) -> str:
     """
     Текст сообщения с вариантами — полный текст каждого варианта.
@@ -67,7 +69,7 @@ def build_clarify_message(
     lines = [header]
     for i, opt in enumerate(options[:4]):
         emoji = _DIGIT_EMOJI[i]
-        lines.append(f"{emoji} {opt['title']}")
+        lines.append(f"{emoji} {opt.title}")
 
     return "\n".join(lines)
 
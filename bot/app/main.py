@@ -1,24 +1,63 @@
 # bot/app/main.py
 import asyncio
 import logging
+import multiprocessing
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
 
 from app.config import settings
 from app.core.logging_config import setup_logging
+from app.core.metrics import run_metrics_logger
+from app.core.redis import close_redis, get_redis
+from app.core.webhook import run_webhook
 from app.handlers import start, errors
 from app.handlers import message as message_handler
 from app.handlers import clarify as clarify_handler  # НОВЫЙ
+from app.middlewares.dispatch import UserOrderMiddleware
+from app.middlewares.rate_limit import RateLimitMiddleware
+from app.services import clarify_state
+from app.services.curator_digest import run_digest_loop
+from app.services.outbound import OutboundPacer
+from app.services.video_warmup import run_warmup_loop
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
 
-async def main():
-    storage = MemoryStorage()
-    bot = Bot(token=settings.BOT_TOKEN, parse_mode=ParseMode.HTML)
-    dp = Dispatcher(storage=storage)
+def create_storage() -> BaseStorage:
+    if settings.FSM_STORAGE == "redis":
+        return RedisStorage(
+            redis=get_redis(),
+            key_builder=DefaultKeyBuilder(prefix=settings.FSM_KEY_PREFIX, with_bot_id=True),
+            state_ttl=settings.FSM_STATE_TTL,
+            data_ttl=settings.FSM_DATA_TTL,
+        )
+    return MemoryStorage()
+
+
+def create_dispatcher() -> Dispatcher:
+    storage = create_storage()
+    # Redis: апдейты одного пользователя обрабатываются по очереди даже
+    # если они пришли в разные воркеры
+    events_isolation = (
+        storage.create_isolation() if isinstance(storage, RedisStorage) else None
+    )
+    dp = Dispatcher(storage=storage, events_isolation=events_isolation)
+
+    # Лимит и очередь — update-level и ДО FSMContextMiddleware: FSM берёт
+    # per-user lock (RedisEventIsolation) раньше любых message/callback
+    # middleware, и всплеск ждал бы на нём без ограничений.
+    # Порядок: errors → user context → rate limit → очередь → FSM.
+    dp.update.outer_middleware.unregister(dp.fsm)
+    # Лимит частоты — до очереди, чтобы отклонённые апдейты не занимали её
+    if settings.RATE_LIMIT_ENABLED:
+        dp.update.outer_middleware(RateLimitMiddleware(fsm=dp.fsm))
+    # Апдейты одного пользователя — по очереди, с ограничением очереди
+    dp.update.outer_middleware(UserOrderMiddleware(fsm=dp.fsm))
+    dp.update.outer_middleware(dp.fsm)
 
     # ПОРЯДОК ВАЖЕН:
     # 1. start — команды /start /language
@@ -30,14 +69,102 @@ async def main():
     dp.include_router(message_handler.router)
     dp.include_router(errors.router)
 
-    logger.info("🤖 Bot started")
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+    return dp
+
+
+_background_tasks: list[asyncio.Task] = []
+
+
+async def on_startup() -> None:
+    await clarify_state.start()
+    if settings.METRICS_LOG_INTERVAL > 0:
+        _background_tasks.append(
+            asyncio.create_task(run_metrics_logger(settings.METRICS_LOG_INTERVAL))
+        )
+
+
+async def on_shutdown() -> None:
+    await clarify_state.stop()
+    for task in _background_tasks:
+        task.cancel()
+    _background_tasks.clear()
+
+
+async def main(worker_index: int = 0):
+    bot = Bot(token=settings.BOT_TOKEN, parse_mode=ParseMode.HTML)
+    bot.session.middleware(OutboundPacer())
+    dp = create_dispatcher()
+
+    # Фоновые задачи — только в одном воркере
+    worker_tasks: list[asyncio.Task] = []
+    if worker_index == 0:
+        worker_tasks.append(asyncio.create_task(
+            run_digest_loop(bot, settings.CURATOR_DIGEST_INTERVAL)
+        ))
+        if settings.VIDEO_WARMUP_INTERVAL > 0:
+            worker_tasks.append(asyncio.create_task(
+                run_warmup_loop(bot, settings.VIDEO_WARMUP_INTERVAL)
+            ))
+
+    try:
+        if settings.WEBHOOK_ENABLED:
+            logger.info(f"🤖 Bot started (webhook, worker={worker_index})")
+            await run_webhook(
+                dp,
+                bot,
+                register=worker_index == 0,
+                reuse_port=settings.BOT_WORKERS > 1,
+            )
+        else:
+            # Polling — режим по умолчанию для разработки
+            logger.info("🤖 Bot started (polling)")
+            await bot.delete_webhook(drop_pending_updates=True)
+            await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+    finally:
+        for task in worker_tasks:
+            task.cancel()
+        await close_redis()
+
+
+def _run_worker(worker_index: int) -> None:
+    try:
+        asyncio.run(main(worker_index))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers() -> None:
+    """
+    Несколько процессов на одном порту (SO_REUSEPORT): ядро распределяет
+    соединения Telegram между воркерами, состояние FSM — общее в Redis.
+    """
+    if not settings.WEBHOOK_ENABLED:
+        raise RuntimeError("BOT_WORKERS > 1 requires WEBHOOK_ENABLED=true (polling is single-process)")
+    if settings.FSM_STORAGE != "redis":
+        raise RuntimeError("BOT_WORKERS > 1 requires FSM_STORAGE=redis")
+    if settings.CLARIFY_STORAGE != "redis":
+        raise RuntimeError("BOT_WORKERS > 1 requires CLARIFY_STORAGE=redis")
+    if settings.CURATOR_QUEUE_STORAGE != "redis":
+        raise RuntimeError("BOT_WORKERS > 1 requires CURATOR_QUEUE_STORAGE=redis")
 
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+    processes = [
+        multiprocessing.Process(target=_run_worker, args=(i,), name=f"bot-worker-{i}")
+        for i in range(settings.BOT_WORKERS)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {len(processes)} bot workers")
+    for process in processes:
+        process.join()
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if settings.BOT_WORKERS > 1:
+            run_workers()
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
-        logger.info("Bot stopped")
\ No newline at end of file
+        logger.info("Bot stopped")
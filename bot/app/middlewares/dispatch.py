@@ -0,0 +1,72 @@
+# bot/app/middlewares/dispatch.py
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.middleware import FSMContextMiddleware
+from aiogram.types import TelegramObject, Update
+
+from app.services.dispatch import user_dispatcher
+
+logger = logging.getLogger(__name__)
+
+_BUSY_TEXT = {
+    "kk": "⏳ Алдыңғы сұрақтарыңызды өңдеп жатырмын, сәл күтіңіз.",
+    "ru": "⏳ Обрабатываю ваши предыдущие вопросы, подождите немного.",
+}
+
+
+async def state_language(data: Dict[str, Any], fsm: Optional[FSMContextMiddleware]) -> str:
+    """
+    Язык пользователя из FSM. Update-middleware стоят до FSMContextMiddleware,
+    state в data ещё нет — читаем хранилище напрямую (без lock, только чтение).
+    """
+    state = data.get("state")
+    if state is None and fsm is not None:
+        state = fsm.resolve_event_context(data["bot"], data)
+    if state is None:
+        return "kk"
+    return (await state.get_data()).get("language", "kk")
+
+
+class UserOrderMiddleware(BaseMiddleware):
+    """
+    Outer-middleware для update (message и callback_query): апдейты одного
+    пользователя — по очереди, переполнение очереди — вежливый отказ.
+
+    Регистрируется ДО FSMContextMiddleware: тот берёт per-user lock
+    (RedisEventIsolation), и очередь копилась бы на нём, минуя лимиты.
+    """
+
+    def __init__(self, fsm: Optional[FSMContextMiddleware] = None):
+        self.fsm = fsm
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None or not isinstance(event, Update) or not (event.message or event.callback_query):
+            return await handler(event, data)
+
+        user_id = str(user.id)
+        if not user_dispatcher.admit(user_id):
+            logger.warning(f"[Dispatch] SHED user={user_id}")
+            await self._reply_busy(event, data)
+            return None
+
+        async with user_dispatcher.ordered(user_id):
+            return await handler(event, data)
+
+    async def _reply_busy(self, event: Update, data: Dict[str, Any]) -> None:
+        try:
+            language = await state_language(data, self.fsm)
+            text = _BUSY_TEXT.get(language, _BUSY_TEXT["kk"])
+            if event.message:
+                await event.message.answer(text)
+            elif event.callback_query:
+                await event.callback_query.answer(text)
+        except Exception as e:
+            logger.error(f"[Dispatch] busy reply failed: {e}")
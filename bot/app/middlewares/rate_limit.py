@@ -0,0 +1,87 @@
+# bot/app/middlewares/rate_limit.py
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.fsm.middleware import FSMContextMiddleware
+from aiogram.types import Message, TelegramObject, Update
+
+from app.core import metrics
+from app.middlewares.dispatch import state_language
+from app.services.rate_limiter import TokenBucketLimiter, create_limiter
+
+logger = logging.getLogger(__name__)
+
+_SLOW_DOWN_TEXT = {
+    "kk": "🐢 Хабарламалар тым жиі келіп жатыр. {seconds} сек. күтіп, қайта жазыңыз.",
+    "ru": "🐢 Слишком много сообщений подряд. Подождите {seconds} сек. и напишите снова.",
+}
+_NOTICE_INTERVAL = 10  # не чаще одного предупреждения на пользователя
+_MAX_NOTICES = 10_000
+
+
+class RateLimitMiddleware(BaseMiddleware):
+    """
+    Outer-middleware для update: token bucket на пользователя, только
+    для сообщений. Сообщение сверх лимита не доходит до очереди, handler и API.
+    """
+
+    def __init__(
+        self,
+        limiter: TokenBucketLimiter | None = None,
+        fsm: Optional[FSMContextMiddleware] = None,
+    ):
+        self.limiter = limiter or create_limiter()
+        self.fsm = fsm
+        self._notified: dict[str, float] = {}
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None or not isinstance(event, Update) or event.message is None:
+            return await handler(event, data)
+
+        user_id = str(user.id)
+        try:
+            decision = await self.limiter.hit(user_id)
+        except Exception as e:
+            # Недоступный Redis не должен останавливать бота
+            logger.error(f"[RateLimit] limiter error: {e}")
+            return await handler(event, data)
+
+        if decision.allowed:
+            return await handler(event, data)
+
+        metrics.inc("rate_limited")
+        logger.info(f"[RateLimit] LIMITED user={user_id} retry_after={decision.retry_after:.1f}s")
+        if self._should_notify(user_id):
+            await self._reply_slow_down(event.message, data, decision.retry_after)
+        return None
+
+    def _should_notify(self, user_id: str) -> bool:
+        now = time.monotonic()
+        if now - self._notified.get(user_id, 0.0) < _NOTICE_INTERVAL:
+            return False
+        if len(self._notified) >= _MAX_NOTICES:
+            self._notified = {
+                uid: ts for uid, ts in self._notified.items() if now - ts < _NOTICE_INTERVAL
+            }
+        self._notified[user_id] = now
+        return True
+
+    async def _reply_slow_down(self, message: Message, data: Dict[str, Any], retry_after: float) -> None:
+        try:
+            language = await state_language(data, self.fsm)
+            await message.answer(slow_down_text(language, retry_after))
+        except Exception as e:
+            logger.error(f"[RateLimit] reply failed: {e}")
+
+
+def slow_down_text(language: str, retry_after: float) -> str:
+    text = _SLOW_DOWN_TEXT.get(language, _SLOW_DOWN_TEXT["kk"])
+    return text.format(seconds=max(1, round(retry_after)))
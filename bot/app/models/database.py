@@ -1,5 +1,6 @@
 from datetime import datetime
 from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -24,4 +25,14 @@ class Log(Base):
     question = Column(Text, nullable=True)
     matched_faq_id = Column(Integer, ForeignKey("faq.id", ondelete="SET NULL"), nullable=True)
     confidence = Column(Float, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+
+
+class TelegramVideoCache(Base):
+    __tablename__ = "telegram_video_cache"
+    
+    video_uuid = Column(UUID(as_uuid=False), primary_key=True)
+    file_id = Column(Text, nullable=False)
+    file_unique_id = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
\ No newline at end of file
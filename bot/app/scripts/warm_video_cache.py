@@ -0,0 +1,38 @@
+# bot/app/scripts/warm_video_cache.py
+import argparse
+import asyncio
+
+from aiogram import Bot
+
+from app.config import settings
+from app.core.logging_config import setup_logging, get_logger
+from app.services.outbound import OutboundPacer
+from app.services.video_warmup import run_warmup_loop, warm_video_cache
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+async def main(interval: int) -> None:
+    """Загрузить недостающие видео в служебный чат и сохранить file_id"""
+    bot = Bot(token=settings.BOT_TOKEN)
+    bot.session.middleware(OutboundPacer())
+    try:
+        if interval > 0:
+            await run_warmup_loop(bot, interval)
+        else:
+            await warm_video_cache(bot)
+    finally:
+        await bot.session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm Telegram file_id cache for FAQ videos")
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=0,
+        help="Повторять каждые N секунд (0 — один проход)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.interval))
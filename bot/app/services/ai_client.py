@@ -4,6 +4,8 @@ import logging
 from typing import Optional, Dict
 
 from app.config import settings
+from app.services.catalog_cache import CatalogUnavailable, catalog_cache
+from app.services.dispatch import ApiSaturated, api_slot
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +21,7 @@ class AIClient:
         language: str = "auto",
     ) -> Optional[Dict]:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with api_slot(), aiohttp.ClientSession() as session:
                 async with session.post(
                     f"{self.base_url}/api/ask",
                     json={"question": question, "user_id": user_id, "language": language},
@@ -27,24 +29,25 @@ class AIClient:
                 ) as resp:
                     if resp.status == 200:
                         return await resp.json()
+                    if resp.status == 429:
+                        retry_after = float(resp.headers.get("Retry-After", 0) or 0)
+                        logger.warning(f"[AIClient] ask rate limited user={user_id}")
+                        return {"action": "rate_limited", "retry_after": retry_after}
                     logger.error(f"[AIClient] ask status={resp.status}")
                     return None
+        except ApiSaturated:
+            logger.warning(f"[AIClient] ask skipped: API saturated user={user_id}")
+            return None
         except Exception as e:
             logger.error(f"[AIClient] ask error: {e}")
             return None
 
     async def ask_by_faq_id(self, faq_id: int) -> Optional[Dict]:
-        """Получить прямой ответ по faq_id — без поиска."""
+        """Получить прямой ответ по faq_id — без поиска (через catalog_cache)."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/api/faq-direct/{faq_id}",
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-                    logger.error(f"[AIClient] faq-direct status={resp.status} id={faq_id}")
-                    return None
-        except Exception as e:
-            logger.error(f"[AIClient] faq-direct error: {e}")
-            return None
\ No newline at end of file
+            response = await catalog_cache.get_json(f"{self.base_url}/api/faq-direct/{faq_id}")
+        except CatalogUnavailable:
+            response = None
+        if response is None:
+            logger.error(f"[AIClient] faq-direct failed id={faq_id}")
+        return response
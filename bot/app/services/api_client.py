@@ -1,15 +1,18 @@
-import aiohttp
 from typing import List, Dict, Optional
 import logging
 
 from app.config import settings
+from app.services.catalog_cache import CatalogUnavailable, catalog_cache
 
 logger = logging.getLogger(__name__)
 
 
 class APIClient:
     """
-    Клиент для взаимодействия с API
+    Клиент для взаимодействия с API.
+    GET-запросы каталога идут через catalog_cache.
+    get_faqs_by_category / get_faq_by_id пробрасывают CatalogUnavailable,
+    чтобы handler отличал «не найдено» от ошибки API.
     """
     
     def __init__(self, base_url: str = None):
@@ -20,20 +23,16 @@ class APIClient:
         Получить список категорий
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/faq/categories",
-                    params={"language": language}
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return data.get("categories", [])
-                    else:
-                        logger.error(f"Failed to get categories: {resp.status}")
-                        return []
-        except Exception as e:
-            logger.error(f"Error getting categories: {e}")
+            data = await catalog_cache.get_json(
+                f"{self.base_url}/faq/categories",
+                params={"language": language},
+            )
+        except CatalogUnavailable:
+            data = None
+        if data is None:
+            logger.error("Failed to get categories")
             return []
+        return data.get("categories", [])
     
     async def get_faqs_by_category(
         self,
@@ -43,33 +42,20 @@ class APIClient:
         """
         Получить FAQ по категории
         """
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/faq/category/{category}",
-                    params={"language": language}
-                ) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-                    else:
-                        logger.error(f"Failed to get FAQs for category {category}: {resp.status}")
-                        return []
-        except Exception as e:
-            logger.error(f"Error getting FAQs for category {category}: {e}")
+        data = await catalog_cache.get_json(
+            f"{self.base_url}/faq/category/{category}",
+            params={"language": language},
+        )
+        if data is None:
+            logger.warning(f"Category {category} not found")
             return []
+        return data
     
     async def get_faq_by_id(self, faq_id: int) -> Optional[Dict]:
         """
         Получить FAQ по ID
         """
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/faq/{faq_id}") as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-                    else:
-                        logger.error(f"Failed to get FAQ {faq_id}: {resp.status}")
-                        return None
-        except Exception as e:
-            logger.error(f"Error getting FAQ {faq_id}: {e}")
-            return None
\ No newline at end of file
+        data = await catalog_cache.get_json(f"{self.base_url}/faq/{faq_id}")
+        if data is None:
+            logger.warning(f"FAQ {faq_id} not found")
+        return data
@@ -0,0 +1,120 @@
+# bot/app/services/catalog_cache.py
+"""
+Кеш каталога FAQ на стороне бота.
+
+Категории, списки вопросов категории и ответы по faq_id меняются редко,
+поэтому GET-ответы API кешируются в процессе:
+
+- свежая запись (моложе CATALOG_CACHE_TTL) отдаётся без запроса к API;
+- устаревшая перепроверяется условным запросом If-None-Match —
+  304 продлевает запись без передачи тела;
+- если API недоступен, отдаётся устаревшая запись (stale-if-error);
+  если её нет — CatalogUnavailable (404 — это None, а не ошибка).
+
+Размер ограничен CATALOG_CACHE_MAX_ENTRIES, вытесняется давно
+не использованная запись (LRU).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import aiohttp
+
+from app.config import settings
+from app.core import metrics
+from app.services.dispatch import api_slot
+
+logger = logging.getLogger(__name__)
+
+_TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+
+class CatalogUnavailable(Exception):
+    """API не ответил (сеть, таймаут, 5xx) и устаревшей записи нет."""
+
+
+@dataclass(slots=True)
+class _Entry:
+    data: Any
+    etag: Optional[str]
+    fetched_at: float
+
+
+class CatalogCache:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._stats = {"hits": 0, "revalidated": 0, "misses": 0, "stale_served": 0}
+
+    @staticmethod
+    def _key(url: str, params: Optional[dict]) -> str:
+        if not params:
+            return url
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{url}?{query}"
+
+    async def get_json(self, url: str, params: Optional[dict] = None) -> Optional[Any]:
+        """JSON ответа API (из кеша или сети). None — 404; ошибка без кеша — CatalogUnavailable."""
+        key = self._key(url, params)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if now - entry.fetched_at < self.ttl:
+                self._stats["hits"] += 1
+                return entry.data
+
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+
+        try:
+            async with api_slot(), aiohttp.ClientSession(timeout=_TIMEOUT) as session:
+                async with session.get(url, params=params, headers=headers) as resp:
+                    if resp.status == 304 and entry is not None:
+                        entry.fetched_at = now
+                        self._stats["revalidated"] += 1
+                        return entry.data
+                    if resp.status != 200:
+                        logger.error(f"[CatalogCache] {key} status={resp.status}")
+                        if resp.status == 404:
+                            self._entries.pop(key, None)
+                            return None
+                        return self._stale(entry, f"status={resp.status}")
+                    data = await resp.json()
+                    etag = resp.headers.get("ETag")
+        except Exception as e:
+            logger.error(f"[CatalogCache] {key} error: {e}")
+            return self._stale(entry, str(e) or type(e).__name__)
+
+        self._stats["misses"] += 1
+        self._entries[key] = _Entry(data=data, etag=etag, fetched_at=now)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return data
+
+    def _stale(self, entry: Optional[_Entry], reason: str) -> Any:
+        if entry is None:
+            raise CatalogUnavailable(reason)
+        self._stats["stale_served"] += 1
+        return entry.data
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), **self._stats}
+
+
+catalog_cache = CatalogCache(
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+    ttl=settings.CATALOG_CACHE_TTL,
+)
+metrics.register_gauge("catalog_cache", catalog_cache.stats)
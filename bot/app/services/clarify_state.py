@@ -3,74 +3,300 @@
 State-менеджер для clarify-диалога.
 
 Хранит pending уточнение для каждого user_id.
-TTL: 5 минут — после этого state сбрасывается автоматически.
-
-Структура:
-    _store[user_id] = {
-        "options": [
-            {"index": 1, "title": "...", "faq_id": 123},
-            ...
-        ],
-        "language": "kk",
-        "original_query": "фридом қалай",
-        "created_at": float (timestamp)
-    }
+TTL: 5 минут — истёкшие записи вытесняются проактивно, не дожидаясь
+возвращения пользователя.
+
+Backend выбирается CLARIFY_STORAGE:
+    memory — dict + min-heap по expires_at, фоновый sweeper
+             выталкивает истёкшие записи за O(log n) каждая;
+             число записей ограничено _MAX_ENTRIES.
+    redis  — ключ на пользователя с EX=TTL, общий для всех воркеров.
+
+Запись:
+    PendingClarify(
+        options=(ClarifyOption(index=0, title="...", faq_id=123), ...),
+        language="kk",
+        original_query="фридом қалай",
+        expires_at=float (monotonic для memory / unix для redis),
+    )
 """
 from __future__ import annotations
 
-import time
+import asyncio
+import heapq
+import itertools
+import json
 import logging
+import sys
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Optional
 
+from app.config import settings
+from app.core import metrics
+from app.core.redis import get_redis
+
 logger = logging.getLogger(__name__)
 
 _TTL = 300  # 5 минут
+_SWEEP_INTERVAL = 5  # секунд между проходами sweeper
+_MAX_ENTRIES = 50_000  # защита от всплеска размытых вопросов
+_REDIS_PREFIX = "faqbot:clarify:"
+
+
+# ─── Records ──────────────────────────────────────────────────────────────────
+
+@dataclass(slots=True, frozen=True)
+class ClarifyOption:
+    index: int
+    title: str
+    faq_id: Optional[int]
+
+
+@dataclass(slots=True)
+class PendingClarify:
+    options: tuple[ClarifyOption, ...]
+    language: str
+    original_query: str
+    expires_at: float
+
+    def approx_size(self) -> int:
+        size = sys.getsizeof(self) + sys.getsizeof(self.original_query)
+        for opt in self.options:
+            size += sys.getsizeof(opt) + sys.getsizeof(opt.title)
+        return size
+
+
+# ─── Backends ─────────────────────────────────────────────────────────────────
+
+class ClarifyStateBackend(ABC):
+    @abstractmethod
+    async def set(self, user_id: str, state: PendingClarify) -> None: ...
+
+    @abstractmethod
+    async def get(self, user_id: str) -> Optional[PendingClarify]: ...
+
+    @abstractmethod
+    async def delete(self, user_id: str) -> bool: ...
+
+    @abstractmethod
+    def stats(self) -> dict: ...
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    async def start(self) -> None:
+        """Запуск фоновых задач backend (если нужны)."""
+
+    async def stop(self) -> None:
+        """Остановка фоновых задач backend."""
+
+
+class MemoryClarifyBackend(ClarifyStateBackend):
+    """
+    dict user_id → PendingClarify + min-heap (expires_at, seq, user_id).
+
+    Heap-записи не удаляются при перезаписи/clear — они «протухают» и
+    пропускаются при вытеснении (lazy deletion). Когда мусора становится
+    больше живых записей, heap перестраивается за O(n).
+    """
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._store: dict[str, PendingClarify] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._bytes = 0
+        self._expired_total = 0
+        self._evicted_total = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def set(self, user_id: str, state: PendingClarify) -> None:
+        self._drop(user_id)
+        if len(self._store) >= self.max_entries:
+            self._evict_earliest()
+        self._store[user_id] = state
+        self._bytes += state.approx_size()
+        heapq.heappush(self._heap, (state.expires_at, next(self._seq), user_id))
+
+    async def get(self, user_id: str) -> Optional[PendingClarify]:
+        state = self._store.get(user_id)
+        if state is None:
+            return None
+        if state.expires_at <= self.now():
+            self._drop(user_id)
+            self._expired_total += 1
+            return None
+        return state
+
+    async def delete(self, user_id: str) -> bool:
+        return self._drop(user_id)
+
+    def _drop(self, user_id: str) -> bool:
+        state = self._store.pop(user_id, None)
+        if state is None:
+            return False
+        self._bytes -= state.approx_size()
+        return True
 
-# user_id (str) → state dict
-_store: dict[str, dict] = {}
+    def _is_live(self, expires_at: float, user_id: str) -> bool:
+        state = self._store.get(user_id)
+        return state is not None and state.expires_at == expires_at
+
+    def _evict_earliest(self) -> None:
+        while self._heap:
+            expires_at, _, user_id = heapq.heappop(self._heap)
+            if self._is_live(expires_at, user_id):
+                self._drop(user_id)
+                self._evicted_total += 1
+                return
+
+    def sweep(self) -> int:
+        """Вытеснить все истёкшие записи. O(k log n) для k истёкших."""
+        now = self.now()
+        removed = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, _, user_id = heapq.heappop(self._heap)
+            if self._is_live(expires_at, user_id):
+                self._drop(user_id)
+                removed += 1
+
+        if len(self._heap) > 2 * len(self._store) + 1024:
+            self._heap = [
+                (state.expires_at, next(self._seq), user_id)
+                for user_id, state in self._store.items()
+            ]
+            heapq.heapify(self._heap)
+
+        self._expired_total += removed
+        return removed
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(_SWEEP_INTERVAL)
+            removed = self.sweep()
+            if removed:
+                logger.info(f"[ClarifyState] SWEEP expired={removed} size={len(self._store)}")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "size": len(self._store),
+            "heap_size": len(self._heap),
+            "approx_bytes": self._bytes,
+            "expired_total": self._expired_total,
+            "evicted_total": self._evicted_total,
+        }
+
+
+class RedisClarifyBackend(ClarifyStateBackend):
+    """Ключ на пользователя, истечение — средствами Redis (EX)."""
+
+    def __init__(self, prefix: str = _REDIS_PREFIX):
+        self.prefix = prefix
+
+    def now(self) -> float:
+        return time.time()
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.prefix}{user_id}"
+
+    async def set(self, user_id: str, state: PendingClarify) -> None:
+        payload = json.dumps(
+            {
+                "o": [[opt.index, opt.title, opt.faq_id] for opt in state.options],
+                "l": state.language,
+                "q": state.original_query,
+                "e": state.expires_at,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        ttl = max(1, int(state.expires_at - self.now()))
+        await get_redis().set(self._key(user_id), payload, ex=ttl)
+
+    async def get(self, user_id: str) -> Optional[PendingClarify]:
+        raw = await get_redis().get(self._key(user_id))
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return PendingClarify(
+            options=tuple(ClarifyOption(*opt) for opt in data["o"]),
+            language=data["l"],
+            original_query=data["q"],
+            expires_at=data["e"],
+        )
+
+    async def delete(self, user_id: str) -> bool:
+        return bool(await get_redis().delete(self._key(user_id)))
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "prefix": self.prefix}
+
+
+def _create_backend() -> ClarifyStateBackend:
+    if settings.CLARIFY_STORAGE == "redis":
+        return RedisClarifyBackend()
+    return MemoryClarifyBackend()
+
+
+_backend: ClarifyStateBackend = _create_backend()
+metrics.register_gauge("clarify_state", lambda: _backend.stats())
 
 
 # ─── Public API ───────────────────────────────────────────────────────────────
 
-def set_pending(
+async def start() -> None:
+    await _backend.start()
+
+
+async def stop() -> None:
+    await _backend.stop()
+
+
+async def set_pending(
     user_id: str,
-    options: list[dict],   # [{"index":1, "title":"...", "faq_id":123}, ...]
+    options: list[ClarifyOption],
     language: str,
     original_query: str,
 ) -> None:
     """Сохранить pending clarify state."""
-    _store[user_id] = {
-        "options": options[:4],  # строго не больше 4
-        "language": language,
-        "original_query": original_query,
-        "created_at": time.time(),
-    }
+    state = PendingClarify(
+        options=tuple(options[:4]),  # строго не больше 4
+        language=language,
+        original_query=original_query,
+        expires_at=_backend.now() + _TTL,
+    )
+    await _backend.set(user_id, state)
+    metrics.inc("clarify_set")
     logger.info(
         f"[ClarifyState] SET user={user_id} lang={language} "
-        f"options={len(options[:4])} query='{original_query[:40]}'"
+        f"options={len(state.options)} query='{original_query[:40]}'"
     )
 
 
-def get_pending(user_id: str) -> Optional[dict]:
+async def get_pending(user_id: str) -> Optional[PendingClarify]:
     """Получить pending state если не истёк TTL."""
-    state = _store.get(user_id)
-    if state is None:
-        return None
-    if time.time() - state["created_at"] > _TTL:
-        clear(user_id)
-        logger.info(f"[ClarifyState] EXPIRED user={user_id}")
-        return None
-    return state
+    return await _backend.get(user_id)
 
 
-def clear(user_id: str) -> None:
+async def clear(user_id: str) -> None:
     """Сбросить pending state."""
-    if user_id in _store:
-        del _store[user_id]
+    if await _backend.delete(user_id):
         logger.info(f"[ClarifyState] CLEAR user={user_id}")
 
 
-def resolve_choice(user_id: str, text: str) -> Optional[dict]:
+async def resolve_choice(user_id: str, text: str) -> Optional[ClarifyOption]:
     """
     Попробовать распознать выбор пользователя из pending state.
 
@@ -79,14 +305,17 @@ def resolve_choice(user_id: str, text: str) -> Optional[dict]:
       - "1️⃣", "2️⃣" и т.д. (эмодзи-цифра)
       - текст, совпадающий с одним из title (точно или нечётко)
 
-    Возвращает выбранный option dict или None.
+    Возвращает выбранный ClarifyOption или None.
     """
-    state = get_pending(user_id)
+    state = await get_pending(user_id)
     if state is None:
         return None
+    return match_choice(state, text)
+
 
+def match_choice(state: PendingClarify, text: str) -> Optional[ClarifyOption]:
     stripped = text.strip()
-    options = state["options"]
+    options = state.options
 
     # 1. Цифра 1-4
     digit_map = {"1": 0, "2": 1, "3": 2, "4": 3,
@@ -100,18 +329,18 @@ def resolve_choice(user_id: str, text: str) -> Optional[dict]:
     # 2. Точное совпадение с title (пользователь скопировал)
     lower = stripped.lower()
     for opt in options:
-        if opt["title"].lower() == lower:
+        if opt.title.lower() == lower:
             logger.info(f"[ClarifyState] RESOLVED by exact title match")
             return opt
 
     # 3. Частичное совпадение (пользователь написал похожее)
+    user_words = set(lower.split())
     for opt in options:
-        opt_words = set(opt["title"].lower().split())
-        user_words = set(lower.split())
+        opt_words = set(opt.title.lower().split())
         if len(opt_words) > 0:
             overlap = len(opt_words & user_words) / len(opt_words)
             if overlap >= 0.7:
                 logger.info(f"[ClarifyState] RESOLVED by fuzzy match overlap={overlap:.2f}")
                 return opt
 
-    return None
\ No newline at end of file
+    return None
@@ -0,0 +1,259 @@
+# bot/app/services/curator_digest.py
+"""
+Дайджест неотвеченных вопросов для куратора.
+
+Handler только ставит вопрос в очередь (enqueue) — без обращения к
+Telegram. Фоновая задача раз в CURATOR_DIGEST_INTERVAL в рабочие часы
+забирает очередь, группирует похожие вопросы (Jaccard по словам) и
+отправляет куратору один дайджест. Вне рабочих часов вопросы
+копятся до следующего дайджеста.
+
+Очередь — CURATOR_QUEUE_STORAGE:
+    memory — список в процессе (теряется при рестарте);
+    redis  — список, общий для всех воркеров, переживает рестарт.
+Читает очередь только один процесс (worker 0), поэтому
+peek → отправка → ack безопасны без блокировок. Очередь ограничена
+_QUEUE_MAX_LENGTH — при переполнении теряются самые старые вопросы.
+Без CURATOR_TELEGRAM_ID вопросы не ставятся в очередь вовсе.
+"""
+from __future__ import annotations
+
+import asyncio
+import html
+import json
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+
+from app.config import settings
+from app.core import metrics
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+_REDIS_KEY = "faqbot:curator:queue"
+_BATCH_SIZE = 500  # вопросов за один дайджест
+_MESSAGE_LIMIT = 4000  # лимит Telegram 4096 с запасом
+_QUEUE_MAX_LENGTH = 5000
+_QUESTION_LIMIT = 300  # символов вопроса-«лидера» группы
+_FOLLOWUP_LIMIT = 200
+_SHOWN_MEMBERS = 10
+_SIMILARITY = 0.5
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(slots=True)
+class UnansweredQuestion:
+    user_id: int
+    full_name: str
+    username: str | None
+    question: str
+    language: str
+    asked_at: float
+
+
+# ─── Queue backends ───────────────────────────────────────────────────────────
+
+class CuratorQueue(ABC):
+    @abstractmethod
+    async def push(self, item: UnansweredQuestion) -> None: ...
+
+    @abstractmethod
+    async def peek(self, limit: int) -> list[UnansweredQuestion]: ...
+
+    @abstractmethod
+    async def ack(self, count: int) -> None:
+        """Удалить `count` первых элементов после успешной отправки."""
+
+
+class MemoryCuratorQueue(CuratorQueue):
+    def __init__(self):
+        self._items: list[UnansweredQuestion] = []
+
+    async def push(self, item: UnansweredQuestion) -> None:
+        self._items.append(item)
+        if len(self._items) > _QUEUE_MAX_LENGTH:
+            del self._items[:len(self._items) - _QUEUE_MAX_LENGTH]
+
+    async def peek(self, limit: int) -> list[UnansweredQuestion]:
+        return self._items[:limit]
+
+    async def ack(self, count: int) -> None:
+        del self._items[:count]
+
+
+class RedisCuratorQueue(CuratorQueue):
+    def __init__(self, key: str = _REDIS_KEY):
+        self.key = key
+
+    async def push(self, item: UnansweredQuestion) -> None:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.rpush(self.key, json.dumps(asdict(item), ensure_ascii=False))
+            pipe.ltrim(self.key, -_QUEUE_MAX_LENGTH, -1)
+            await pipe.execute()
+
+    async def peek(self, limit: int) -> list[UnansweredQuestion]:
+        raw = await get_redis().lrange(self.key, 0, limit - 1)
+        return [UnansweredQuestion(**json.loads(value)) for value in raw]
+
+    async def ack(self, count: int) -> None:
+        await get_redis().ltrim(self.key, count, -1)
+
+
+def _create_queue() -> CuratorQueue:
+    if settings.CURATOR_QUEUE_STORAGE == "redis":
+        return RedisCuratorQueue()
+    return MemoryCuratorQueue()
+
+
+_queue: CuratorQueue = _create_queue()
+
+
+async def enqueue(user, question: str, language: str) -> None:
+    """Поставить неотвеченный вопрос в очередь дайджеста."""
+    if not settings.CURATOR_TELEGRAM_ID:
+        return
+    item = UnansweredQuestion(
+        user_id=user.id,
+        full_name=user.full_name,
+        username=user.username,
+        question=question,
+        language=language,
+        asked_at=time.time(),
+    )
+    try:
+        await _queue.push(item)
+        metrics.inc("curator_enqueued")
+    except Exception as e:
+        logger.error(f"[Curator] enqueue error: {e}")
+
+
+# ─── Grouping ─────────────────────────────────────────────────────────────────
+
+def _tokens(text: str) -> frozenset[str]:
+    return frozenset(w for w in _WORD_RE.findall(text.lower()) if len(w) > 2)
+
+
+def group_similar(items: list[UnansweredQuestion]) -> list[list[UnansweredQuestion]]:
+    """
+    Жадная кластеризация: вопрос попадает в первую группу, с «лидером»
+    которой Jaccard по словам >= _SIMILARITY. Группы — по убыванию размера.
+    """
+    groups: list[tuple[frozenset[str], list[UnansweredQuestion]]] = []
+    for item in items:
+        tokens = _tokens(item.question)
+        for leader, members in groups:
+            union = leader | tokens
+            if union and len(leader & tokens) / len(union) >= _SIMILARITY:
+                members.append(item)
+                break
+        else:
+            groups.append((tokens, [item]))
+    return sorted((members for _, members in groups), key=len, reverse=True)
+
+
+def _shorten(text: str, limit: int) -> str:
+    """Обрезать сырой текст (до html.escape — готовый HTML не режем)."""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _format_group(members: list[UnansweredQuestion], shown: int = _SHOWN_MEMBERS) -> str:
+    first = members[0]
+    lines = [f"📝 <b>{html.escape(_shorten(first.question, _QUESTION_LIMIT))}</b>"]
+    if len(members) > 1:
+        lines[0] += f"  ×{len(members)}"
+    for item in members[:shown]:
+        who = html.escape(item.full_name)
+        if item.username:
+            who += f" (@{html.escape(item.username)})"
+        asked = datetime.fromtimestamp(item.asked_at).strftime("%d.%m %H:%M")
+        line = f"   👤 {who} 🆔 {item.user_id} ⏰ {asked}"
+        if item is not first:
+            line += f"\n      «{html.escape(_shorten(item.question, _FOLLOWUP_LIMIT))}»"
+        lines.append(line)
+    if len(members) > shown:
+        lines.append(f"   … и ещё {len(members) - shown}")
+    return "\n".join(lines)
+
+
+def build_digest(items: list[UnansweredQuestion]) -> list[str]:
+    """Текст дайджеста, разбитый на сообщения не длиннее _MESSAGE_LIMIT."""
+    groups = group_similar(items)
+    header = f"🆘 НЕОТВЕЧЕННЫЕ ВОПРОСЫ: {len(items)} (групп: {len(groups)})"
+    messages: list[str] = []
+    current = header
+    for members in groups:
+        # Не влезает (html.escape раздувает &, <, >) — показываем меньше участников
+        shown = _SHOWN_MEMBERS
+        block = _format_group(members, shown)
+        while len(block) > _MESSAGE_LIMIT and shown > 1:
+            shown -= 1
+            block = _format_group(members, shown)
+        if len(current) + len(block) + 2 > _MESSAGE_LIMIT:
+            messages.append(current)
+            current = block
+        else:
+            current += "\n\n" + block
+    messages.append(current)
+    return messages
+
+
+# ─── Sending ──────────────────────────────────────────────────────────────────
+
+def _is_working_hours() -> bool:
+    return settings.CURATOR_WORK_START <= datetime.now().hour < settings.CURATOR_WORK_END
+
+
+# Собранный, но не до конца отправленный дайджест. После сетевой ошибки
+# следующий проход досылает оставшиеся сообщения, а не весь дайджест заново.
+_outbox: list[str] = []
+_outbox_items = 0
+
+
+async def send_digest(bot: Bot) -> int:
+    """Отправить накопленные вопросы. Возвращает число отправленных."""
+    global _outbox_items
+    if not _outbox:
+        items = await _queue.peek(_BATCH_SIZE)
+        if not items:
+            return 0
+        _outbox.extend(build_digest(items))
+        _outbox_items = len(items)
+
+    while _outbox:
+        try:
+            await bot.send_message(chat_id=settings.CURATOR_TELEGRAM_ID, text=_outbox[0])
+        except TelegramBadRequest as e:
+            # Повтор не поможет — сообщение отбрасываем, иначе дайджест встанет навсегда
+            logger.error(f"[Curator] digest message rejected, dropped: {e}")
+            metrics.inc("curator_digest_dropped")
+        _outbox.pop(0)
+
+    count, _outbox_items = _outbox_items, 0
+    await _queue.ack(count)
+
+    metrics.inc("curator_digests_sent")
+    logger.info(f"[Curator] digest sent: {count} questions")
+    return count
+
+
+async def run_digest_loop(bot: Bot, interval: int) -> None:
+    if not settings.CURATOR_TELEGRAM_ID:
+        logger.warning("[Curator] CURATOR_TELEGRAM_ID is not set — digests disabled")
+        return
+    while True:
+        await asyncio.sleep(interval)
+        if not _is_working_hours():
+            continue
+        try:
+            # Очередь может быть длиннее одного дайджеста — досылаем
+            while await send_digest(bot) == _BATCH_SIZE:
+                pass
+        except Exception as e:
+            logger.error(f"[Curator] digest failed: {e}", exc_info=True)
@@ -0,0 +1,104 @@
+# bot/app/services/dispatch.py
+"""
+Порядок и ограничение нагрузки при обработке апдейтов.
+
+1. Апдейты одного пользователя выполняются строго по очереди
+   (FIFO asyncio.Lock на user_id), разные пользователи — параллельно.
+   Lock удаляется, когда у пользователя не осталось апдейтов в работе.
+2. Очередь ограничена: не больше DISPATCH_MAX_PENDING апдейтов в процессе
+   и DISPATCH_MAX_PER_USER на пользователя — лишнее отклоняется сразу,
+   а не копится за медленным API.
+3. Одновременных запросов к API не больше API_MAX_CONCURRENCY; если слот
+   не освободился за API_QUEUE_TIMEOUT — запрос отменяется (ApiSaturated).
+
+Лимиты действуют на процесс: при BOT_WORKERS > 1 суммарный предел
+к API — API_MAX_CONCURRENCY × BOT_WORKERS.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from app.config import settings
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ApiSaturated(Exception):
+    """Не дождались свободного слота к API."""
+
+
+@dataclass(slots=True)
+class _UserQueue:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    pending: int = 0
+
+
+class UserDispatcher:
+    def __init__(self, max_pending: int, max_per_user: int):
+        self.max_pending = max_pending
+        self.max_per_user = max_per_user
+        self._queues: dict[str, _UserQueue] = {}
+        self._pending = 0
+
+    def admit(self, user_id: str) -> bool:
+        """Поставить апдейт в очередь пользователя. False — очередь полна."""
+        if self._pending >= self.max_pending:
+            metrics.inc("dispatch_shed_global")
+            return False
+        queue = self._queues.get(user_id)
+        if queue is not None and queue.pending >= self.max_per_user:
+            metrics.inc("dispatch_shed_user")
+            return False
+        if queue is None:
+            queue = self._queues[user_id] = _UserQueue()
+        queue.pending += 1
+        self._pending += 1
+        metrics.inc("dispatch_admitted")
+        return True
+
+    @asynccontextmanager
+    async def ordered(self, user_id: str) -> AsyncIterator[None]:
+        """Выполнить блок после предыдущих апдейтов этого пользователя (после admit)."""
+        queue = self._queues[user_id]
+        try:
+            async with queue.lock:
+                yield
+        finally:
+            queue.pending -= 1
+            self._pending -= 1
+            if queue.pending == 0:
+                del self._queues[user_id]
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._pending,
+            "users": len(self._queues),
+            "api_in_flight": settings.API_MAX_CONCURRENCY - _api_semaphore._value,
+        }
+
+
+user_dispatcher = UserDispatcher(
+    max_pending=settings.DISPATCH_MAX_PENDING,
+    max_per_user=settings.DISPATCH_MAX_PER_USER,
+)
+_api_semaphore = asyncio.Semaphore(settings.API_MAX_CONCURRENCY)
+metrics.register_gauge("dispatch", user_dispatcher.stats)
+
+
+@asynccontextmanager
+async def api_slot() -> AsyncIterator[None]:
+    """Слот для запроса к API; ApiSaturated если API перегружен."""
+    try:
+        await asyncio.wait_for(_api_semaphore.acquire(), timeout=settings.API_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        metrics.inc("dispatch_api_saturated")
+        raise ApiSaturated()
+    try:
+        yield
+    finally:
+        _api_semaphore.release()
@@ -0,0 +1,153 @@
+# bot/app/services/language_detector.py
+"""
+Локальное определение языка kk/ru без LLM.
+
+Копия — api/app/ai/language_detector.py (держать одинаковыми).
+
+Признаки складываются в один балл (kk > 0, ru < 0):
+- буквы казахского алфавита (ә і ң ғ ү ұ қ ө һ) и ё/ъ;
+- словари служебных и частых слов, в т.ч. казахские слова,
+  набранные обычной кириллицей (калай, кандай, жок);
+- окончания — обратный префиксный автомат (trie по перевёрнутым
+  суффиксам), для слова берётся самое длинное совпадение;
+- небольшая таблица характерных триграмм.
+Уверенность — сигмоида от модуля балла: 0.5 — признаков нет.
+Всё компилируется при импорте, detect() — один проход по словам.
+"""
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Literal, Optional, Tuple
+
+Language = Literal["kk", "ru"]
+
+# Уверенность, начиная с которой ответ детектора не перепроверяется LLM
+CONFIDENT = 0.9
+
+_KK_LETTERS = frozenset("әіңғүұқөһ")
+_RU_LETTERS = frozenset("ёъ")
+
+_KK_WORDS = {
+    "деген", "туралы", "керек", "болады", "айтшы", "жасау",
+    "алу", "беру", "ашу", "сату", "және", "немесе", "қалай",
+    "калай", "кандай", "қандай", "кайда", "қайда", "жок", "жоқ",
+    "бул", "бұл", "осы", "мына", "аламын", "беремін", "аласын",
+    "бересін", "үшін", "ушин", "мен", "сен", "ол", "біз", "сіз",
+    "сәлем", "салем", "рахмет", "иә", "ия", "шот", "ақша", "акша",
+}
+_RU_WORDS = {
+    "как", "что", "это", "для", "или", "где", "когда", "нет", "да",
+    "можно", "хочу", "привет", "здравствуй", "здравствуйте", "добрый",
+    "спасибо", "почему", "зачем", "сколько", "какой", "какие", "мне",
+    "меня", "если", "нужно", "надо", "есть", "не", "на", "по", "от",
+    "за", "в", "с", "со", "и", "из", "при", "про", "к", "у", "без",
+    "счет", "счёт", "деньги", "открыть", "вывести", "пополнить",
+}
+
+# (суффикс, вес): казахские падежи/лица/множественное число (+),
+# русские флексии (−)
+_SUFFIXES: Tuple[Tuple[str, float], ...] = (
+    ("да", 0.6), ("де", 0.6), ("та", 0.4), ("те", 0.4),
+    ("дан", 1.0), ("ден", 1.0), ("тан", 1.0), ("тен", 1.0), ("нан", 1.0), ("нен", 1.0),
+    ("ға", 1.5), ("ге", 0.6), ("қа", 1.5), ("ке", 0.6),
+    ("ды", 0.8), ("ді", 1.5), ("ты", 0.6), ("ті", 1.5),
+    ("мын", 1.2), ("мін", 1.5), ("пын", 1.2), ("пін", 1.5),
+    ("лар", 1.0), ("лер", 1.0), ("дар", 1.0), ("дер", 0.6), ("тар", 0.6), ("тер", 0.4),
+    ("дың", 1.5), ("нің", 1.5), ("тың", 1.5), ("ның", 1.5),
+    ("ать", -1.2), ("ить", -1.2), ("еть", -1.2), ("ться", -1.5), ("тся", -1.5),
+    ("ого", -1.2), ("его", -1.0), ("ому", -1.2), ("ему", -1.0),
+    ("ами", -1.0), ("ями", -1.2), ("ах", -0.6), ("ях", -0.8),
+    ("ый", -1.0), ("ий", -0.8), ("ая", -0.8), ("ое", -0.8), ("ые", -1.0),
+    ("ешь", -1.2), ("ете", -1.0), ("ение", -1.5), ("ости", -1.2), ("ство", -1.2),
+)
+
+# Характерные триграммы внутри слов
+_TRIGRAMS: Dict[str, float] = {
+    "ған": 1.0, "ген": 0.5, "қан": 1.0, "қал": 0.8, "жас": 0.5, "жат": 0.6,
+    "ады": 0.5, "еді": 0.8, "ыны": 0.6, "іні": 0.8, "ынд": 0.6, "інд": 0.6,
+    "ост": -0.6, "ств": -1.0, "ени": -0.6, "ать": -0.6, "что": -1.0, "ого": -0.5,
+    "ват": -0.5, "ова": -0.4, "тел": -0.3, "енн": -0.6, "ющи": -1.0,
+}
+
+_WORD_WEIGHT = 1.5
+_KK_LETTER_WEIGHT = 2.5
+_RU_LETTER_WEIGHT = 2.0
+_MIN_STEM = 2  # окончание засчитывается, если до него остаётся хотя бы 3 буквы
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+class _SuffixAutomaton:
+    """Trie по перевёрнутым суффиксам: самое длинное окончание слова за O(длины)."""
+
+    def __init__(self, suffixes: Iterable[Tuple[str, float]]):
+        self._root: dict = {}
+        for suffix, weight in suffixes:
+            node = self._root
+            for ch in reversed(suffix):
+                node = node.setdefault(ch, {})
+            node[None] = (len(suffix), weight)
+
+    def longest(self, word: str) -> Optional[Tuple[int, float]]:
+        node = self._root
+        best = None
+        for ch in reversed(word):
+            node = node.get(ch)
+            if node is None:
+                break
+            if None in node:
+                best = node[None]
+        return best
+
+
+_suffix_automaton = _SuffixAutomaton(_SUFFIXES)
+
+
+@dataclass(frozen=True)
+class LanguageGuess:
+    language: Language
+    confidence: float
+
+
+class LanguageDetector:
+
+    def __init__(self, default: Language = "kk"):
+        self.default = default
+
+    def score(self, text: str) -> float:
+        """Балл: > 0 — казахский, < 0 — русский."""
+        lower = text.lower()
+        score = 0.0
+
+        kk_letters = sum(1 for c in lower if c in _KK_LETTERS)
+        ru_letters = sum(1 for c in lower if c in _RU_LETTERS)
+        score += _KK_LETTER_WEIGHT * min(kk_letters, 3)
+        score -= _RU_LETTER_WEIGHT * min(ru_letters, 2)
+
+        for word in _WORD_RE.findall(lower):
+            if word in _KK_WORDS:
+                score += _WORD_WEIGHT
+            elif word in _RU_WORDS:
+                score -= _WORD_WEIGHT
+            else:
+                match = _suffix_automaton.longest(word)
+                if match is not None and len(word) > match[0] + _MIN_STEM:
+                    score += match[1]
+
+            for i in range(len(word) - 2):
+                score += _TRIGRAMS.get(word[i:i + 3], 0.0)
+
+        return score
+
+    def detect_with_confidence(self, text: str) -> LanguageGuess:
+        score = self.score(text)
+        if score == 0.0:
+            return LanguageGuess(self.default, 0.5)
+        language: Language = "kk" if score > 0 else "ru"
+        return LanguageGuess(language, 1.0 / (1.0 + math.exp(-abs(score))))
+
+    def detect(self, text: str) -> Language:
+        return self.detect_with_confidence(text).language
+
+
+language_detector = LanguageDetector()
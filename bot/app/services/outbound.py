@@ -0,0 +1,135 @@
+# bot/app/services/outbound.py
+"""
+Планировщик исходящих запросов к Bot API.
+
+Request-middleware на bot.session: каждый метод с chat_id получает слот
+в двух расписаниях — глобальном (OUTBOUND_GLOBAL_RATE в секунду) и
+чата (OUTBOUND_CHAT_RATE для личных, OUTBOUND_GROUP_RATE для групп).
+Расписание — GCRA (virtual scheduling): запрос резервирует момент
+отправки и ждёт его, поэтому очередь справедливая (FIFO) и не
+превышает лимиты Telegram даже при рассылке.
+
+На 429 TelegramRetryAfter чат блокируется на retry_after секунд
+(все последующие слоты сдвигаются), запрос повторяется — кроме
+методов с одноразовым InputFile (поток, уже вычитанный первой
+попыткой): такие пробрасывают ошибку, повтор делает вызывающий код
+с новым файлом (video_service.send_video).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import BufferedInputFile, FSInputFile, InputFile, URLInputFile
+
+from app.config import settings
+from app.core import metrics
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+_MAX_SCHEDULES = 10_000
+# InputFile, которые можно прочитать повторно; остальные считаем одноразовыми
+_REPLAYABLE_FILES = (BufferedInputFile, FSInputFile, URLInputFile)
+
+
+def _has_one_shot_file(method: TelegramMethod) -> bool:
+    for name in type(method).model_fields:
+        value = getattr(method, name, None)
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            # InputMedia* в send_media_group хранит файл в поле media
+            item = getattr(item, "media", item)
+            if isinstance(item, InputFile) and not isinstance(item, _REPLAYABLE_FILES):
+                return True
+    return False
+
+
+class GcraSchedule:
+    """
+    Generic Cell Rate Algorithm: `rate` запросов в секунду,
+    до `burst` подряд без ожидания.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1.0 / rate
+        self.tolerance = self.interval * (max(1, burst) - 1)
+        self._tat: dict[object, float] = {}  # key → theoretical arrival time
+
+    def reserve(self, key: object, at: float) -> float:
+        """Зарезервировать слот не раньше `at`. Возвращает момент отправки."""
+        tat = max(self._tat.get(key, at), at)
+        start = max(at, tat - self.tolerance)
+        self._tat[key] = tat + self.interval
+        if len(self._tat) > _MAX_SCHEDULES:
+            self._prune(at)
+        return start
+
+    def block(self, key: object, until: float) -> None:
+        """Не выдавать слоты раньше `until` (retry_after от Telegram)."""
+        self._tat[key] = max(self._tat.get(key, until), until + self.tolerance)
+
+    def _prune(self, now: float) -> None:
+        self._tat = {key: tat for key, tat in self._tat.items() if tat > now}
+
+
+class OutboundPacer(BaseRequestMiddleware):
+    def __init__(self):
+        self.global_schedule = GcraSchedule(
+            settings.OUTBOUND_GLOBAL_RATE, burst=int(settings.OUTBOUND_GLOBAL_RATE)
+        )
+        self.chat_schedule = GcraSchedule(settings.OUTBOUND_CHAT_RATE, settings.OUTBOUND_CHAT_BURST)
+        self.group_schedule = GcraSchedule(settings.OUTBOUND_GROUP_RATE, settings.OUTBOUND_CHAT_BURST)
+
+    def _chat_schedule(self, chat_id: int | str) -> GcraSchedule:
+        # Отрицательные id и @username — группы и каналы
+        if isinstance(chat_id, int) and chat_id > 0:
+            return self.chat_schedule
+        return self.group_schedule
+
+    async def _wait_slot(self, chat_id: int | str) -> None:
+        now = time.monotonic()
+        start = self._chat_schedule(chat_id).reserve(chat_id, now)
+        start = self.global_schedule.reserve(None, start)
+        delay = start - now
+        if delay > 0:
+            metrics.inc("outbound_delayed")
+            await asyncio.sleep(delay)
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        attempt = 0
+        while True:
+            await self._wait_slot(chat_id)
+            metrics.inc("outbound_requests")
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                metrics.inc("outbound_retry_after")
+                self._chat_schedule(chat_id).block(chat_id, time.monotonic() + e.retry_after)
+                attempt += 1
+                logger.warning(
+                    f"[Outbound] {type(method).__name__} chat={chat_id} "
+                    f"retry_after={e.retry_after}s attempt={attempt}"
+                )
+                if attempt > settings.OUTBOUND_MAX_RETRIES or _has_one_shot_file(method):
+                    raise
@@ -0,0 +1,115 @@
+# bot/app/services/video_cache.py
+"""
+Кеш Telegram file_id для видео из Directus.
+
+Первая отправка видео загружает файл в Telegram, дальше
+тот же ролик отправляется по file_id — без скачивания и повторной загрузки.
+
+Ключ — UUID файла в Directus (последний сегмент /assets/<uuid>).
+Хранение: таблица telegram_video_cache + in-process dict для горячего пути.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+
+from app.core.database import get_session_maker
+from app.models.database import TelegramVideoCache
+
+logger = logging.getLogger(__name__)
+
+_UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}",
+    re.IGNORECASE,
+)
+
+
+def video_key_from_url(video_url: str) -> Optional[str]:
+    """
+    Извлечь UUID Directus из URL вида .../assets/<uuid>?...
+    Возвращает None если URL не указывает на Directus asset.
+    """
+    path = video_url.split("?", 1)[0].rstrip("/")
+    last = path.rsplit("/", 1)[-1]
+    match = _UUID_RE.fullmatch(last)
+    return match.group(0).lower() if match else None
+
+
+class VideoFileCache:
+    """Directus UUID → Telegram file_id (Postgres + локальный dict)."""
+
+    def __init__(self):
+        self._local: dict[str, str] = {}
+
+    async def get(self, video_key: str) -> Optional[str]:
+        file_id = self._local.get(video_key)
+        if file_id is not None:
+            return file_id
+
+        try:
+            session_maker = get_session_maker()
+            async with session_maker() as session:
+                result = await session.execute(
+                    select(TelegramVideoCache.file_id)
+                    .where(TelegramVideoCache.video_uuid == video_key)
+                )
+                file_id = result.scalar_one_or_none()
+        except Exception as e:
+            logger.error(f"[VideoCache] get error: {e}")
+            return None
+
+        if file_id:
+            self._local[video_key] = file_id
+        return file_id
+
+    async def set(
+        self,
+        video_key: str,
+        file_id: str,
+        file_unique_id: Optional[str] = None,
+    ) -> None:
+        self._local[video_key] = file_id
+        try:
+            session_maker = get_session_maker()
+            async with session_maker() as session:
+                stmt = insert(TelegramVideoCache).values(
+                    video_uuid=video_key,
+                    file_id=file_id,
+                    file_unique_id=file_unique_id,
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[TelegramVideoCache.video_uuid],
+                    set_={
+                        "file_id": stmt.excluded.file_id,
+                        "file_unique_id": stmt.excluded.file_unique_id,
+                        "updated_at": func.now(),
+                    },
+                )
+                await session.execute(stmt)
+                await session.commit()
+            logger.info(f"[VideoCache] SET video={video_key}")
+        except Exception as e:
+            logger.error(f"[VideoCache] set error: {e}")
+
+    async def invalidate(self, video_key: str) -> None:
+        """Удалить устаревший file_id (Telegram его больше не принимает)."""
+        self._local.pop(video_key, None)
+        try:
+            session_maker = get_session_maker()
+            async with session_maker() as session:
+                await session.execute(
+                    delete(TelegramVideoCache)
+                    .where(TelegramVideoCache.video_uuid == video_key)
+                )
+                await session.commit()
+            logger.info(f"[VideoCache] INVALIDATE video={video_key}")
+        except Exception as e:
+            logger.error(f"[VideoCache] invalidate error: {e}")
+
+
+video_cache = VideoFileCache()
@@ -1,11 +1,21 @@
+import asyncio
 import aiohttp
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
+
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.types import InlineKeyboardMarkup, InputFile, Message
 
 from app.config import settings
+from app.services.video_cache import video_cache, video_key_from_url
+
+if TYPE_CHECKING:
+    from aiogram import Bot
 
 logger = logging.getLogger(__name__)
 
+_STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class VideoService:
     """
@@ -31,4 +41,130 @@ class VideoService:
                         return None
         except Exception as e:
             logger.error(f"Error downloading video {video_filename}: {e}")
-            return None
\ No newline at end of file
+            return None
+
+
+class StreamedVideoFile(InputFile):
+    """
+    InputFile поверх уже открытого ответа Directus.
+
+    Тело читается чанками прямо в multipart-загрузку Telegram,
+    поэтому в памяти бота одновременно лежит не больше одного чанка.
+    """
+
+    def __init__(
+        self,
+        response: aiohttp.ClientResponse,
+        filename: str,
+        max_bytes: int,
+        chunk_size: int = _STREAM_CHUNK_SIZE,
+    ):
+        super().__init__(filename=filename, chunk_size=chunk_size)
+        self.response = response
+        self.max_bytes = max_bytes
+
+    async def read(self, bot: "Bot") -> AsyncGenerator[bytes, None]:
+        received = 0
+        async for chunk in self.response.content.iter_chunked(self.chunk_size):
+            received += len(chunk)
+            # Content-Length может отсутствовать (chunked) — страхуемся на лету
+            if received > self.max_bytes:
+                raise ValueError(f"Video stream exceeded {self.max_bytes} bytes")
+            yield chunk
+
+
+def video_filename(video_url: str) -> str:
+    filename = video_url.split("/")[-1].split("?")[0]
+    if not filename.endswith((".mp4", ".mov", ".avi", ".webm")):
+        filename += ".mp4"
+    return filename
+
+
+async def send_video(
+    message: Message,
+    video_url: str,
+    caption: str,
+    reply_markup: Optional[InlineKeyboardMarkup] = None,
+) -> bool:
+    """
+    Отправить видео ответом на message.
+
+    1. Если для UUID видео есть сохранённый file_id — отправляем по нему (0 байт трафика).
+    2. Telegram отклонил file_id — сбрасываем кеш и загружаем файл заново.
+    3. Загрузка идёт потоком из ответа Directus, размер проверяется
+       по Content-Length до начала передачи. Поток одноразовый: на 429
+       OutboundPacer не повторяет запрос — ждём retry_after и скачиваем заново.
+    4. После загрузки запоминаем file_id из ответа Telegram.
+
+    Возвращает True если видео отправлено.
+    """
+    video_key = video_key_from_url(video_url)
+
+    if video_key:
+        file_id = await video_cache.get(video_key)
+        if file_id:
+            try:
+                await message.answer_video(
+                    video=file_id,
+                    caption=caption,
+                    reply_markup=reply_markup,
+                    supports_streaming=True,
+                )
+                logger.info(f"[VIDEO] sent by file_id video={video_key}")
+                return True
+            except TelegramBadRequest as e:
+                logger.warning(f"[VIDEO] stale file_id video={video_key}: {e}")
+                await video_cache.invalidate(video_key)
+
+    attempt = 0
+    while True:
+        try:
+            sent = await _upload_video(message, video_url, caption, reply_markup)
+            break
+        except TelegramRetryAfter as e:
+            attempt += 1
+            if attempt > settings.OUTBOUND_MAX_RETRIES:
+                logger.error(f"[VIDEO] retry_after limit reached video={video_key}")
+                return False
+            logger.warning(f"[VIDEO] retry_after={e.retry_after}s, re-downloading (attempt={attempt})")
+            await asyncio.sleep(e.retry_after)
+        except Exception as e:
+            logger.error(f"[VIDEO] error: {e}", exc_info=True)
+            return False
+
+    if sent is None:
+        return False
+    if video_key and sent.video:
+        await video_cache.set(video_key, sent.video.file_id, sent.video.file_unique_id)
+    return True
+
+
+async def _upload_video(
+    message: Message,
+    video_url: str,
+    caption: str,
+    reply_markup: Optional[InlineKeyboardMarkup],
+) -> Optional[Message]:
+    """Скачать видео из Directus и загрузить потоком; None — Directus не отдал файл."""
+    timeout = aiohttp.ClientTimeout(total=settings.VIDEO_DOWNLOAD_TIMEOUT, connect=30)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with session.get(video_url) as resp:
+            if resp.status != 200:
+                logger.error(f"[VIDEO] status={resp.status}")
+                return None
+            max_bytes = settings.MAX_VIDEO_SIZE_MB * 1024 * 1024
+            if resp.content_length is not None and resp.content_length > max_bytes:
+                size_mb = resp.content_length / (1024 * 1024)
+                raise ValueError(f"Video {size_mb:.1f}MB > limit")
+            method = message.answer_video(
+                video=StreamedVideoFile(
+                    resp,
+                    filename=video_filename(video_url),
+                    max_bytes=max_bytes,
+                ),
+                caption=caption,
+                reply_markup=reply_markup,
+                supports_streaming=True,
+            )
+            # Загрузка идёт одновременно со скачиванием — таймаут как у скачивания
+            return await message.bot(method, request_timeout=settings.VIDEO_DOWNLOAD_TIMEOUT)
@@ -0,0 +1,145 @@
+# bot/app/services/video_warmup.py
+"""
+Прогрев кеша Telegram file_id.
+
+Проходит по всем faq_content.video и загружает в служебный чат
+(VIDEO_STORAGE_CHAT_ID) каждое видео, для которого ещё нет file_id
+или файл в Directus изменился после последней загрузки.
+Первый пользователь получает видео уже по file_id.
+
+Запуск:
+    python -m app.scripts.warm_video_cache              # один проход
+    python -m app.scripts.warm_video_cache --interval 600
+или VIDEO_WARMUP_INTERVAL > 0 — периодически внутри процесса бота.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+import aiohttp
+from aiogram import Bot
+from sqlalchemy import text
+
+from app.config import settings
+from app.core.database import get_session_maker
+from app.services.video_cache import video_cache
+from app.services.video_service import StreamedVideoFile, video_filename
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class PendingVideo:
+    video_uuid: str
+    filename: str
+
+
+async def find_pending_videos() -> list[PendingVideo]:
+    """
+    Видео без file_id, либо заменённые в Directus после нашей загрузки
+    (directus_files.modified_on > telegram_video_cache.updated_at).
+    """
+    sql = text("""
+        SELECT DISTINCT
+            faq_content.video::text            AS video_uuid,
+            directus_files.filename_download   AS filename
+        FROM faq_content
+        LEFT JOIN directus_files
+               ON directus_files.id = faq_content.video
+        LEFT JOIN telegram_video_cache
+               ON telegram_video_cache.video_uuid = faq_content.video
+        WHERE faq_content.video IS NOT NULL
+          AND (
+              telegram_video_cache.video_uuid IS NULL
+              OR directus_files.modified_on > telegram_video_cache.updated_at
+          )
+    """)
+    session_maker = get_session_maker()
+    async with session_maker() as session:
+        result = await session.execute(sql)
+        return [
+            PendingVideo(video_uuid=row[0], filename=row[1] or row[0])
+            for row in result.fetchall()
+        ]
+
+
+async def _upload_one(
+    bot: Bot,
+    http: aiohttp.ClientSession,
+    video: PendingVideo,
+    semaphore: asyncio.Semaphore,
+) -> bool:
+    url = f"{settings.DIRECTUS_URL.rstrip('/')}/assets/{video.video_uuid}"
+    headers = {}
+    if settings.DIRECTUS_TOKEN:
+        headers["Authorization"] = f"Bearer {settings.DIRECTUS_TOKEN}"
+
+    async with semaphore:
+        try:
+            async with http.get(url, headers=headers) as resp:
+                if resp.status != 200:
+                    logger.error(f"[Warmup] video={video.video_uuid} status={resp.status}")
+                    return False
+                max_bytes = settings.MAX_VIDEO_SIZE_MB * 1024 * 1024
+                if resp.content_length is not None and resp.content_length > max_bytes:
+                    logger.warning(
+                        f"[Warmup] video={video.video_uuid} too large: "
+                        f"{resp.content_length / (1024 * 1024):.1f}MB"
+                    )
+                    return False
+                sent = await bot.send_video(
+                    chat_id=settings.VIDEO_STORAGE_CHAT_ID,
+                    video=StreamedVideoFile(
+                        resp,
+                        filename=video_filename(video.filename),
+                        max_bytes=max_bytes,
+                    ),
+                    caption=video.video_uuid,
+                    supports_streaming=True,
+                    disable_notification=True,
+                    request_timeout=settings.VIDEO_DOWNLOAD_TIMEOUT,
+                )
+        except Exception as e:
+            logger.error(f"[Warmup] video={video.video_uuid} error: {e}")
+            return False
+
+    if not sent.video:
+        return False
+    await video_cache.set(video.video_uuid, sent.video.file_id, sent.video.file_unique_id)
+    return True
+
+
+async def warm_video_cache(bot: Bot) -> int:
+    """Один проход прогрева. Возвращает число загруженных видео."""
+    if not settings.VIDEO_STORAGE_CHAT_ID:
+        logger.warning("[Warmup] VIDEO_STORAGE_CHAT_ID is not set — skipping")
+        return 0
+
+    pending = await find_pending_videos()
+    if not pending:
+        logger.info("[Warmup] all videos already have file_id")
+        return 0
+
+    logger.info(f"[Warmup] uploading {len(pending)} videos")
+    semaphore = asyncio.Semaphore(max(1, settings.VIDEO_WARMUP_CONCURRENCY))
+    timeout = aiohttp.ClientTimeout(total=settings.VIDEO_DOWNLOAD_TIMEOUT, connect=30)
+    async with aiohttp.ClientSession(timeout=timeout) as http:
+        results = await asyncio.gather(
+            *(_upload_one(bot, http, video, semaphore) for video in pending)
+        )
+
+    uploaded = sum(results)
+    logger.info(f"[Warmup] done: {uploaded}/{len(pending)} uploaded")
+    return uploaded
+
+
+async def run_warmup_loop(bot: Bot, interval: int) -> None:
+    """Периодический прогрев — подхватывает новые и заменённые видео."""
+    while True:
+        try:
+            await warm_video_cache(bot)
+        except Exception as e:
+            logger.error(f"[Warmup] pass failed: {e}", exc_info=True)
+        await asyncio.sleep(interval)
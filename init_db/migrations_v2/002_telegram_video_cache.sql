@@ -0,0 +1,17 @@
+-- ============================================
+-- MIGRATION v2.2: Telegram file_id cache
+-- ============================================
+
+-- Directus video UUID → Telegram file_id.
+-- Бот загружает видео в Telegram один раз, дальше отправляет по file_id.
+CREATE TABLE IF NOT EXISTS telegram_video_cache (
+    video_uuid UUID PRIMARY KEY,
+    file_id TEXT NOT NULL,
+    file_unique_id TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+);
+
+COMMENT ON TABLE telegram_video_cache IS 'Кеш Telegram file_id для видео из Directus';
+COMMENT ON COLUMN telegram_video_cache.video_uuid IS 'UUID файла в directus_files (faq_content.video)';
+COMMENT ON COLUMN telegram_video_cache.file_id IS 'file_id, полученный от Telegram после первой загрузки';
@@ -0,0 +1,90 @@
+-- ============================================
+-- MIGRATION v2.3: Partial HNSW indexes per language
+-- ============================================
+-- Один HNSW-индекс на все строки + фильтр language/is_active после
+-- ANN-скана: часть кандидатов отбрасывается, top-k бывает неполным.
+-- Теперь — отдельный индекс на язык только по активным строкам,
+-- по нормализованным векторам с inner product (vector_ip_ops).
+
+-- 1. is_active в faq_content — копия faq_v2.is_active,
+--    чтобы фильтр был в предикате частичного индекса (без join)
+ALTER TABLE faq_content ADD COLUMN IF NOT EXISTS is_active BOOLEAN NOT NULL DEFAULT TRUE;
+
+UPDATE faq_content
+SET is_active = COALESCE(faq_v2.is_active, TRUE)
+FROM faq_v2
+WHERE faq_v2.id = faq_content.faq_id
+  AND faq_content.is_active IS DISTINCT FROM COALESCE(faq_v2.is_active, TRUE);
+
+-- faq_v2.is_active изменился → обновить все языки
+CREATE OR REPLACE FUNCTION sync_faq_content_is_active()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE faq_content
+    SET is_active = COALESCE(NEW.is_active, TRUE)
+    WHERE faq_id = NEW.id
+      AND is_active IS DISTINCT FROM COALESCE(NEW.is_active, TRUE);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS faq_v2_sync_is_active ON faq_v2;
+CREATE TRIGGER faq_v2_sync_is_active
+    AFTER UPDATE OF is_active ON faq_v2
+    FOR EACH ROW
+    EXECUTE FUNCTION sync_faq_content_is_active();
+
+-- Новая строка контента (или перенос в другой FAQ) → взять флаг из faq_v2
+CREATE OR REPLACE FUNCTION set_faq_content_is_active()
+RETURNS TRIGGER AS $$
+BEGIN
+    SELECT faq_v2.is_active INTO NEW.is_active FROM faq_v2 WHERE faq_v2.id = NEW.faq_id;
+    NEW.is_active := COALESCE(NEW.is_active, TRUE);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS faq_content_set_is_active ON faq_content;
+CREATE TRIGGER faq_content_set_is_active
+    BEFORE INSERT OR UPDATE OF faq_id ON faq_content
+    FOR EACH ROW
+    EXECUTE FUNCTION set_faq_content_is_active();
+
+-- 2. Нормализация эмбеддингов: для единичных векторов
+--    -(a <#> b) = cosine similarity, а inner product дешевле косинуса.
+--    Новые эмбеддинги нормализует API перед записью.
+UPDATE faq_content
+SET question_embedding = (
+    SELECT array_agg((x / vector_norm(faq_content.question_embedding))::real ORDER BY i)::vector
+    FROM unnest(faq_content.question_embedding::real[]) WITH ORDINALITY AS t(x, i)
+)
+WHERE question_embedding IS NOT NULL
+  AND abs(vector_norm(question_embedding) - 1) > 1e-6;
+
+UPDATE faq_content
+SET answer_embedding = (
+    SELECT array_agg((x / vector_norm(faq_content.answer_embedding))::real ORDER BY i)::vector
+    FROM unnest(faq_content.answer_embedding::real[]) WITH ORDINALITY AS t(x, i)
+)
+WHERE answer_embedding IS NOT NULL
+  AND abs(vector_norm(answer_embedding) - 1) > 1e-6;
+
+-- 3. Частичные HNSW-индексы по языкам.
+--    Запрос должен содержать language = '<литерал>' AND is_active,
+--    иначе планировщик не выберет частичный индекс.
+CREATE INDEX IF NOT EXISTS idx_faq_question_embedding_kk ON faq_content USING hnsw (
+    question_embedding vector_ip_ops
+)
+WITH (m = 16, ef_construction = 64)
+WHERE language = 'kk' AND is_active;
+
+CREATE INDEX IF NOT EXISTS idx_faq_question_embedding_ru ON faq_content USING hnsw (
+    question_embedding vector_ip_ops
+)
+WITH (m = 16, ef_construction = 64)
+WHERE language = 'ru' AND is_active;
+
+-- Общий cosine-индекс по question_embedding больше не используется поиском
+DROP INDEX IF EXISTS idx_faq_question_embedding;
+
+ANALYZE faq_content;
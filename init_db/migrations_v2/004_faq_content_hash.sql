@@ -0,0 +1,9 @@
+-- ============================================
+-- MIGRATION v2.4: content_hash for incremental re-embedding
+-- ============================================
+-- md5 от модели/размерности и текста, по которому считался эмбеддинг.
+-- Backfill (app/scripts/backfill_embeddings.py) и webhook Directus
+-- пропускают строки, у которых хеш не изменился.
+
+ALTER TABLE faq_content ADD COLUMN IF NOT EXISTS content_hash VARCHAR(32);
+ALTER TABLE faq_content ADD COLUMN IF NOT EXISTS embedded_at TIMESTAMPTZ;
@@ -0,0 +1,21 @@
+-- ============================================
+-- MIGRATION v2.5: Partial HNSW indexes for answer_embedding
+-- ============================================
+-- answer_embedding заполняет индексатор (текст ответа), multi-vector
+-- поиск (SEARCH_MULTI_VECTOR) сканирует его по тем же предикатам,
+-- что и question_embedding. Общий cosine-индекс заменяется частичными
+-- vector_ip_ops по языкам.
+
+CREATE INDEX IF NOT EXISTS idx_faq_answer_embedding_kk ON faq_content USING hnsw (
+    answer_embedding vector_ip_ops
+)
+WITH (m = 16, ef_construction = 64)
+WHERE language = 'kk' AND is_active;
+
+CREATE INDEX IF NOT EXISTS idx_faq_answer_embedding_ru ON faq_content USING hnsw (
+    answer_embedding vector_ip_ops
+)
+WITH (m = 16, ef_construction = 64)
+WHERE language = 'ru' AND is_active;
+
+DROP INDEX IF EXISTS idx_faq_answer_embedding;